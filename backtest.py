@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
+import weakref
 from datetime import datetime, timedelta
+from core.bars import Bars
+from core.metrics import metrics
 
 # Note: TA-Lib requires native binary installation.
 # If 'talib' import fails, we need to guide user to install it.
@@ -11,11 +13,127 @@ except ImportError:
     print("⚠️ TA-Lib not found. Using simplified logic.")
     talib = None
 
+# Optional: numba가 있으면 시뮬레이션 루프를 JIT 컴파일
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Indicators
+# 지표 컬럼 이름은 기본 기간 기준(ma20/ma60/vol_ma5/rsi)이고, 실제 기간은 config로 바꿀 수 있다.
+INDICATOR_WINDOWS = {'ma_period': 20, 'ma_long': 60, 'vol_period': 5, 'rsi_period': 14}
+WARMUP = 60  # 시뮬레이션 시작 봉 (장기 이평 준비 구간)
+
+def rolling_mean(values, window):
+    """이동평균 (1D는 Series, 2D는 열별 DataFrame rolling)"""
+    frame = pd.Series(values) if values.ndim == 1 else pd.DataFrame(values)
+    return frame.rolling(window=window).mean().to_numpy()
+
+def rsi(close, period=14):
+    """단순 이동평균 방식 RSI (1D/2D, axis 0 = 시간)
+
+    상승폭·하락폭을 한 프레임의 열로 붙여 rolling을 한 번만 호출 (Series.where + rolling 두 번과 값은 같음)
+    """
+    delta = close - shift_prev(close)
+    gain = np.where(delta > 0, delta, 0).reshape(len(close), -1)
+    loss = -np.where(delta < 0, delta, 0).reshape(len(close), -1)
+    means = pd.DataFrame(np.hstack([gain, loss])).rolling(period).mean().to_numpy()
+    k = gain.shape[1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = means[:, :k] / means[:, k:]
+        return (100 - (100 / (1 + rs))).reshape(close.shape)
+
+def compute_indicators(close, volume, config=None):
+    """종가/거래량 배열 → 전략 지표 dict (ma20, ma60, vol_ma5, rsi)"""
+    windows = {**INDICATOR_WINDOWS, **{k: v for k, v in (config or {}).items() if k in INDICATOR_WINDOWS}}
+    return {
+        'ma20': rolling_mean(close, windows['ma_period']),
+        'ma60': rolling_mean(close, windows['ma_long']),
+        'vol_ma5': rolling_mean(volume, windows['vol_period']),
+        'rsi': rsi(close, windows['rsi_period']),
+    }
+
+# Column helpers (vectorized mode)
+STRATEGY_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'ma20', 'ma60', 'vol_ma5', 'rsi')
+
+def shift_prev(values):
+    """전일 값 배열 (axis 0 기준 한 칸 밀기, 첫 행은 NaN)"""
+    prev = np.empty(values.shape, dtype=values.dtype if values.dtype.kind == 'f' else float)
+    prev[0] = np.nan
+    prev[1:] = values[:-1]
+    return prev
+
+def on_own_dates(fn, fields):
+    """(날짜, 종목) 2D 필드에 fn을 종목별 자기 거래일(종가가 있는 날)만 이어 붙인 배열로 적용
+
+    종목마다 거래일을 위로 모아(stable) fn(packed)을 계산한 뒤 원래 날짜 위치로 되돌린다.
+    거래 없는 날은 실수 NaN / bool False. 이동평균·RSI·전일 종가가 단일 종목 백테스트와 같은 봉을 쓴다.
+    """
+    valid = ~np.isnan(fields['close'])
+    order = np.argsort(~valid, axis=0, kind='stable')
+    packed = fn({name: np.take_along_axis(values, order, axis=0) for name, values in fields.items()})
+    cols = {}
+    for name, values in packed.items():
+        restored = np.empty_like(values)
+        np.put_along_axis(restored, order, values, axis=0)
+        if restored.dtype.kind == 'f':
+            restored[~valid] = np.nan
+        elif restored.dtype == bool:
+            restored[~valid] = False
+        cols[name] = restored
+    return cols
+
+def frame_columns(df):
+    """DataFrame → 전략 계산용 NumPy 컬럼 dict (float 배열 + 전일 종가)"""
+    cols = {name: df[name].to_numpy(dtype=float) for name in STRATEGY_COLUMNS if name in df.columns}
+    cols['prev_close'] = shift_prev(cols['close'])
+    return cols
+
 # Strategy Interface
 class StrategyInterface:
     def execute(self, df, config, i):
+        """바 단위 평가: i번째 봉의 신호 ('BUY' 또는 None)"""
         raise NotImplementedError
 
+    def columns(self, df):
+        """전 구간 평가에 필요한 컬럼 배열 추출"""
+        return frame_columns(df)
+
+    def signals(self, cols, config):
+        """컬럼 배열 → BUY 마스크 (원소 단위 연산이라 스칼라/1D/2D 모두 가능)"""
+        raise NotImplementedError
+
+    def generate_signals(self, df, config):
+        """전 구간 평가: 모든 봉의 BUY 여부를 bool 배열로 반환"""
+        return self.signals(self.columns(df), config)
+
+    def array_columns(self, fields, config=None):
+        """OHLCV 배열 dict(1D 또는 (날짜, 종목) 2D) → 지표까지 포함한 전략 컬럼
+
+        지표는 입력 종가와 같은 dtype으로 맞춘다 (float32 패널이면 float32).
+        2D에 거래 없는 날(NaN)이 있으면 종목별 자기 거래일 기준으로 계산한다 (on_own_dates)
+        → 합집합 날짜의 구멍 하나 때문에 지표가 구멍 뒤 기간 내내 NaN이 되지 않음.
+        """
+        if fields['close'].ndim == 2 and np.isnan(fields['close']).any():
+            return on_own_dates(lambda packed: self._indicator_columns(packed, config), fields)
+        return self._indicator_columns(fields, config)
+
+    @staticmethod
+    def _indicator_columns(fields, config=None):
+        cols = dict(fields)
+        cols['prev_close'] = shift_prev(fields['close'])
+        for name, values in compute_indicators(fields['close'], fields['volume'], config).items():
+            cols[name] = values.astype(fields['close'].dtype, copy=False)
+        return cols
+
+    def screen(self, fields, config):
+        """패널 스크리너: (봉, 종목) OHLCV 배열의 마지막 봉 BUY 마스크 (N,)와 전략 컬럼
+
+        백테스트와 같은 signals()를 쓰므로 스캐너가 찾는 조건 = 백테스트한 조건.
+        """
+        cols = self.array_columns(fields, config)
+        return self.signals(cols, config)[-1], cols
+
 class BasicDipStrategy(StrategyInterface):
     def execute(self, df, config, i):
         today = df.iloc[i]
@@ -30,16 +148,22 @@ class BasicDipStrategy(StrategyInterface):
         
         # 3. 거래량 감소
         if pd.isna(today['vol_ma5']): return None
-        vol_drop = today['volume'] < (today['vol_ma5'] * 0.8) # 80% 이하
+        vol_drop = today['volume'] < (today['vol_ma5'] * config.get('vol_ratio', 0.8)) # 80% 이하
         
         if is_uptrend and is_dip and vol_drop:
             return 'BUY'
         return None
 
+    def signals(self, cols, config):
+        close = cols['close']
+        is_uptrend = close > cols['ma20']                   # NaN → False
+        is_dip = close < cols['prev_close']
+        vol_drop = cols['volume'] < (cols['vol_ma5'] * config.get('vol_ratio', 0.8))
+        return is_uptrend & is_dip & vol_drop
+
 class AdvancedDipStrategy(StrategyInterface):
     def execute(self, df, config, i):
         today = df.iloc[i]
-        yesterday = df.iloc[i-1]
         
         # 1. 정배열 (20 > 60)
         if pd.isna(today['ma60']): return None
@@ -47,51 +171,222 @@ class AdvancedDipStrategy(StrategyInterface):
         
         # 2. 눌림목 위치 (20일선 근처 ±5%)
         dist = abs(today['close'] - today['ma20']) / today['ma20']
-        is_near_ma20 = dist <= 0.05
+        is_near_ma20 = dist <= config.get('ma_band', 0.05)
         
         # 3. 거래량 감소
-        is_vol_dry = today['volume'] <= (today['vol_ma5'] * 0.7)
+        is_vol_dry = today['volume'] <= (today['vol_ma5'] * config.get('vol_ratio', 0.7))
         
         # --- NEW: Candlestick Pattern Recognition (TA-Lib) ---
-        is_pattern_bullish = False
-        if talib:
-            # Prepare arrays for TA-Lib (requires double precision)
-            opens = df['open'].values.astype(float)
-            highs = df['high'].values.astype(float)
-            lows = df['low'].values.astype(float)
-            closes = df['close'].values.astype(float)
-            
-            # Detect Patterns
-            # Hammer: 100
-            hammer = talib.CDLHAMMER(opens, highs, lows, closes)
-            # Inverted Hammer: 100
-            inv_hammer = talib.CDLINVERTEDHAMMER(opens, highs, lows, closes)
-            # Bullish Engulfing: 100
-            engulfing = talib.CDLENGULFING(opens, highs, lows, closes)
-            # Piercing Line: 100
-            piercing = talib.CDLPIERCING(opens, highs, lows, closes)
-            
-            # Check if ANY bullish pattern happened TODAY (index i)
-            if (hammer[i] > 0 or inv_hammer[i] > 0 or 
-                engulfing[i] > 0 or piercing[i] > 0):
-                is_pattern_bullish = True
-        else:
-            # Fallback Logic: Rebound Candle
-            # Close > Open (Yang-bong) AND Close > Yesterday Close
-            is_pattern_bullish = (today['close'] > today['open']) and (today['close'] > yesterday['close'])
+        # 패턴은 프레임당 한 번만 계산하고 캐시에서 i번째 값을 조회
+        is_pattern_bullish = bool(pattern_cache.get(df)[i])
 
         # 5. RSI (30~55)
         is_rsi_good = False
         if not pd.isna(today['rsi']):
-            is_rsi_good = 30 <= today['rsi'] <= 60 # Range relaxed
+            is_rsi_good = config.get('rsi_low', 30) <= today['rsi'] <= config.get('rsi_high', 60) # Range relaxed
         
         # Strict Mode: Uptrend + Dip + VolDry + Pattern + RSI
         if is_aligned and is_near_ma20 and is_vol_dry and is_pattern_bullish and is_rsi_good:
             return 'BUY'
         return None
 
+    def columns(self, df):
+        cols = frame_columns(df)
+        cols['bullish'] = pattern_cache.get(df, cols)
+        return cols
+
+    def array_columns(self, fields, config=None):
+        cols = super().array_columns(fields, config)
+        cols['bullish'] = bullish_pattern_mask(cols)
+        return cols
+
+    def signals(self, cols, config):
+        close, ma20, rsi = cols['close'], cols['ma20'], cols['rsi']
+        is_aligned = ma20 > cols['ma60']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            is_near_ma20 = (np.abs(close - ma20) / ma20) <= config.get('ma_band', 0.05)
+        is_vol_dry = cols['volume'] <= (cols['vol_ma5'] * config.get('vol_ratio', 0.7))
+        is_rsi_good = (rsi >= config.get('rsi_low', 30)) & (rsi <= config.get('rsi_high', 60))
+        return is_aligned & is_near_ma20 & is_vol_dry & cols['bullish'] & is_rsi_good
+
+def bullish_pattern_mask(cols):
+    """상승 반전 캔들 마스크 (TA-Lib 패턴, 없으면 양봉+전일 대비 상승)"""
+    if talib and cols['close'].ndim == 2:
+        # TA-Lib은 1D 전용: 종목(열)별로 거래가 있는 날만 모아서 계산
+        mask = np.zeros(cols['close'].shape, dtype=bool)
+        for j in range(mask.shape[1]):
+            valid = ~np.isnan(cols['close'][:, j])
+            if valid.any():
+                mask[valid, j] = bullish_pattern_mask({k: cols[k][valid, j] for k in ('open', 'high', 'low', 'close')})
+        return mask
+    if talib:
+        # TA-Lib requires double precision
+        opens, highs, lows, closes = (np.asarray(cols[k], dtype=np.float64) for k in ('open', 'high', 'low', 'close'))
+        return ((talib.CDLHAMMER(opens, highs, lows, closes) > 0) |
+                (talib.CDLINVERTEDHAMMER(opens, highs, lows, closes) > 0) |
+                (talib.CDLENGULFING(opens, highs, lows, closes) > 0) |
+                (talib.CDLPIERCING(opens, highs, lows, closes) > 0))
+    return (cols['close'] > cols['open']) & (cols['close'] > cols['prev_close'])
+
+class PatternCache:
+    """DataFrame별 캔들 패턴 캐시
+
+    프레임마다 패턴을 한 번만 계산하고, 행 수·마지막 인덱스·마지막 봉 OHLC가
+    바뀌면 다시 계산한다. 과거 봉을 제자리에서 수정했다면 invalidate(df)를 호출한다.
+    프레임이 GC되면 항목도 함께 지워진다.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def _signature(df):
+        if len(df) == 0:
+            return (0,)
+        tail = np.array([df[c].iat[-1] for c in ('open', 'high', 'low', 'close')], dtype=float)
+        return (len(df), df.index[-1], tail.tobytes())
+
+    def get(self, df, cols=None):
+        key = id(df)
+        signature = self._signature(df)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        if entry is None:
+            weakref.finalize(df, self._entries.pop, key, None)
+        mask = bullish_pattern_mask(cols if cols is not None else frame_columns(df))
+        self._entries[key] = (signature, mask)
+        return mask
+
+    def invalidate(self, df=None):
+        """특정 프레임(또는 전체)의 캐시 삭제"""
+        if df is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(id(df), None)
+
+pattern_cache = PatternCache()
+
+# Simulation Core
+# 거래 기록: 봉 인덱스, 방향(BUY=1/SELL=-1), 체결가, 수익률(%)
+TRADE_DTYPE = np.dtype([('bar', np.int64), ('side', np.int8), ('price', np.float64), ('profit', np.float64)])
+BUY, SELL = 1, -1
+
+def _simulate_kernel(close, signals, start, end, take_profit, stop_loss, cash,
+                     trade_bar, trade_side, trade_price, trade_profit):
+    shares = 0.0
+    buy_price = 0.0
+    n = 0
+    for i in range(start, end):
+        price = close[i]
+
+        # Sell Logic
+        if shares > 0:
+            pct = (price - buy_price) / buy_price
+            if pct > take_profit or pct < -stop_loss:
+                cash += shares * price
+                shares = 0.0
+                trade_bar[n] = i
+                trade_side[n] = SELL
+                trade_price[n] = price
+                trade_profit[n] = pct * 100
+                n += 1
+                continue
+
+        # Buy Logic (전액 매수)
+        if shares == 0 and signals[i]:
+            shares = cash // price
+            cash -= shares * price
+            buy_price = price
+            trade_bar[n] = i
+            trade_side[n] = BUY
+            trade_price[n] = price
+            trade_profit[n] = np.nan
+            n += 1
+    return n, cash, shares
+
+if njit:
+    _simulate_kernel = njit(cache=True)(_simulate_kernel)
+
+def simulate(close, signals, config, initial_cash, start=WARMUP, end=None):
+    """배열 기반 단일 종목 매매 시뮬레이션
+
+    close/signals는 봉 단위 1D 배열. 신호가 뜨면 전액 매수하고
+    익절(take_profit)/손절(stop_loss) 도달 시 전량 매도한다.
+    Returns: (trades 구조화 배열, 최종 현금, 보유 수량)
+    """
+    end = len(close) if end is None else end
+    trades = np.empty(max(end - start, 0), dtype=TRADE_DTYPE)
+    if njit:
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        signals = np.ascontiguousarray(signals, dtype=np.bool_)
+    else:
+        # 순수 파이썬 루프에서는 리스트 원소 접근이 NumPy 스칼라보다 빠름
+        close, signals = np.asarray(close, dtype=float).tolist(), np.asarray(signals, dtype=bool).tolist()
+
+    n, cash, shares = _simulate_kernel(close, signals, start, end,
+                                       float(config['take_profit']), float(config['stop_loss']), float(initial_cash),
+                                       trades['bar'], trades['side'], trades['price'], trades['profit'])
+    return trades[:n], cash, shares
+
+def equity_curve(close, trades, initial_cash, start=WARMUP, end=None):
+    """거래 내역으로 봉별 평가금액 복원 (start~end 구간, simulate와 같은 체결 규칙)"""
+    end = len(close) if end is None else end
+    equity = np.empty(end - start)
+    cash, shares, last = float(initial_cash), 0.0, start
+    for bar, side, price in zip(trades['bar'].tolist(), trades['side'].tolist(), trades['price'].tolist()):
+        equity[last - start:bar - start] = cash + shares * close[last:bar]
+        if side == BUY:
+            shares = cash // price
+            cash -= shares * price
+        else:
+            cash += shares * price
+            shares = 0.0
+        last = bar
+    equity[last - start:] = cash + shares * close[last:end]
+    return equity
+
+class Trade:
+    """거래 기록 한 건 (__slots__: dict 대비 약 1/3 메모리)
+
+    기존 dict 형식과 호환: t['type'], t.get('profit'), dict(t) 모두 동작 (BUY는 profit 키 없음).
+    """
+    __slots__ = ('date', 'type', 'price', 'profit')
+
+    def __init__(self, date, type, price, profit=None):
+        self.date = date
+        self.type = type
+        self.price = price
+        self.profit = profit
+
+    def keys(self):
+        return ('date', 'type', 'price') if self.profit is None else self.__slots__
+
+    def __getitem__(self, key):
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.keys() else default
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __eq__(self, other):
+        if isinstance(other, (Trade, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Trade({self.to_dict()})"
+
 class Backtester:
     def __init__(self, df, initial_cash=10000000, strategy_name='basic'):
+        """df: OHLCV DataFrame (지표 컬럼이 제자리에 추가됨) 또는 Bars (읽기만 함, 여러 전략이 공유 가능)"""
         self.df = df
         self.cash = initial_cash
         self.shares = 0
@@ -103,67 +398,90 @@ class Backtester:
             self.strategy = BasicDipStrategy()
         
     def run(self, config):
+        if isinstance(self.df, Bars):
+            return self._run_bars(config)
+
         # Calculate Indicators
-        self.df['ma20'] = self.df['close'].rolling(window=20).mean()
-        self.df['ma60'] = self.df['close'].rolling(window=60).mean()
-        self.df['vol_ma5'] = self.df['volume'].rolling(window=5).mean()
-        
-        # RSI
-        delta = self.df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        self.df['rsi'] = 100 - (100 / (1 + rs))
+        with metrics.timer("backtest.indicators"):
+            indicators = compute_indicators(self.df['close'].to_numpy(dtype=float), self.df['volume'].to_numpy(dtype=float), config)
+            for name, values in indicators.items():
+                self.df[name] = values
         
         # Ensure we have enough data
-        if len(self.df) < 60: return [], self.cash
+        if len(self.df) < WARMUP: return [], self.cash
 
-        for i in range(60, len(self.df)):
-            today = self.df.iloc[i]
-            
-            # Use 'Date' column if exists, otherwise use Index
-            date_val = today.get('date') or today.name 
-            
-            # Sell Logic
-            if self.shares > 0:
-                buy_price = self.history[-1]['price']
-                pct = (today['close'] - buy_price) / buy_price
-                
-                if pct > config['take_profit'] or pct < -config['stop_loss']:
-                    self.cash += self.shares * today['close']
-                    self.shares = 0
-                    self.history.append({'date': date_val, 'type': 'SELL', 'price': today['close'], 'profit': pct*100})
-                    continue
-
-            # Buy Logic
-            if self.shares == 0:
-                signal = self.strategy.execute(self.df, config, i)
-                if signal == 'BUY':
-                    self.shares = self.cash // today['close']
-                    self.cash -= self.shares * today['close']
-                    self.history.append({'date': date_val, 'type': 'BUY', 'price': today['close']})
+        # 전 구간 매수 신호를 한 번에 계산
+        with metrics.timer("backtest.signals"):
+            signals = self.strategy.generate_signals(self.df, config)
+
+        # 배열 기반 시뮬레이션 (봉마다 iloc 조회 없음)
+        with metrics.timer("backtest.simulate"):
+            close = self.df['close'].to_numpy(dtype=float)
+            trades, self.cash, self.shares = simulate(close, signals, config, self.cash)
+            self.history = self._trade_history(trades)
+        metrics.count("backtest.runs")
+        metrics.count("backtest.bars", len(self.df))
 
         # Final Value
         if self.shares > 0:
-            total_value = self.cash + (self.shares * self.df.iloc[-1]['close'])
+            total_value = self.cash + (self.shares * close[-1])
         else:
             total_value = self.cash
             
         return self.history, total_value
 
+    def _run_bars(self, config):
+        """압축 배열(Bars) 경로: 지표는 전략 컬럼으로만 계산하고 버림 (입력 불변)"""
+        bars = self.df
+        if len(bars) < WARMUP: return [], self.cash
+
+        with metrics.timer("backtest.indicators"):
+            # 종가만 float64 작업 배열 (지표·시뮬레이션이 DataFrame 경로와 같은 값을 쓰도록).
+            # 시가·고가·저가·거래량은 매핑된 배열 그대로: float32 가격은 float64에서 손실 없이 내려온 값이라
+            # 비교 결과가 같고, TA-Lib 패턴은 bullish_pattern_mask가 필요할 때만 float64로 바꿈
+            fields = bars.fields()
+            fields['close'] = np.asarray(fields['close'], dtype=np.float64)
+            cols = self.strategy.array_columns(fields, config)
+        with metrics.timer("backtest.signals"):
+            signals = self.strategy.signals(cols, config)
+        del cols
+
+        with metrics.timer("backtest.simulate"):
+            close = fields['close']
+            trades, self.cash, self.shares = simulate(close, signals, config, self.cash)
+            self.history = self._trade_history(trades)
+        metrics.count("backtest.runs")
+        metrics.count("backtest.bars", len(bars))
+
+        total_value = self.cash + self.shares * close[-1] if self.shares > 0 else self.cash
+        return self.history, total_value
+
+    def _trade_history(self, trades):
+        """구조화 배열 → 거래 기록(Trade) 리스트"""
+        bars = trades['bar']
+        # Use 'Date' column if exists, otherwise use Index
+        if isinstance(self.df, Bars):
+            dates = self.df.timestamps(bars)
+        elif 'date' in self.df.columns:
+            dates = self.df['date'].iloc[bars].tolist()
+        else:
+            dates = self.df.index[bars].tolist()
+
+        history = []
+        for date_val, side, price, profit in zip(dates, trades['side'].tolist(), trades['price'].tolist(), trades['profit'].tolist()):
+            if side == SELL:
+                history.append(Trade(date_val, 'SELL', price, profit))
+            else:
+                history.append(Trade(date_val, 'BUY', price))
+        return history
+
 if __name__ == "__main__":
     from core.telegram_bot import send_report
     
-    print("🔄 Fetching Data (Samsung Elec - 005930.KS)...")
-    df = yf.download("005930.KS", period="1y")
-    
-    # Flatten MultiIndex columns
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    from core.market_data import load_ohlcv
     
-    df.columns = [c.lower() for c in df.columns]
-    df.reset_index(inplace=True)
-    df.rename(columns={'Date': 'date', 'index': 'date'}, inplace=True)
+    print("🔄 Fetching Data (Samsung Elec - 005930.KS)...")
+    df = load_ohlcv("005930.KS", "1y")
     
     print(f"✅ Data Loaded: {len(df)} rows")
 
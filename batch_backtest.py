@@ -1,8 +1,12 @@
 import pandas as pd
-import yfinance as yf
 from backtest import Backtester
+from core.bars import Bars
+from core.market_data import default_store, load_ohlcv
+from core.metrics import metrics
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import time
-import sys
+import os
 
 # 1. KOSPI Top 20 (Blue Chip)
 KOSPI_TOP = [
@@ -58,7 +62,79 @@ SCENARIOS = {
     "5": ("🪙 Crypto Currency", CRYPTO)
 }
 
-def run_batch_backtest():
+def load_history(ticker, period="5y"):
+    """일봉 조회 (로컬 캐시 → 부족한 구간만 yfinance)"""
+    return load_ohlcv(ticker, period)
+
+@metrics.timed("batch.ticker")
+def backtest_ticker(ticker, config, initial_cash, bars=None):
+    """한 종목 다운로드 + basic/advanced 백테스트 (워커 프로세스에서 실행)
+
+    bars(메모리 매핑 Bars 등)를 주면 다운로드 없이 그대로 사용한다.
+    데이터가 부족하면 None, 성공하면 결과 행(dict)을 반환한다.
+    """
+    if bars is None:
+        # Fetch Data (5y)
+        df = load_history(ticker, "5y")
+        if len(df) < 200:
+            return None
+        # 압축 배열로 한 번만 변환해 두 전략이 공유 (전략별 df.copy() 없음)
+        bars = Bars.from_frame(df)
+        del df
+    if len(bars) < 200:
+        return None
+        
+    # Run Basic
+    bt_basic = Backtester(bars, initial_cash, 'basic')
+    _, val_basic = bt_basic.run(config)
+    ret_basic = (val_basic - initial_cash) / initial_cash * 100
+    
+    # Run Advanced
+    bt_adv = Backtester(bars, initial_cash, 'advanced')
+    _, val_adv = bt_adv.run(config)
+    ret_adv = (val_adv - initial_cash) / initial_cash * 100
+    
+    return {
+        'Ticker': ticker,
+        'Basic %': round(ret_basic, 1),
+        'Basic #': len(bt_basic.history),
+        'Adv %': round(ret_adv, 1),
+        'Adv #': len(bt_adv.history)
+    }
+
+def _backtest_task(ticker, config, initial_cash, bars=None):
+    """워커 프로세스 작업: (결과 행, 이 종목 처리 중 모은 계측값)"""
+    metrics.reset()
+    return backtest_ticker(ticker, config, initial_cash, bars), metrics.snapshot()
+
+def _merged(future):
+    """워커 결과를 꺼내면서 계측값은 부모 프로세스에 합침"""
+    row, snapshot = future.result()
+    metrics.merge(snapshot)
+    return row
+
+def _report(ticker, get_result, results):
+    """종목별 결과 출력 (실패는 해당 종목만 건너뜀)"""
+    print(f"🔄 Processing {ticker}...", end=" ")
+    try:
+        row = get_result()
+        if row is None:
+            print("⚠️ Not enough data")
+            return
+        print(f"Basic: {row['Basic %']:>6.1f}% ({row['Basic #']} tr) | Adv: {row['Adv %']:>6.1f}% ({row['Adv #']} tr)")
+        results.append(row)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+def run_batch_backtest(workers=None, choice=None, mmap=False):
+    """시나리오 배치 백테스트
+
+    workers: 워커 프로세스 수 (기본: CPU 코어 수, 1이면 순차 실행).
+    각 워커가 다운로드와 백테스트를 함께 처리하므로 I/O 대기와 계산이 겹친다.
+    mmap: 먼저 전 종목을 .npy 묶음으로 내보내고, 워커는 메모리 매핑으로 읽기만 한다
+    (워커마다 캐시를 읽어 DataFrame을 만들지 않고 페이지 캐시 한 벌을 공유).
+    결과는 완료 순서와 관계없이 시나리오의 종목 순서대로 출력·집계한다.
+    """
     print("="*60)
     print("🚀 DipSniper Batch Backtest System")
     print("="*60)
@@ -67,14 +143,16 @@ def run_batch_backtest():
         print(f" [{k}] {v[0]}")
     print("="*60)
     
-    choice = input("Enter number (default 1): ").strip() or "1"
+    if choice is None:
+        choice = input("Enter number (default 1): ").strip() or "1"
     
     if choice not in SCENARIOS:
         print("❌ Invalid choice.")
         return
 
     name, tickers = SCENARIOS[choice]
-    print(f"\n🚀 Starting Backtest: {name} (5 Years)\n")
+    workers = workers or os.cpu_count() or 1
+    print(f"\n🚀 Starting Backtest: {name} (5 Years, {workers} workers)\n")
     
     results = []
     
@@ -82,43 +160,20 @@ def run_batch_backtest():
     config = {'stop_loss': 0.03, 'take_profit': 0.05}
     initial_cash = 10000000
     
-    for ticker in tickers:
-        print(f"🔄 Processing {ticker}...", end=" ")
-        try:
-            # Fetch Data (5y)
-            df = yf.download(ticker, period="5y", progress=False)
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            df.columns = [c.lower() for c in df.columns]
-            df.reset_index(inplace=True)
-            df.rename(columns={'Date': 'date', 'index': 'date'}, inplace=True)
-            
-            if len(df) < 200:
-                print("⚠️ Not enough data")
-                continue
-                
-            # Run Basic
-            bt_basic = Backtester(df.copy(), initial_cash, 'basic')
-            _, val_basic = bt_basic.run(config)
-            ret_basic = (val_basic - initial_cash) / initial_cash * 100
-            
-            # Run Advanced
-            bt_adv = Backtester(df.copy(), initial_cash, 'advanced')
-            _, val_adv = bt_adv.run(config)
-            ret_adv = (val_adv - initial_cash) / initial_cash * 100
-            
-            print(f"Basic: {ret_basic:>6.1f}% ({len(bt_basic.history)} tr) | Adv: {ret_adv:>6.1f}% ({len(bt_adv.history)} tr)")
-            
-            results.append({
-                'Ticker': ticker,
-                'Basic %': round(ret_basic, 1),
-                'Basic #': len(bt_basic.history),
-                'Adv %': round(ret_adv, 1),
-                'Adv #': len(bt_adv.history)
-            })
-            
-        except Exception as e:
-            print(f"❌ Error: {e}")
+    start = time.time()
+    shared = {}
+    if mmap:
+        shared = default_store.export_bars(tickers, "5y")
+        print(f"🗺️ Memory-mapped bars: {shared.path} ({shared.nbytes / 2**20:.1f}MB)\n")
+    if workers <= 1:
+        for ticker in tickers:
+            _report(ticker, lambda: backtest_ticker(ticker, config, initial_cash, shared.get(ticker)), results)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tickers))) as pool:
+            futures = [pool.submit(_backtest_task, ticker, config, initial_cash, shared.get(ticker)) for ticker in tickers]
+            for ticker, future in zip(tickers, futures):
+                _report(ticker, lambda: _merged(future), results)
+    elapsed = time.time() - start
             
     # Summary
     print("-" * 60)
@@ -137,6 +192,13 @@ def run_batch_backtest():
         
         winner = "Advanced" if avg_adv > avg_basic else "Basic"
         print(f"🎉 Winner Strategy: {winner}")
+    print(f"⏱️ Elapsed: {elapsed:.1f}s")
+    print(metrics.summary("Batch metrics"))
 
 if __name__ == "__main__":
-    run_batch_backtest()
+    parser = argparse.ArgumentParser(description="DipSniper Batch Backtest")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수, 1=순차)")
+    parser.add_argument("-s", "--scenario", default=None, help="시나리오 번호 (생략 시 입력 받음)")
+    parser.add_argument("--mmap", action="store_true", help="일봉을 .npy 묶음으로 내보내 워커가 메모리 매핑으로 공유")
+    args = parser.parse_args()
+    run_batch_backtest(workers=args.workers, choice=args.scenario, mmap=args.mmap)
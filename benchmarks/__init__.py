@@ -0,0 +1 @@
+"""DipSniper 성능 측정 스크립트 모음 (오프라인 합성 데이터 사용)"""
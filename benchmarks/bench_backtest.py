@@ -0,0 +1,48 @@
+"""
+백테스트 스케일링 벤치마크
+
+    python -m benchmarks.bench_backtest
+
+기간(1y~10y)별로 바 단위 execute 루프와 Backtester.run 시간을 재서
+봉당 시간이 일정한지(선형 확장) 확인한다.
+"""
+
+import time
+from backtest import Backtester, AdvancedDipStrategy, talib
+from benchmarks.synthetic import make_ohlcv, BARS_PER_YEAR
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+YEARS = [1, 2, 5, 10]
+
+def _timeit(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_execute_loop(df):
+    """바 단위 execute 호출 (라이브 경로)"""
+    strategy = AdvancedDipStrategy()
+    return _timeit(lambda: [strategy.execute(df, CONFIG, i) for i in range(60, len(df))])
+
+def bench_run(df, strategy_name):
+    return _timeit(lambda: Backtester(df.copy(), strategy_name=strategy_name).run(CONFIG))
+
+def main():
+    print(f"TA-Lib: {'on' if talib else 'off (fallback)'}")
+    print(f"{'period':>6} {'bars':>6} | {'execute loop':>14} {'us/bar':>7} | {'run(adv)':>10} {'us/bar':>7} | {'run(basic)':>10} {'us/bar':>7}")
+    for years in YEARS:
+        df = make_ohlcv(years * BARS_PER_YEAR, seed=years)
+        Backtester(df).run(CONFIG)  # 지표 컬럼 채우기
+        n = len(df)
+
+        t_loop = bench_execute_loop(df)
+        t_adv = bench_run(df, 'advanced')
+        t_basic = bench_run(df, 'basic')
+        print(f"{years:>5}y {n:>6} | {t_loop*1000:>12.1f}ms {t_loop/n*1e6:>7.1f} | "
+              f"{t_adv*1000:>8.1f}ms {t_adv/n*1e6:>7.1f} | {t_basic*1000:>8.1f}ms {t_basic/n*1e6:>7.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+실시간 평가 벤치마크 (pandas 재계산 vs 증분 지표 상태)
+
+    python -m benchmarks.bench_indicators
+
+체결 하나가 들어왔을 때 한 종목을 다시 평가하는 비용을 비교한다.
+- 재계산: 이전 LiveTrader.analyze처럼 일봉 전체로 DataFrame을 만들고 rolling 지표 계산
+- 증분: IndicatorState.columns (링 버퍼 미리보기) + strategy.signals
+먼저 모든 봉에서 두 방식의 지표·신호가 같은지 확인한다 (benchmarks.parity.incremental_mismatch, 전체 검사는
+python -m benchmarks.parity --checks incremental).
+"""
+
+import time
+
+import pandas as pd
+
+from backtest import AdvancedDipStrategy, BasicDipStrategy
+from benchmarks.parity import incremental_mismatch
+from benchmarks.synthetic import make_ohlcv
+from core.indicators import IndicatorState
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+def check_parity(df, strategy):
+    """모든 봉에서 증분 지표 == pandas rolling 지표, 신호도 동일한지 확인"""
+    bad, _ = incremental_mismatch(df, strategy, CONFIG)
+    assert bad is None, f"{type(strategy).__name__}: {bad}"
+
+def rebuild_eval(df, strategy):
+    """재계산 방식: 전체 프레임 복사 + rolling 지표 + 마지막 봉 평가"""
+    frame = pd.DataFrame({k: df[k].to_numpy(dtype=float) for k in FIELDS})
+    values = {k: frame[k].to_numpy() for k in FIELDS}
+    cols = strategy.array_columns(values, CONFIG)
+    return bool(strategy.signals(cols, CONFIG)[-1])
+
+def main(bars=250, codes=200, ticks=20):
+    for strategy in (BasicDipStrategy(), AdvancedDipStrategy()):
+        name = type(strategy).__name__
+        check_parity(make_ohlcv(bars, seed=7), strategy)
+        patterns = isinstance(strategy, AdvancedDipStrategy)
+
+        frames = [make_ohlcv(bars, seed=s) for s in range(codes)]
+        states = []
+        for df in frames:
+            state = IndicatorState(CONFIG)
+            for row in df[list(FIELDS)].iloc[:-1].itertuples(index=False):
+                state.push(*row)
+            states.append((state, [df[k].iloc[-1] for k in FIELDS]))
+
+        start = time.perf_counter()
+        for df in frames:
+            rebuild_eval(df, strategy)
+        t_rebuild = (time.perf_counter() - start) / codes
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            for state, bar in states:
+                strategy.signals(state.columns(*bar, patterns=patterns), CONFIG)
+        t_incr = (time.perf_counter() - start) / (codes * ticks)
+
+        print(f"[{name:>19}] rebuild {t_rebuild * 1e6:9.1f}us/update | incremental {t_incr * 1e6:7.1f}us/update "
+              f"(x{t_rebuild / t_incr:6.1f}) | parity ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+메모리 벤치마크: float64 DataFrame + dict 거래 기록 vs 압축 Bars + Trade(__slots__)
+
+    python -m benchmarks.bench_memory                    # 2,500종목 x 5y
+    python -m benchmarks.bench_memory --tickers 100 --years 10
+
+tracemalloc으로 할당량을 잰다 (NumPy 배열 포함). 측정 항목
+- universe: 전 종목 일봉을 백테스트 후 들고 있을 때 (DataFrame은 지표 4컬럼이 붙은 상태)
+- batch peak: batch_backtest 한 종목 처리(basic+advanced) 중 최대 사용량 (이전: df.copy() 2번)
+- trades: 전 종목 두 전략의 거래 기록 (dict vs Trade)
+- workers: 워커 프로세스마다 전 종목을 받아 훑을 때 늘어나는 힙 (피클한 DataFrame vs 메모리 매핑 BarSet)
+  → 매핑은 페이지 캐시(파일)라 워커 수와 상관없이 한 벌. Linux(/proc/self/smaps_rollup)에서만 측정
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from backtest import Backtester, Trade
+from benchmarks.synthetic import BARS_PER_YEAR, SyntheticUniverse
+from core.bars import Bars, write_bars
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+PEAK_SAMPLE = 50  # batch peak를 잴 종목 수 (종목별 크기가 같아 일부면 충분)
+
+def _traced(fn):
+    """fn() → (결과, 남은 할당량, 최대 할당량) 바이트"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current - start, peak - start
+
+def legacy_ticker(df):
+    """이전 batch_backtest: 전략마다 df.copy() + dict 거래 기록"""
+    basic = Backtester(df.copy(), strategy_name='basic')
+    basic.run(CONFIG)
+    adv = Backtester(df.copy(), strategy_name='advanced')
+    adv.run(CONFIG)
+    return [t.to_dict() for t in basic.history], [t.to_dict() for t in adv.history]
+
+def compact_ticker(df):
+    """현재 batch_backtest: Bars 한 번 변환 후 두 전략이 공유"""
+    bars = Bars.from_frame(df)
+    basic = Backtester(bars, strategy_name='basic')
+    basic.run(CONFIG)
+    adv = Backtester(bars, strategy_name='advanced')
+    adv.run(CONFIG)
+    return basic.history, adv.history
+
+def hold_frames(universe):
+    frames = []
+    for ticker in universe:
+        df = universe[ticker]
+        Backtester(df, strategy_name='advanced').run(CONFIG)  # 지표 컬럼이 제자리에 붙음
+        frames.append(df)
+    return frames
+
+def hold_bars(universe):
+    bars = []
+    for ticker in universe:
+        b = Bars.from_frame(universe[ticker])
+        Backtester(b, strategy_name='advanced').run(CONFIG)
+        bars.append(b)
+    return bars
+
+def _anonymous_bytes():
+    """이 프로세스의 익명(힙) 메모리 (Linux 전용, 없으면 None)"""
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                if line.startswith("Anonymous:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+_baseline = {}
+
+def _worker_init():
+    _baseline['anon'] = _anonymous_bytes()
+
+def _touch(data):
+    """워커: 전 종목 종가를 한 번씩 읽음 → 워커 시작 후 늘어난 힙"""
+    total = sum(float(data[t].close.sum()) for t in data)
+    return _anonymous_bytes() - _baseline['anon'], total
+
+def per_worker_heap(data, workers):
+    # spawn: 부모 힙을 물려받지 않은 새 프로세스라야 늘어난 양이 정확함
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_worker_init) as pool:
+        return max(grown for grown, _ in pool.map(_touch, [data] * workers))
+
+def _row(name, before, after, n, unit="bar"):
+    ratio = before / after if after else float('inf')
+    print(f"{name:<22} {before / 2**20:>10.1f}MB {after / 2**20:>10.1f}MB  x{ratio:5.1f} "
+          f"| {before / n:>6.1f} → {after / n:>5.1f} B/{unit}")
+
+def main():
+    parser = argparse.ArgumentParser(description="DipSniper memory benchmark")
+    parser.add_argument("--tickers", type=int, default=2500)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4, help="workers 항목의 워커 수 (0이면 생략)")
+    args = parser.parse_args()
+
+    universe = SyntheticUniverse(args.tickers, args.years)
+    n_bars = args.tickers * args.years * BARS_PER_YEAR
+    print(f"🧮 {args.tickers} tickers x {args.years}y ({n_bars:,} bars)")
+    start = time.time()
+    compact_ticker(universe[universe.tickers[0]])  # JIT·캐시 워밍업
+
+    _, frames_mem, _ = _traced(lambda: hold_frames(universe))
+    _, bars_mem, _ = _traced(lambda: hold_bars(universe))
+
+    sample = universe.tickers[:PEAK_SAMPLE]
+    frames = [universe[t] for t in sample]
+    legacy_peak = max(_traced(lambda: legacy_ticker(df))[2] for df in frames)
+    compact_peak = max(_traced(lambda: compact_ticker(df))[2] for df in frames)
+    per_ticker = len(frames[0])
+
+    raw = [(t.date, t.type, t.price, t.profit)
+           for ticker in universe for history in compact_ticker(universe[ticker]) for t in history]
+    _, dict_mem, _ = _traced(lambda: [Trade(*r).to_dict() for r in raw])
+    _, slot_mem, _ = _traced(lambda: [Trade(*r) for r in raw])
+
+    print(f"{'':<22} {'before':>12} {'after':>12}")
+    _row("universe (held)", frames_mem, bars_mem, n_bars)
+    _row("batch peak / ticker", legacy_peak, compact_peak, per_ticker)
+    _row("trades", dict_mem, slot_mem, len(raw), "trade")
+
+    if args.workers and _anonymous_bytes() is not None:
+        with tempfile.TemporaryDirectory() as tmp:
+            frames = {t: universe[t] for t in universe}
+            shared = write_bars(os.path.join(tmp, "bars"), frames)
+            pickled = per_worker_heap(frames, args.workers)
+            del frames
+            mapped = per_worker_heap(shared, args.workers)
+        _row(f"workers (heap each x{args.workers})", pickled, mapped, n_bars)
+    print(f"⏱️ {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+시뮬레이션 루프 벤치마크 (iloc 이벤트 루프 vs 배열 기반 simulate)
+
+    python -m benchmarks.bench_simulate
+
+같은 5년치 데이터로 예전 방식(봉마다 iloc + execute)과 현재 Backtester.run을
+비교하고, 거래 내역이 같은지 확인한 뒤 종목당 속도 향상 배율을 출력한다.
+"""
+
+import time
+from backtest import Backtester, simulate, njit
+from benchmarks.synthetic import make_ohlcv, BARS_PER_YEAR
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+
+def legacy_run(df, strategy_name, config, initial_cash=10000000):
+    """iloc 기반 이전 루프 (비교 기준)"""
+    bt = Backtester(df, initial_cash, strategy_name)
+    bt.run(config)  # 지표 컬럼 계산
+    cash, shares, history = initial_cash, 0, []
+    for i in range(60, len(df)):
+        today = df.iloc[i]
+        date_val = today.get('date') or today.name
+        if shares > 0:
+            buy_price = history[-1]['price']
+            pct = (today['close'] - buy_price) / buy_price
+            if pct > config['take_profit'] or pct < -config['stop_loss']:
+                cash += shares * today['close']
+                shares = 0
+                history.append({'date': date_val, 'type': 'SELL', 'price': today['close'], 'profit': pct*100})
+                continue
+        if shares == 0 and bt.strategy.execute(df, config, i) == 'BUY':
+            shares = cash // today['close']
+            cash -= shares * today['close']
+            history.append({'date': date_val, 'type': 'BUY', 'price': today['close']})
+    total_value = cash + shares * df.iloc[-1]['close'] if shares > 0 else cash
+    return history, total_value
+
+def _best(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(years=5, seeds=range(5)):
+    print(f"numba: {'on' if njit else 'off (pure python)'} | {years}y daily, {len(seeds)} tickers")
+    # JIT 워밍업
+    simulate(make_ohlcv(100)['close'].to_numpy(), [False] * 100, CONFIG, 1)
+
+    for strategy_name in ('basic', 'advanced'):
+        t_legacy = t_new = t_core = 0.0
+        for seed in seeds:
+            df = make_ohlcv(years * BARS_PER_YEAR, seed=seed)
+            legacy = legacy_run(df.copy(), strategy_name, CONFIG)
+            current = Backtester(df.copy(), strategy_name=strategy_name).run(CONFIG)
+            assert [(t['type'], t['price']) for t in legacy[0]] == [(t['type'], t['price']) for t in current[0]]
+            assert abs(legacy[1] - current[1]) < 1e-6
+
+            t_legacy += _best(lambda: legacy_run(df.copy(), strategy_name, CONFIG), 3)
+            t_new += _best(lambda: Backtester(df.copy(), strategy_name=strategy_name).run(CONFIG), 5)
+
+            bt = Backtester(df.copy(), strategy_name=strategy_name)
+            bt.run(CONFIG)
+            signals = bt.strategy.generate_signals(bt.df, CONFIG)
+            close = bt.df['close'].to_numpy(dtype=float)
+            t_core += _best(lambda: simulate(close, signals, CONFIG, 10000000), 5)
+
+        n = len(seeds)
+        print(f"[{strategy_name:>8}] legacy loop {t_legacy/n*1000:8.2f}ms | run() {t_new/n*1000:6.2f}ms "
+              f"(x{t_legacy/t_new:5.1f}) | simulate() only {t_core/n*1e6:7.1f}us (x{t_legacy/t_core:7.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+결과 일치 검사 (최적화 경로가 기준 경로와 같은 답을 내는지)
+
+    python -m benchmarks.parity                  # 전체
+    python -m benchmarks.parity --checks signals --tickers 005930.KS AAPL   # 실제 일봉 포함
+    python -m benchmarks.parity --checks mmap
+    python -m benchmarks.parity --checks incremental
+
+- mmap: DataFrame 경로 vs 메모리 매핑 .npy 묶음(BarSet) 경로
+  Backtester, optimizer.optimize(멀티프로세스), walkforward.walk_forward 결과가 같아야 함.
+  원화(정수)뿐 아니라 달러식 소수 가격(float32로 정확히 표현되지 않음)으로도 검사
+- signals: 전 구간 벡터 신호 generate_signals()[i] == 봉 단위 execute(df, config, i) == 'BUY'
+  basic/advanced x 여러 config, TA-Lib 켜고/끄고 (설치돼 있을 때) 모두. 데이터는 합성 일봉(정수·소수 가격) +
+  --tickers로 준 종목(로컬 캐시 → 없으면 yfinance) + 로컬 캐시(data/ohlcv/1d)에 있는 실제 일봉
+- incremental: 실시간 평가용 IndicatorState(링 버퍼·증분 RSI)에 봉을 하나씩 넣으며 모든 봉에서
+  ma20/ma60/vol_ma5/rsi가 compute_indicators와 같고(상대 오차 1e-9) 신호가 전 구간 signals()와 같은지.
+  지표 기간을 바꾼 config 포함, TA-Lib 켜고/끄고. 데이터는 signals와 같음
+
+다르면 AssertionError로 멈춘다.
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+import backtest
+from backtest import AdvancedDipStrategy, BasicDipStrategy, Backtester, WARMUP, compute_indicators, pattern_cache
+from benchmarks.synthetic import make_ohlcv
+from core.bars import write_bars
+import core.indicators as core_indicators
+from core.indicators import IndicatorState
+import optimizer
+import walkforward
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+# (이름, make_ohlcv 인자): 원화 정수 가격 / 달러 소수 둘째 자리 가격
+PRICE_KINDS = (('krw', {'decimals': 0, 'base': 10000}), ('usd', {'decimals': 2, 'base': 150.0}))
+
+def check_mmap(n_tickers=8, years=5, workers=2):
+    for kind, options in PRICE_KINDS:
+        frames = {f"{kind.upper()}{i}": make_ohlcv(years * 250 + i * 7, seed=i, **options) for i in range(n_tickers)}
+        with tempfile.TemporaryDirectory() as tmp:
+            shared = write_bars(os.path.join(tmp, "bars"), frames)
+            dtype = shared.arrays['close'].dtype
+
+            for ticker, df in frames.items():
+                for strategy_name in ('basic', 'advanced'):
+                    expected = Backtester(df.copy(), strategy_name=strategy_name).run(CONFIG)
+                    actual = Backtester(shared[ticker], strategy_name=strategy_name).run(CONFIG)
+                    assert expected == actual, f"Backtester {kind} {ticker} {strategy_name}"
+
+            combos = optimizer.random_combos(40, seed=1)
+            for strategy_name in ('basic', 'advanced'):
+                expected = optimizer.optimize(frames, strategy_name, combos, workers=1)
+                actual = optimizer.optimize(shared, strategy_name, combos, workers=workers)
+                assert expected == actual, f"optimize {kind} {strategy_name}"
+
+            ticker = next(iter(frames))
+            expected = walkforward.walk_forward(frames[ticker], 'advanced', combos, folds=6, workers=1)
+            actual = walkforward.walk_forward(shared[ticker], 'advanced', combos, folds=6, workers=workers)
+            assert expected == actual, f"walk_forward {kind}"
+        print(f"✅ mmap [{kind}] prices {dtype}: Backtester/optimize/walk_forward match the DataFrame path "
+              f"({n_tickers} tickers)")
+
+# 신호 검사용 config (기본값 + 조건을 넓히거나 좁힌 조합)
+SIGNAL_CONFIGS = (
+    {},
+    {'vol_ratio': 1.0, 'ma_band': 0.10, 'rsi_low': 20, 'rsi_high': 80},
+    {'vol_ratio': 0.5, 'ma_band': 0.02, 'rsi_low': 40, 'rsi_high': 55},
+)
+
+def real_frames(tickers=(), period="5y"):
+    """--tickers 종목 + 로컬 캐시에 이미 있는 일봉 → {ticker: DataFrame}"""
+    from core.market_data import default_store
+
+    frames = default_store.load_many(list(tickers), period) if tickers else {}
+    cache_dir = os.path.join(default_store.cache_dir, "1d")
+    if os.path.isdir(cache_dir):
+        for name in sorted(os.listdir(cache_dir)):
+            ticker, ext = os.path.splitext(name)
+            if ext in (".parquet", ".pkl") and ticker not in frames:
+                df, _ = default_store.read(ticker)
+                if df is not None:
+                    frames[ticker] = df
+    return {t: df.reset_index(drop=True) for t, df in frames.items() if len(df) > WARMUP}
+
+def _signal_mismatches(df, strategy, config):
+    """벡터 신호와 봉 단위 execute()가 다른 봉 인덱스 목록"""
+    df = df.copy()
+    for name, values in compute_indicators(df['close'].to_numpy(dtype=float), df['volume'].to_numpy(dtype=float)).items():
+        df[name] = values
+    vectorized = np.asarray(strategy.generate_signals(df, config), dtype=bool)[WARMUP:]
+    per_bar = np.array([strategy.execute(df, config, i) == 'BUY' for i in range(WARMUP, len(df))], dtype=bool)
+    return (np.flatnonzero(vectorized != per_bar) + WARMUP).tolist(), int(per_bar.sum())
+
+def check_signals(tickers=(), seeds=range(6), n_bars=1500):
+    datasets = {f"synthetic-{kind}-{seed}": make_ohlcv(n_bars, seed=seed, **options)
+                for kind, options in PRICE_KINDS for seed in seeds}
+    real = real_frames(tickers)
+    datasets.update(real)
+    if not real:
+        print("⚠️ signals: no real OHLCV (pass --tickers or fill data/ohlcv), synthetic data only")
+
+    installed = backtest.talib
+    modes = [('on', installed), ('off', None)] if installed else [('off', None)]
+    try:
+        for mode, lib in modes:
+            backtest.talib = lib
+            pattern_cache.invalidate()
+            for strategy in (BasicDipStrategy(), AdvancedDipStrategy()):
+                buys = 0
+                for name, df in datasets.items():
+                    for config in SIGNAL_CONFIGS:
+                        bad, n_buy = _signal_mismatches(df, strategy, config)
+                        assert not bad, f"{type(strategy).__name__} TA-Lib {mode} {name} {config}: bars {bad[:10]}"
+                        buys += n_buy
+                print(f"✅ signals [{type(strategy).__name__}, TA-Lib {mode}]: signals() == execute() on "
+                      f"{len(datasets)} series x {len(SIGNAL_CONFIGS)} configs ({buys} BUY bars, {len(real)} real)")
+    finally:
+        backtest.talib = installed
+        pattern_cache.invalidate()
+    if not installed:
+        print("⚠️ signals: TA-Lib not installed, fallback pattern only")
+
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+INDICATORS = ('ma20', 'ma60', 'vol_ma5', 'rsi')
+# 증분 검사용 config: 신호 조합 + 지표 기간을 바꾼 조합 (IndicatorState의 윈도우 설정까지 확인)
+INCREMENTAL_CONFIGS = SIGNAL_CONFIGS + ({'ma_period': 10, 'ma_long': 40, 'vol_period': 3, 'rsi_period': 9},)
+TOLERANCE = 1e-9  # 증분 합계(링 버퍼 + 바퀴마다 fsum)와 pandas rolling의 허용 상대 오차
+
+def incremental_mismatch(df, strategy, config):
+    """IndicatorState에 봉을 하나씩 넣으며 전 구간 계산과 비교 → 첫 불일치 설명 (없으면 None)와 BUY 수"""
+    values = {name: df[name].to_numpy(dtype=float) for name in OHLCV}
+    expected = strategy.array_columns(values, config)
+    signals = np.asarray(strategy.signals(expected, config), dtype=bool)
+    state = IndicatorState(config)
+    for i in range(len(df)):
+        bar = [values[name][i] for name in OHLCV]
+        cols = state.columns(*bar)
+        for name in INDICATORS:
+            a, b = cols[name], expected[name][i]
+            if not ((np.isnan(a) and np.isnan(b)) or abs(a - b) <= TOLERANCE * max(1.0, abs(b))):
+                return f"bar {i} {name}: incremental {a!r} != batch {b!r}", 0
+        if bool(strategy.signals(cols, config)) != signals[i]:
+            return f"bar {i} signal: incremental {not signals[i]} != batch {signals[i]}", 0
+        state.push(*bar)
+    return None, int(signals.sum())
+
+def check_incremental(tickers=(), seeds=range(4), n_bars=2000):
+    datasets = {f"synthetic-{kind}-{seed}": make_ohlcv(n_bars, seed=seed, **options)
+                for kind, options in PRICE_KINDS for seed in seeds}
+    datasets.update(real_frames(tickers))
+
+    installed = backtest.talib
+    modes = [('on', installed), ('off', None)] if installed else [('off', None)]
+    try:
+        for mode, lib in modes:
+            backtest.talib = lib
+            core_indicators.talib = lib  # IndicatorState.columns가 가져다 쓴 talib도 함께 전환
+            for strategy in (BasicDipStrategy(), AdvancedDipStrategy()):
+                buys = 0
+                for name, df in datasets.items():
+                    for config in INCREMENTAL_CONFIGS:
+                        bad, n_buy = incremental_mismatch(df, strategy, config)
+                        assert bad is None, f"{type(strategy).__name__} TA-Lib {mode} {name} {config}: {bad}"
+                        buys += n_buy
+                print(f"✅ incremental [{type(strategy).__name__}, TA-Lib {mode}]: IndicatorState == batch on "
+                      f"{len(datasets)} series x {len(INCREMENTAL_CONFIGS)} configs, every bar ({buys} BUY bars)")
+    finally:
+        backtest.talib = installed
+        core_indicators.talib = installed
+
+CHECKS = {'signals': check_signals, 'incremental': check_incremental, 'mmap': check_mmap}
+
+def main():
+    parser = argparse.ArgumentParser(description="DipSniper parity checks")
+    parser.add_argument("--checks", nargs="+", default=list(CHECKS), choices=list(CHECKS))
+    parser.add_argument("--tickers", nargs="*", default=[], help="signals/incremental 검사에 넣을 실제 종목 (예: 005930.KS AAPL)")
+    args = parser.parse_args()
+    for name in args.checks:
+        if name in ('signals', 'incremental'):
+            CHECKS[name](args.tickers)
+        else:
+            CHECKS[name]()
+
+if __name__ == "__main__":
+    main()
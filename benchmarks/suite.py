@@ -0,0 +1,217 @@
+"""
+백테스트·스캔 핫패스 벤치마크 모음 (오프라인, 결과 JSON 저장)
+
+    python -m benchmarks.suite                          # 1y/5y/20y x 1/100/2500종목 전체
+    python -m benchmarks.suite --quick                  # 1y/5y x 1/100종목
+    python -m benchmarks.suite --cases backtest_run scan --years 5 --tickers 100
+    python -m benchmarks.suite --compare benchmarks/results/baseline.json
+
+데이터는 benchmarks.synthetic의 합성 OHLCV(고정 시드)라 실행할 때마다 같다.
+결과는 benchmarks/results/bench-<시각>.json에 저장되고, --compare로 이전 결과와 배율을 비교한다.
+
+측정 항목 (종목별 항목은 종목마다 best-of-repeat 시간을 합산, 데이터 생성 시간은 제외)
+- indicators: compute_indicators (이평·거래량 평균·RSI)
+- signals_basic / signals_advanced: array_columns + signals (전 구간 매수 신호)
+- simulate: 신호 배열로 매매 시뮬레이션 루프만
+- backtest_run: Backtester.run (advanced, 지표+신호+시뮬레이션+거래 내역)
+- execute: AdvancedDipStrategy.execute를 봉마다 호출 (라이브 경로, 기본은 1종목일 때만)
+- portfolio: PortfolioBacktester.run (전 종목 패널, 공유 현금 배치)
+- scan_cold / scan: scan_market 전체 파이프라인 (빈 캐시 = 합성 데이터 '다운로드'+디스크 저장 포함 / 디스크 캐시가 있는 상태)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import scanner
+from backtest import (AdvancedDipStrategy, BasicDipStrategy, Backtester, WARMUP, compute_indicators,
+                      njit, simulate, talib)
+from benchmarks.synthetic import BARS_PER_YEAR, SyntheticUniverse
+from core.market_data import FrameProvider, MarketDataStore
+from core.panel import Panel
+from portfolio_backtest import PortfolioBacktester
+
+CONFIG = {'stop_loss': 0.03, 'take_profit': 0.05}
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+YEARS = (1, 5, 20)
+TICKERS = (1, 100, 2500)
+RESULTS_DIR = "benchmarks/results"
+
+def _best(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _arrays(df):
+    return {k: df[k].to_numpy(dtype=float) for k in FIELDS}
+
+# 종목별 항목: df → 측정할 함수 (준비 작업은 측정 밖에서)
+def case_indicators(df):
+    values = _arrays(df)
+    return lambda: compute_indicators(values['close'], values['volume'])
+
+def _signals_case(strategy):
+    def case(df):
+        values = _arrays(df)
+        return lambda: strategy.signals(strategy.array_columns(values, CONFIG), CONFIG)
+    return case
+
+def case_simulate(df):
+    strategy = AdvancedDipStrategy()
+    values = _arrays(df)
+    signals = strategy.signals(strategy.array_columns(values, CONFIG), CONFIG)
+    return lambda: simulate(values['close'], signals, CONFIG, 10000000)
+
+def case_backtest_run(df):
+    return lambda: Backtester(df.copy(), strategy_name='advanced').run(CONFIG)
+
+def case_execute(df):
+    Backtester(df, strategy_name='advanced').run(CONFIG)  # 지표 컬럼 채우기
+    strategy = AdvancedDipStrategy()
+    return lambda: [strategy.execute(df, CONFIG, i) for i in range(WARMUP, len(df))]
+
+PER_TICKER = {
+    'indicators': case_indicators,
+    'signals_basic': _signals_case(BasicDipStrategy()),
+    'signals_advanced': _signals_case(AdvancedDipStrategy()),
+    'simulate': case_simulate,
+    'backtest_run': case_backtest_run,
+    'execute': case_execute,
+}
+
+def run_per_ticker(name, universe, repeat):
+    make = PER_TICKER[name]
+    total = 0.0
+    for ticker in universe:
+        total += _best(make(universe[ticker]), repeat)
+    return total
+
+def run_portfolio(universe, repeat):
+    panel = Panel.from_frames((t, universe[t]) for t in universe)
+    bt = PortfolioBacktester(panel, strategy_name='basic', max_positions=5)
+    return _best(lambda: bt.run(CONFIG), repeat)
+
+def run_scan(universe, cold):
+    """scan_market 전체 (종목 → 저장소 → 묶음 스크리닝 → 상위 후보). 출력과 후보 파일은 임시 디렉터리로"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketDataStore(cache_dir=tmp, provider=FrameProvider(universe), max_age=float('inf'))
+        candidates_path, scanner.CANDIDATES_PATH = scanner.CANDIDATES_PATH, os.path.join(tmp, "candidates.json")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                if not cold:
+                    scanner.scan_market(list(universe), period="max", store=store)
+                start = time.perf_counter()
+                scanner.scan_market(list(universe), period="max", store=store)
+                return time.perf_counter() - start
+        finally:
+            scanner.CANDIDATES_PATH = candidates_path
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': bool(njit),
+        'talib': bool(talib),
+    }
+
+def run_suite(cases, years_list=YEARS, tickers_list=TICKERS, repeat=None, execute_max_tickers=1):
+    """전체 측정 → 결과 행 리스트 [{'case', 'years', 'tickers', 'bars', 'seconds', ...}]"""
+    # JIT 워밍업 (컴파일 시간이 첫 측정에 섞이지 않도록)
+    warm = SyntheticUniverse(1, 1, seed=99)
+    for name in cases:
+        if name in PER_TICKER:
+            run_per_ticker(name, warm, 1)
+
+    results = []
+    for years in years_list:
+        for n_tickers in tickers_list:
+            universe = SyntheticUniverse(n_tickers, years)
+            bars = years * BARS_PER_YEAR * n_tickers
+            # 큰 크기는 한 번만 (작은 크기는 잡음을 줄이려고 여러 번 중 최솟값)
+            reps = repeat or (3 if n_tickers <= 100 else 1)
+            for name in cases:
+                if name == 'execute' and n_tickers > execute_max_tickers:
+                    continue
+                if name in PER_TICKER:
+                    seconds = run_per_ticker(name, universe, reps)
+                elif name == 'portfolio':
+                    seconds = run_portfolio(universe, reps)
+                else:
+                    seconds = run_scan(universe, cold=(name == 'scan_cold'))
+                row = {'case': name, 'years': years, 'tickers': n_tickers, 'bars': bars, 'seconds': seconds,
+                       'us_per_ticker': seconds / n_tickers * 1e6, 'ns_per_bar': seconds / bars * 1e9}
+                results.append(row)
+                print(f"{name:>16} {years:>3}y x {n_tickers:>5} | {seconds * 1000:>11.1f}ms "
+                      f"{row['us_per_ticker']:>11.1f}us/ticker {row['ns_per_bar']:>9.1f}ns/bar", flush=True)
+    return results
+
+def compare(results, baseline_path):
+    """같은 (case, years, tickers) 끼리 이전 결과 대비 배율 출력 (>1이면 빨라짐)"""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    old = {(r['case'], r['years'], r['tickers']): r['seconds'] for r in baseline['results']}
+    print(f"\n📊 vs {baseline_path} ({baseline['environment'].get('commit')}, {baseline['environment'].get('timestamp')})")
+    for r in results:
+        before = old.get((r['case'], r['years'], r['tickers']))
+        if before is None:
+            continue
+        speedup = before / r['seconds'] if r['seconds'] else float('inf')
+        mark = "🟢" if speedup >= 1.1 else "🔴" if speedup <= 0.9 else "⚪"
+        print(f"{mark} {r['case']:>16} {r['years']:>3}y x {r['tickers']:>5} | "
+              f"{before * 1000:>10.1f}ms → {r['seconds'] * 1000:>10.1f}ms (x{speedup:5.2f})")
+
+def main():
+    all_cases = list(PER_TICKER) + ['portfolio', 'scan_cold', 'scan']
+    parser = argparse.ArgumentParser(description="DipSniper benchmark suite")
+    parser.add_argument("--cases", nargs="+", default=all_cases, choices=all_cases)
+    parser.add_argument("--years", nargs="+", type=int, default=list(YEARS))
+    parser.add_argument("--tickers", nargs="+", type=int, default=list(TICKERS))
+    parser.add_argument("--quick", action="store_true", help="1y/5y x 1/100종목만")
+    parser.add_argument("--repeat", type=int, default=None, help="반복 횟수 (기본: 100종목 이하 3, 그 이상 1)")
+    parser.add_argument("--execute-max-tickers", type=int, default=1, help="execute(봉 단위 루프)를 잴 최대 종목 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/bench-<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+    if args.quick:
+        args.years, args.tickers = [1, 5], [1, 100]
+
+    env = environment()
+    print(f"numba: {'on' if env['numba'] else 'off'} | TA-Lib: {'on' if env['talib'] else 'off'} | "
+          f"commit {env['commit']} | {env['cpus']} cpus")
+    start = time.time()
+    results = run_suite(args.cases, args.years, args.tickers, args.repeat, args.execute_max_tickers)
+    print(f"✅ {len(results)} measurements in {time.time() - start:.1f}s")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({'environment': env, 'config': CONFIG, 'results': results}, f, indent=2)
+    print(f"💾 Saved: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
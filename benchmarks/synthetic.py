@@ -0,0 +1,57 @@
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+BARS_PER_YEAR = 250
+
+@lru_cache(maxsize=16)
+def _business_days(start, n_bars):
+    # bdate_range는 봉 수에 비례해 느리므로 (시작일, 길이)별로 한 번만 만든다 (DatetimeIndex는 불변)
+    return pd.bdate_range(start, periods=n_bars)
+
+def make_ohlcv(n_bars, seed=0, start="2000-01-03", decimals=0, base=10000):
+    """재현 가능한 합성 일봉 OHLCV (기하 랜덤워크)
+
+    decimals=0이면 원화처럼 정수 가격, 2면 달러처럼 소수 둘째 자리 가격 (base: 시작 가격).
+    """
+    rng = np.random.default_rng(seed)
+    close = base * np.exp(np.cumsum(rng.normal(0.0004, 0.02, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.01, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.008, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.008, n_bars)))
+    volume = rng.integers(100000, 5000000, n_bars).astype(float)
+
+    return pd.DataFrame({
+        'date': _business_days(start, n_bars),
+        'open': open_.round(decimals),
+        'high': high.round(decimals),
+        'low': low.round(decimals),
+        'close': close.round(decimals),
+        'volume': volume,
+    })
+
+class SyntheticUniverse(Mapping):
+    """종목 n개짜리 합성 시장 {ticker: DataFrame}
+
+    종목 데이터는 요청할 때마다 (years, 종목 번호) 시드로 다시 만든다 → 결과는 항상 같고
+    전 종목을 한꺼번에 메모리에 올리지 않는다. FrameProvider에 그대로 넘길 수 있다.
+    """
+    def __init__(self, n_tickers, years, seed=0):
+        self.tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+        self.n_bars = years * BARS_PER_YEAR
+        self.seed = seed * 1000003 + years * 10007
+        self._index = {t: i for i, t in enumerate(self.tickers)}
+
+    def __getitem__(self, ticker):
+        return make_ohlcv(self.n_bars, seed=self.seed + self._index[ticker])
+
+    def __iter__(self):
+        return iter(self.tickers)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._index
@@ -0,0 +1,210 @@
+"""
+단일 종목 압축 일봉 (Backtester·전략 공용, 읽기 전용)
+
+    bars = Bars.from_frame(df)                       # float64 DataFrame → 손실 없는 가장 작은 배열
+    Backtester(bars, strategy_name='basic').run(config)
+    Backtester(bars, strategy_name='advanced').run(config)   # 같은 bars 재사용 (복사 없음)
+
+- 가격(open/high/low/close)은 float32로 정확히 왕복할 때만 float32 (원화 정수 가격), 아니면 float64
+  (달러·ETF·코인처럼 소수 가격은 float32로 바꾸면 값이 달라져 백테스트 결과가 바뀜)
+- 거래량은 int32 (int32 범위를 넘으면 int64, 소수면 float64)
+- 날짜는 datetime64[D]
+- 지표는 DataFrame에 컬럼으로 붙이지 않고 전략의 array_columns()가 필요할 때 만들어 버림
+  → 전략마다 df.copy()를 할 필요가 없음. 종가만 float64 작업 배열로 복사해 지표·시뮬레이션에 쓰므로
+  결과는 DataFrame 경로와 같음 (시가·고가·저가·거래량은 복사 없이 비교에만 쓰임)
+- float64 DataFrame(+지표 4컬럼) 대비 봉당 약 95바이트 → 28바이트(float32 가격) / 44바이트(float64 가격)
+  (python -m benchmarks.bench_memory)
+
+여러 종목을 .npy 묶음으로 저장해 두면 프로세스마다 메모리 매핑으로 열 수 있다.
+
+    write_bars("data/ohlcv/bars/1d-10y", frames)     # {ticker: DataFrame 또는 Bars}
+    bars = open_bars("data/ohlcv/bars/1d-10y")       # BarSet (Mapping: ticker → Bars, 읽기 전용)
+    pool.submit(work, bars["005930"])                # 배열 대신 (경로, 종목)만 전달
+
+- 필드별 파일 하나(dates/open/high/low/close/volume.npy)에 전 종목을 이어 붙이고 index.json에 종목별 구간
+- 종목의 Bars는 memmap 슬라이스(복사 없음). 워커 N개가 같은 페이지 캐시 한 벌을 공유
+- 가격 dtype은 묶음 단위: 모든 종목이 float32면 float32, 하나라도 float64(소수 가격)면 float64
+- BarSet·Bars(묶음에서 나온 것)는 피클하면 (경로, 종목)만 보내고 받는 쪽에서 다시 매핑
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+PRICES = FIELDS[:4]
+
+def price_dtype(*columns):
+    """가격을 잃지 않는 dtype: 모든 컬럼이 float32로 정확히 왕복하면 float32, 아니면 float64"""
+    for values in columns:
+        values = np.asarray(values, dtype=np.float64)
+        if not np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+            return np.float64
+    return np.float32
+
+def volume_dtype(volume):
+    """거래량을 잃지 않는 가장 작은 dtype (int32 → int64 → float64)"""
+    volume = np.asarray(volume)
+    if volume.size == 0:
+        return np.int32
+    if volume.dtype.kind == 'f' and not (np.isfinite(volume).all() and (volume == np.round(volume)).all()):
+        return np.float64
+    if volume.min() >= np.iinfo(np.int32).min and volume.max() <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+class Bars:
+    __slots__ = ('dates', 'open', 'high', 'low', 'close', 'volume', 'source')
+
+    def __init__(self, dates, open, high, low, close, volume, source=None):
+        self.dates = dates  # datetime64[D] 1D 배열 (오름차순)
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.source = source  # 묶음에서 연 경우 (경로, 종목)
+
+    def __reduce__(self):
+        if self.source is not None:
+            return _shared_bars, self.source  # 메모리 매핑 → 경로만 전달
+        return Bars, tuple(getattr(self, name) for name in ('dates',) + FIELDS)
+
+    def __len__(self):
+        return len(self.close)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ('dates',) + FIELDS)
+
+    def fields(self):
+        """전략 array_columns()용 필드 dict (복사 없음)"""
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def timestamps(self, index):
+        """봉 인덱스 → pd.Timestamp 리스트 (거래 내역 날짜용)"""
+        return pd.to_datetime(self.dates[index]).tolist()
+
+    def to_frame(self):
+        """기존 DataFrame 형식 (float64)"""
+        return pd.DataFrame({'date': pd.to_datetime(self.dates),
+                             **{name: getattr(self, name).astype(float) for name in FIELDS}})
+
+    @classmethod
+    def from_frame(cls, df, dtype=None):
+        """OHLCV DataFrame ('date' 컬럼 또는 날짜 인덱스) → Bars (dtype 생략 시 price_dtype으로 결정)"""
+        dates = df['date'] if 'date' in df.columns else df.index
+        prices = [df[name].to_numpy(dtype=np.float64) for name in PRICES]
+        dtype = dtype or price_dtype(*prices)
+        volume = df['volume'].to_numpy()
+        return cls(pd.to_datetime(dates).to_numpy().astype('datetime64[D]'),
+                   *(values.astype(dtype) for values in prices),
+                   volume.astype(volume_dtype(volume)))
+
+# ---------------- 메모리 매핑 묶음 (.npy) ----------------
+INDEX_FILE = "index.json"
+
+def write_bars(path, frames):
+    """{ticker: DataFrame 또는 Bars} (또는 (ticker, 값) 이터러블) → path에 .npy 묶음 저장 후 BarSet
+
+    종목은 하나씩 Bars로 압축해 두었다가 필드별로 이어 쓴다 (원본 DataFrame을 동시에 들고 있지 않음).
+    임시 디렉터리에 쓴 뒤 교체하므로 기존 묶음을 매핑 중인 프로세스는 예전 파일을 계속 읽는다.
+    """
+    items = frames.items() if hasattr(frames, 'items') else frames
+    tickers, parts = [], []
+    for ticker, value in items:
+        if value is None or len(value) == 0:
+            continue
+        tickers.append(ticker)
+        parts.append(value if isinstance(value, Bars) else Bars.from_frame(value))
+
+    path = path.rstrip(os.sep)
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    # 호출마다 고유한 임시 디렉터리 (같은 프로세스의 다른 스레드가 같은 묶음을 써도 겹치지 않음)
+    tmp = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    total = sum(len(b) for b in parts)
+    # 한 종목이라도 float64 가격이면 묶음 전체를 float64로 (float32 종목은 그대로 정확히 올라감)
+    prices = np.result_type(np.float32, *(b.close.dtype for b in parts))
+    dtypes = {'dates': np.dtype('datetime64[D]'), **{name: prices for name in PRICES},
+              'volume': np.result_type(np.int32, *(b.volume.dtype for b in parts))}
+    for name, dtype in dtypes.items():
+        out = np.lib.format.open_memmap(os.path.join(tmp, f"{name}.npy"), mode='w+', dtype=dtype, shape=(total,))
+        start = 0
+        for b in parts:
+            out[start:start + len(b)] = getattr(b, name)
+            start += len(b)
+        out.flush()
+        del out
+
+    index, start = {}, 0
+    for ticker, b in zip(tickers, parts):
+        index[ticker] = [start, start + len(b)]
+        start += len(b)
+    with open(os.path.join(tmp, INDEX_FILE), "w") as f:
+        json.dump({'tickers': index, 'bars': total}, f)
+
+    if os.path.exists(path):
+        old = tempfile.mkdtemp(dir=parent, prefix=os.path.basename(path) + ".", suffix=".old")
+        os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+    else:
+        os.replace(tmp, path)
+    _open_sets.pop(os.path.abspath(path), None)
+    return open_bars(path)
+
+class BarSet:
+    """.npy 묶음의 읽기 전용 뷰 (Mapping: ticker → Bars)"""
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        with open(os.path.join(self.path, INDEX_FILE), "r") as f:
+            self.index = json.load(f)['tickers']
+        self.arrays = {name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+                       for name in ('dates',) + FIELDS}
+
+    def __reduce__(self):
+        return open_bars, (self.path,)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __contains__(self, ticker):
+        return ticker in self.index
+
+    def __getitem__(self, ticker):
+        start, end = self.index[ticker]
+        return Bars(*(self.arrays[name][start:end] for name in ('dates',) + FIELDS), source=(self.path, ticker))
+
+    def get(self, ticker, default=None):
+        return self[ticker] if ticker in self.index else default
+
+    def keys(self):
+        return self.index.keys()
+
+    def items(self):
+        return ((ticker, self[ticker]) for ticker in self.index)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values())
+
+_open_sets = {}  # 프로세스별로 묶음 하나당 한 번만 매핑
+
+def open_bars(path):
+    """.npy 묶음 열기 (같은 프로세스에서는 같은 BarSet 재사용)"""
+    key = os.path.abspath(path)
+    bar_set = _open_sets.get(key)
+    if bar_set is None:
+        bar_set = _open_sets[key] = BarSet(key)
+    return bar_set
+
+def _shared_bars(path, ticker):
+    return open_bars(path)[ticker]
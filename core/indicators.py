@@ -0,0 +1,118 @@
+"""
+증분 지표 상태 (실시간 평가용)
+
+종목마다 IndicatorState 하나를 메모리에 두고, 마감된 봉은 push()로 넣고
+장중 갱신되는 당일 봉은 columns()로 미리보기만 한다. 이동평균과 RSI는
+링 버퍼 + 누적합이라 봉/체결 하나당 O(1)이고, 값은 backtest.compute_indicators
+(pandas rolling)와 상대 오차 1e-9 이내로 같고 신호는 전 구간 signals()와 같다
+(python -m benchmarks.parity --checks incremental 로 모든 봉에서 확인).
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+from backtest import INDICATOR_WINDOWS, bullish_pattern_mask, talib
+
+PATTERN_BARS = 16  # TA-Lib 캔들 패턴 계산에 쓰는 최근 봉 수 (패턴 lookback 11봉 + 여유)
+
+class RollingMean:
+    """고정 길이 이동평균 (링 버퍼 + 누적합)"""
+    __slots__ = ('window', '_buf', '_pos', '_count', '_sum')
+
+    def __init__(self, window):
+        self.window = window
+        self._buf = [0.0] * window
+        self._pos = 0      # 다음에 덮어쓸 자리 = 가장 오래된 값
+        self._count = 0
+        self._sum = 0.0
+
+    def push(self, x):
+        self._sum += x - self._buf[self._pos]
+        self._buf[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self._count += 1
+        if self._pos == 0:
+            # 한 바퀴마다 누적합을 다시 계산해 부동소수점 오차가 쌓이지 않게 함
+            self._sum = math.fsum(self._buf)
+
+    def preview(self, x):
+        """x가 다음 값으로 들어왔을 때의 평균 (상태는 바꾸지 않음)"""
+        if self._count + 1 < self.window:
+            return math.nan
+        return (self._sum - self._buf[self._pos] + x) / self.window
+
+class RollingRSI:
+    """단순 이동평균 방식 RSI (backtest.rsi와 동일: 첫 변화량은 0으로 취급)"""
+    __slots__ = ('gain', 'loss', 'prev')
+
+    def __init__(self, period):
+        self.gain = RollingMean(period)
+        self.loss = RollingMean(period)
+        self.prev = None
+
+    def _delta(self, close):
+        return 0.0 if self.prev is None else close - self.prev
+
+    def push(self, close):
+        delta = self._delta(close)
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+        self.prev = close
+
+    def preview(self, close):
+        delta = self._delta(close)
+        gain = self.gain.preview(delta if delta > 0 else 0.0)
+        loss = self.loss.preview(-delta if delta < 0 else 0.0)
+        if loss == 0:
+            return math.nan if gain == 0 else 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+class IndicatorState:
+    """한 종목의 전략 지표 상태 (ma20, ma60, vol_ma5, rsi + 최근 봉 OHLC)"""
+    def __init__(self, config=None):
+        windows = {**INDICATOR_WINDOWS, **{k: v for k, v in (config or {}).items() if k in INDICATOR_WINDOWS}}
+        self.ma20 = RollingMean(windows['ma_period'])
+        self.ma60 = RollingMean(windows['ma_long'])
+        self.vol_ma5 = RollingMean(windows['vol_period'])
+        self.rsi = RollingRSI(windows['rsi_period'])
+        self.recent = deque(maxlen=PATTERN_BARS - 1)  # 마감된 봉 (open, high, low, close)
+        self.bars = 0
+
+    @property
+    def prev_close(self):
+        return self.recent[-1][3] if self.recent else math.nan
+
+    def push(self, open_, high, low, close, volume):
+        """마감된 봉 하나 반영"""
+        self.ma20.push(close)
+        self.ma60.push(close)
+        self.vol_ma5.push(volume)
+        self.rsi.push(close)
+        self.recent.append((open_, high, low, close))
+        self.bars += 1
+
+    def columns(self, open_, high, low, close, volume, patterns=True):
+        """진행 중인 봉(당일)을 마지막 봉으로 본 전략 컬럼 (스칼라 dict)
+
+        patterns=False면 캔들 패턴('bullish')을 건너뛴다 (패턴을 안 쓰는 전략용, 가장 비싼 부분).
+        """
+        cols = {
+            'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+            'prev_close': self.prev_close,
+            'ma20': self.ma20.preview(close),
+            'ma60': self.ma60.preview(close),
+            'vol_ma5': self.vol_ma5.preview(volume),
+            'rsi': self.rsi.preview(close),
+        }
+        if not patterns:
+            return cols
+        if talib:
+            # TA-Lib 패턴은 최근 몇 봉만 보면 되므로 짧은 배열로 계산
+            ohlc = np.array(list(self.recent) + [(open_, high, low, close)], dtype=np.float64)
+            window = {k: ohlc[:, i] for i, k in enumerate(('open', 'high', 'low', 'close'))}
+            cols['bullish'] = bool(bullish_pattern_mask(window)[-1])
+        else:
+            cols['bullish'] = bool(bullish_pattern_mask(cols))
+        return cols
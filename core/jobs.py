@@ -0,0 +1,99 @@
+"""
+백그라운드 작업 관리 (대시보드 백테스트용)
+
+submit()은 작업 id를 바로 돌려주고 실제 계산은 스레드 풀(기본) 또는 프로세스 풀에서 돈다.
+- 스레드(기본): 작업이 같은 프로세스의 캐시(결과 캐시·시세 캐시)를 공유하고, 인자·결과 피클이 없음.
+  백테스트 계산은 NumPy/numba 배열 연산이라 수 ms이고 대부분은 데이터 I/O라 GIL 영향이 작음
+- processes=True: 순수 파이썬 계산이 길어 웹 서버 응답을 막을 때 (fn·인자·결과가 피클 가능해야 하고 캐시는 공유 안 됨)
+상태는 get(job_id)로 조회: queued → running → done / error.
+끝난 작업은 최근 keep개까지만 보관한다.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+class JobManager:
+    def __init__(self, max_workers=JOB_WORKERS, processes=False, keep=100):
+        pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self.executor = pool(max_workers=max_workers)
+        self.keep = keep
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, label="", on_done=None, **kwargs):
+        """작업 등록 → job_id. on_done(job)은 성공 시 메인 프로세스에서 호출"""
+        job_id = uuid.uuid4().hex[:12]
+        job = {'id': job_id, 'label': label, 'submitted': time.time(), 'finished': None,
+               'result': None, 'error': None}
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict()
+        future = self.executor.submit(fn, *args, **kwargs)
+        job['future'] = future
+
+        def finish(f):
+            # 결과·오류를 먼저 채우고 finished는 마지막에, 모두 락 안에서
+            # → get()이 'done'을 보면 result도 반드시 있음
+            try:
+                result, error = f.result(), None
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+            with self._lock:
+                job['result'] = result
+                job['error'] = error
+                job['finished'] = time.time()
+            if error:
+                print(f"❌ Job {job_id} ({label}) failed: {error}")
+                return
+            if on_done:
+                try:
+                    on_done(job)
+                except Exception as e:
+                    print(f"⚠️ Job {job_id} callback error: {e}")
+
+        future.add_done_callback(finish)
+        return job_id
+
+    def _evict(self):
+        """완료된 작업부터 오래된 순으로 keep개 초과분 삭제"""
+        excess = len(self._jobs) - self.keep
+        for job_id in [j for j, job in self._jobs.items() if job['finished']][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _status(job):
+        """작업 상태 (self._lock 안에서 호출)"""
+        future = job.get('future')
+        if job['finished']:
+            return 'error' if job['error'] else 'done'
+        if future is not None and future.running():
+            return 'running'
+        return 'queued'
+
+    def get(self, job_id):
+        """작업 상태 스냅샷 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {k: v for k, v in job.items() if k != 'future'}
+            snapshot['status'] = self._status(job)
+        end = snapshot['finished'] or time.time()
+        snapshot['elapsed'] = end - snapshot['submitted']
+        return snapshot
+
+    def list(self):
+        """최근 작업 목록 (결과 제외, 최신순)"""
+        with self._lock:
+            ids = list(self._jobs)[::-1]
+        snapshots = (self.get(j) for j in ids)
+        return [{k: v for k, v in s.items() if k != 'result'} for s in snapshots if s is not None]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
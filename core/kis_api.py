@@ -2,7 +2,12 @@ import requests
 import json
 import os
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from core.metrics import metrics
+from core.token_cache import TokenCache, cache_key
 
 # Load Config
 load_dotenv("/Volumes/SSD/DEV_SSD/MY/KIS_AutoTrade/config/settings.env")
@@ -13,20 +18,66 @@ URL_BASE = os.getenv("URL_BASE")
 CANO = os.getenv("CANO")
 ACNT_PRDT_CD = os.getenv("ACNT_PRDT_CD")
 
+# 초당 TR 호출 한도 (KIS 기준 실전 20건/초, 모의 5건/초 이하 - 여유분 포함)
+RATE_LIMIT = os.getenv("KIS_RATE_LIMIT")
+RATE_LIMIT_ERROR = "EGW00201"  # 초당 거래건수 초과
+TOKEN_EXPIRED_ERROR = "EGW00123"  # 기간이 만료된 token
+
+class RateLimiter:
+    """초당 호출 수 제한 (스레드 안전, 호출 간격을 1/rate초로 고르게 분산)"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+def default_rate_limit(url_base):
+    if RATE_LIMIT:
+        return float(RATE_LIMIT)
+    return 4 if url_base and "openapivts" in url_base else 18
+
 class KISApi:
-    def __init__(self):
+    def __init__(self, url_base=None, rate_limit=None, max_workers=8, token_cache=None):
+        self.url_base = url_base or URL_BASE
+        self.token_cache = token_cache or TokenCache()
         self.access_token = None
         self.token_expiry = 0
         self.headers = {"content-type": "application/json"}
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate_limit or default_rate_limit(self.url_base))
+
+        # 커넥션 풀: 요청마다 TCP/TLS 핸드셰이크를 다시 하지 않도록 세션 재사용
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         self._get_access_token()
 
-    def _get_access_token(self):
-        """토큰 발급 및 갱신"""
-        if time.time() < self.token_expiry:
+    def _get_access_token(self, stale=None):
+        """토큰 발급 및 갱신 (파일 캐시 공유, 만료 전에 미리 갱신)"""
+        if stale is None and time.time() < self.token_expiry - self.token_cache.margin:
             return
 
+        token, expiry = self.token_cache.get(cache_key(APP_KEY, self.url_base), self._issue_token, stale)
+        if token:
+            self.access_token = token
+            self.token_expiry = expiry
+            self.headers["authorization"] = f"Bearer {self.access_token}"
+            self.headers["appkey"] = APP_KEY
+            self.headers["appsecret"] = APP_SECRET
+
+    def _issue_token(self):
+        """OAuth 토큰 신규 발급 → (token, expiry). 실패 시 (None, 0)"""
         path = "oauth2/tokenP"
-        url = f"{URL_BASE}/{path}"
+        url = f"{self.url_base}/{path}"
         body = {
             "grant_type": "client_credentials",
             "appkey": APP_KEY,
@@ -34,33 +85,63 @@ class KISApi:
         }
         
         try:
-            res = requests.post(url, headers=self.headers, data=json.dumps(body))
+            res = self.session.post(url, headers={"content-type": "application/json"}, data=json.dumps(body), timeout=10)
             data = res.json()
             if "access_token" in data:
-                self.access_token = data["access_token"]
-                self.token_expiry = time.time() + 86000 # 24시간
-                self.headers["authorization"] = f"Bearer {self.access_token}"
-                self.headers["appkey"] = APP_KEY
-                self.headers["appsecret"] = APP_SECRET
                 print("✅ Access Token Issued")
+                metrics.count("kis.tokens_issued")
+                return data["access_token"], time.time() + int(data.get("expires_in", 86400)) - 400
             else:
                 print(f"❌ Token Error: {data}")
         except Exception as e:
             print(f"❌ Connection Error: {e}")
+        return None, 0
+
+    def get_approval_key(self):
+        """실시간(WebSocket) 접속키 발급"""
+        url = f"{self.url_base}/oauth2/Approval"
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": APP_KEY,
+            "secretkey": APP_SECRET
+        }
+        res = self.session.post(url, headers={"content-type": "application/json"}, data=json.dumps(body), timeout=10)
+        return res.json().get("approval_key")
+
+    def _request(self, method, path, tr_id, params=None, body=None, retries=3):
+        """TR 호출 (속도 제한 + 초당 한도 초과·토큰 만료 시 재시도)"""
+        url = f"{self.url_base}/{path}"
+        self._get_access_token()
+
+        for attempt in range(retries):
+            token = self.access_token
+            headers = self.headers.copy()
+            headers["tr_id"] = tr_id
+            self.limiter.acquire()
+            metrics.count("kis.calls")
+            with metrics.timer("kis.request"):
+                res = self.session.request(method, url, headers=headers, params=params,
+                                           data=json.dumps(body) if body is not None else None, timeout=10)
+            if res.status_code != 200 and RATE_LIMIT_ERROR in res.text:
+                metrics.count("kis.rate_limited")
+                time.sleep(0.2 * (attempt + 1))
+                continue
+            if res.status_code != 200 and TOKEN_EXPIRED_ERROR in res.text:
+                metrics.count("kis.token_expired")
+                self._get_access_token(stale=token)
+                continue
+            return res
+        return res
 
     def get_current_price(self, code):
         """현재가 조회"""
         path = "uapi/domestic-stock/v1/quotations/inquire-price"
-        url = f"{URL_BASE}/{path}"
-        headers = self.headers.copy()
-        headers["tr_id"] = "FHKST01010100"
-        
         params = {
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": code
         }
         
-        res = requests.get(url, headers=headers, params=params)
+        res = self._request("GET", path, "FHKST01010100", params=params)
         if res.status_code == 200:
             data = res.json().get('output', {})
             return {
@@ -73,10 +154,6 @@ class KISApi:
     def get_daily_chart(self, code, period="D"):
         """일봉 데이터 조회 (이평선 계산용)"""
         path = "uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        url = f"{URL_BASE}/{path}"
-        headers = self.headers.copy()
-        headers["tr_id"] = "FHKST01010400"
-        
         params = {
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": code,
@@ -84,18 +161,35 @@ class KISApi:
             "fid_org_adj_prc": "1" # 수정주가
         }
         
-        res = requests.get(url, headers=headers, params=params)
+        res = self._request("GET", path, "FHKST01010400", params=params)
         if res.status_code == 200:
             return res.json().get('output', [])
         return []
 
-    def buy_order(self, code, qty):
-        """시장가 매수"""
+    def _fetch_many(self, fn, codes, empty):
+        """여러 종목 동시 조회 (스레드 풀 + 공용 속도 제한). 실패한 종목은 empty 값"""
+        def safe(code):
+            try:
+                return fn(code)
+            except Exception as e:
+                print(f"❌ [{code}] Request Error: {e}")
+                return empty
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(codes, pool.map(safe, codes)))
+
+    def get_current_prices(self, codes):
+        """여러 종목 현재가 동시 조회 → {code: dict 또는 None}"""
+        return self._fetch_many(self.get_current_price, codes, None)
+
+    def get_daily_charts(self, codes, period="D"):
+        """여러 종목 일봉 동시 조회 → {code: list}"""
+        return self._fetch_many(lambda code: self.get_daily_chart(code, period), codes, [])
+
+    def _order_cash(self, code, qty, tr_id):
+        """현금 주문 (시장가). 응답이 JSON이 아니면 HTTP 오류를 올림 → 주문 접수 여부를 알 수 없는 경우"""
         path = "uapi/domestic-stock/v1/trading/order-cash"
-        url = f"{URL_BASE}/{path}"
-        headers = self.headers.copy()
-        headers["tr_id"] = "VTTC0802U" # 모의투자 매수 (실전: TTTC0802U)
-        
+
         data = {
             "CANO": CANO,
             "ACNT_PRDT_CD": ACNT_PRDT_CD,
@@ -104,25 +198,90 @@ class KISApi:
             "ORD_QTY": str(qty),
             "ORD_UNPR": "0",
         }
-        
-        res = requests.post(url, headers=headers, data=json.dumps(data))
-        return res.json()
 
+        res = self._request("POST", path, tr_id, body=data)
+        try:
+            return res.json()
+        except ValueError:
+            res.raise_for_status()
+            raise
+
+    @metrics.timed("kis.order")
+    def buy_order(self, code, qty):
+        """시장가 매수"""
+        # 모의투자 매수 (실전: TTTC0802U)
+        return self._order_cash(code, qty, "VTTC0802U")
+
+    @metrics.timed("kis.order")
     def sell_order(self, code, qty):
         """시장가 매도"""
-        path = "uapi/domestic-stock/v1/trading/order-cash"
-        url = f"{URL_BASE}/{path}"
-        headers = self.headers.copy()
-        headers["tr_id"] = "VTTC0801U" # 모의투자 매도 (실전: TTTC0801U)
-        
-        data = {
+        # 모의투자 매도 (실전: TTTC0801U)
+        return self._order_cash(code, qty, "VTTC0801U")
+
+    def get_balance(self):
+        """주식 잔고 조회 → {'cash': 예수금, 'total': 총평가, 'positions': {code: {'qty', 'avg_price', 'price'}}}"""
+        path = "uapi/domestic-stock/v1/trading/inquire-balance"
+        params = {
             "CANO": CANO,
             "ACNT_PRDT_CD": ACNT_PRDT_CD,
-            "PDNO": code,
-            "ORD_DVSN": "01",
-            "ORD_QTY": str(qty),
-            "ORD_UNPR": "0",
+            "AFHR_FLPR_YN": "N",
+            "OFL_YN": "",
+            "INQR_DVSN": "02", # 종목별
+            "UNPR_DVSN": "01",
+            "FUND_STTL_ICLD_YN": "N",
+            "FNCG_AMT_AUTO_RDPT_YN": "N",
+            "PRCS_DVSN": "00",
+            "CTX_AREA_FK100": "",
+            "CTX_AREA_NK100": "",
         }
-        
-        res = requests.post(url, headers=headers, data=json.dumps(data))
-        return res.json()
+
+        # 모의투자 잔고 (실전: TTTC8434R)
+        res = self._request("GET", path, "VTTC8434R", params=params)
+        if res.status_code != 200:
+            raise RuntimeError(f"잔고 조회 실패: HTTP {res.status_code}")
+        data = res.json()
+        if data.get("rt_cd") != "0":
+            raise RuntimeError(f"잔고 조회 실패: {data.get('msg1', data.get('rt_cd'))}")
+
+        positions = {}
+        for row in data.get("output1", []):
+            qty = int(row.get("hldg_qty", 0))
+            if qty > 0:
+                positions[row["pdno"]] = {"qty": qty, "avg_price": float(row.get("pchs_avg_pric", 0)),
+                                          "price": float(row.get("prpr", 0))}
+        summary = (data.get("output2") or [{}])[0]
+        return {"cash": float(summary.get("dnca_tot_amt", 0)), "total": float(summary.get("tot_evlu_amt", 0)),
+                "positions": positions}
+
+    def get_today_orders(self):
+        """당일 주문 체결 내역 → [{'odno', 'code', 'side', 'qty', 'filled', 'price'}] (접수 순)"""
+        path = "uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+        today = time.strftime("%Y%m%d")
+        params = {
+            "CANO": CANO,
+            "ACNT_PRDT_CD": ACNT_PRDT_CD,
+            "INQR_STRT_DT": today,
+            "INQR_END_DT": today,
+            "SLL_BUY_DVSN_CD": "00", # 전체
+            "INQR_DVSN": "01", # 정순
+            "PDNO": "",
+            "CCLD_DVSN": "00",
+            "ORD_GNO_BRNO": "",
+            "ODNO": "",
+            "INQR_DVSN_3": "00",
+            "INQR_DVSN_1": "",
+            "CTX_AREA_FK100": "",
+            "CTX_AREA_NK100": "",
+        }
+
+        # 모의투자 일별 주문체결 (실전: TTTC8001R)
+        res = self._request("GET", path, "VTTC8001R", params=params)
+        if res.status_code != 200:
+            raise RuntimeError(f"주문 내역 조회 실패: HTTP {res.status_code}")
+        data = res.json()
+        if data.get("rt_cd") != "0":
+            raise RuntimeError(f"주문 내역 조회 실패: {data.get('msg1', data.get('rt_cd'))}")
+        return [{"odno": row["odno"], "code": row["pdno"],
+                 "side": "sell" if row.get("sll_buy_dvsn_cd") == "01" else "buy",
+                 "qty": int(row.get("ord_qty", 0)), "filled": int(row.get("tot_ccld_qty", 0)),
+                 "price": float(row.get("avg_prvs", 0))} for row in data.get("output1", [])]
@@ -0,0 +1,127 @@
+"""
+봇 로그 파일 tail / follow / 회전
+
+- tail(): 파일 끝에서 블록 단위로 거꾸로 읽어 마지막 n줄만 반환 (파일 크기와 무관)
+- follow_async(): 새로 추가된 줄만 이어서 전달 (SSE용). 회전되면 새 파일을 처음부터 읽음
+- redirect_output(): 봇 프로세스가 자기 stdout/stderr를 크기 기준 회전 로그(logs/bot.log, .1, .2 ...)로 직접 기록
+  → 봇은 대시보드 없이도 로그를 남기고, 대시보드(/logs, /logs/stream)는 파일을 읽기만 함
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+from logging.handlers import RotatingFileHandler
+
+LOG_PATH = "logs/bot.log"
+MAX_BYTES = int(os.getenv("BOT_LOG_MAX_BYTES", str(5 * 1024 * 1024)))  # 5MB마다 회전
+BACKUPS = int(os.getenv("BOT_LOG_BACKUPS", "3"))
+
+def tail(path, n=20, block=8192):
+    """마지막 n줄 (파일이 없으면 빈 리스트)"""
+    if n <= 0:
+        return []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines()[-n:]]
+
+async def follow_async(path, poll=0.5, heartbeat=15.0):
+    """새 줄을 하나씩 생성 (대기 중에는 heartbeat초마다 None 생성 → 연결 유지용)
+
+    파일이 교체(회전)되거나 잘리면 새 파일을 처음부터 읽는다.
+    """
+    f = None
+    idle = 0.0
+    buffer = ""
+    try:
+        while True:
+            if f is None:
+                try:
+                    f = open(path, "r", encoding="utf-8", errors="replace")
+                    f.seek(0, os.SEEK_END)
+                except FileNotFoundError:
+                    f = None
+
+            chunk = f.read() if f else ""
+            if chunk:
+                idle = 0.0
+                buffer += chunk
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    yield line
+                continue
+
+            if f is not None:
+                try:
+                    st = os.stat(path)
+                    if st.st_ino != os.fstat(f.fileno()).st_ino or st.st_size < f.tell():
+                        # 회전됨: 새 파일을 처음부터
+                        f.close()
+                        f = open(path, "r", encoding="utf-8", errors="replace")
+                        buffer = ""
+                        continue
+                except FileNotFoundError:
+                    pass
+
+            await asyncio.sleep(poll)
+            idle += poll
+            if idle >= heartbeat:
+                idle = 0.0
+                yield None
+    finally:
+        if f:
+            f.close()
+
+def rotating_logger(path=LOG_PATH, max_bytes=MAX_BYTES, backups=BACKUPS):
+    """메시지만 그대로 쓰는 크기 기준 회전 로거"""
+    logger = logging.getLogger(f"dipsniper.log.{path}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+class LogWriter:
+    """print()용 파일 객체: 완성된 줄만 회전 로거로 보냄 (여러 스레드에서 써도 줄이 섞이지 않음)"""
+    def __init__(self, logger):
+        self.logger = logger
+        self.buffer = ""
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        with self._lock:
+            self.buffer += text
+            *lines, self.buffer = self.buffer.split("\n")
+        for line in lines:
+            self.logger.info(line)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            line, self.buffer = self.buffer, ""
+        if line:
+            self.logger.info(line)
+
+    def isatty(self):
+        return False
+
+def redirect_output(path=LOG_PATH):
+    """이 프로세스의 stdout/stderr → 회전 로그 (봇 프로세스 시작 시 호출)"""
+    writer = LogWriter(rotating_logger(path))
+    sys.stdout = sys.stderr = writer
+    return writer
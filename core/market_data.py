@@ -0,0 +1,308 @@
+"""
+OHLCV 로컬 캐시 (시장 데이터 공용 레이어)
+
+종목·봉 간격별로 data/ohlcv/<interval>/<ticker>.parquet 에 저장해 두고,
+같은 요청은 디스크에서 바로 응답한다. 캐시가 오래되면 마지막 저장 날짜부터
+빠진 꼬리 구간만 내려받아 이어 붙인다.
+
+다운로드는 공급자(provider) 객체가 담당하므로 테스트에서는 FrameProvider 같은
+로컬 가짜 공급자를 넣어 네트워크 없이 돌릴 수 있다.
+"""
+
+import hashlib
+import os
+import re
+import json
+import shutil
+import tempfile
+import threading
+import time
+import pandas as pd
+from core.bars import FIELDS as BAR_FIELDS, Bars, open_bars, write_bars
+from core.metrics import metrics
+
+# Parquet 저장에는 pyarrow가 필요. 없으면 pickle로 대체.
+try:
+    import pyarrow  # noqa: F401
+    CACHE_EXT = ".parquet"
+except ImportError:
+    print("⚠️ pyarrow not found. OHLCV cache falls back to pickle.")
+    CACHE_EXT = ".pkl"
+
+CACHE_DIR = "data/ohlcv"
+MAX_AGE = 3600  # 초. 이보다 오래된 캐시는 꼬리 구간을 새로 받음
+RETRIES = 3     # 다운로드 실패 시 재시도 횟수 (간격은 backoff * 2^n 초)
+BUNDLE_KEEP = 86400  # 초. 같은 종목 목록의 예전 .npy 묶음은 이보다 오래되면 export_bars가 지움
+
+_PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+
+def normalize_ohlcv(df):
+    """yfinance 결과 → 소문자 컬럼 + 'date' 컬럼 형태로 정리"""
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    df.columns = [c.lower() for c in df.columns]
+    df.reset_index(inplace=True)
+    df.rename(columns={'Date': 'date', 'Datetime': 'date', 'index': 'date'}, inplace=True)
+    return df
+
+def period_start(period, now=None):
+    """yfinance 기간 문자열('60d', '1y', 'ytd', 'max' ...) → 시작일 (max면 None)"""
+    if period == "max":
+        return None
+    today = (pd.Timestamp.today() if now is None else pd.Timestamp(now)).normalize()
+    if period == "ytd":
+        return pd.Timestamp(today.year, 1, 1)
+    m = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not m:
+        raise ValueError(f"Unknown period: {period}")
+    return today - pd.DateOffset(**{_PERIOD_UNITS[m.group(2)]: int(m.group(1))})
+
+def _since(df, start):
+    """start 이후 구간만 (start가 None이면 전체)"""
+    if start is None or df.empty:
+        return df.reset_index(drop=True)
+    tz = getattr(df['date'].dt, 'tz', None)
+    if tz is not None:
+        start = start.tz_localize(tz)
+    return df[df['date'] >= start].reset_index(drop=True)
+
+class YFinanceProvider:
+    """yfinance 다운로드 (기본 공급자)"""
+    def fetch(self, tickers, start=None, interval="1d"):
+        """여러 종목 일괄 다운로드 → {ticker: DataFrame}"""
+        import yfinance as yf
+
+        metrics.count("yfinance.calls")
+        with metrics.timer("yfinance.download"):
+            if start is None:
+                data = yf.download(tickers, period="max", interval=interval, progress=False, group_by='ticker')
+            else:
+                data = yf.download(tickers, start=start.strftime("%Y-%m-%d"), interval=interval, progress=False, group_by='ticker')
+        if data is None or data.empty:
+            return {}
+
+        frames = {}
+        if isinstance(data.columns, pd.MultiIndex) and set(tickers) & set(data.columns.get_level_values(0)):
+            for ticker in tickers:
+                if ticker in data.columns.get_level_values(0):
+                    frames[ticker] = data[ticker].copy()
+        elif len(tickers) == 1:
+            frames[tickers[0]] = data
+
+        # 여러 종목을 한 번에 받으면 거래일이 다른 종목의 빈 행이 섞임
+        return {t: normalize_ohlcv(df.dropna(how='all')) for t, df in frames.items()}
+
+class FrameProvider:
+    """미리 준비한 DataFrame을 돌려주는 공급자 (네트워크 없는 테스트·벤치마크용)"""
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def fetch(self, tickers, start=None, interval="1d"):
+        self.calls.append((tuple(tickers), start, interval))
+        return {t: _since(self.frames[t], start) for t in tickers if t in self.frames}
+
+class MarketDataStore:
+    def __init__(self, cache_dir=CACHE_DIR, provider=None, max_age=MAX_AGE, retries=RETRIES, backoff=1.0):
+        self.cache_dir = cache_dir
+        self.provider = provider or YFinanceProvider()
+        self.max_age = max_age
+        self.retries = retries
+        self.backoff = backoff
+        self._locks = {}  # 캐시 파일 경로 → 쓰기 락 (같은 프로세스의 스레드끼리)
+        self._locks_guard = threading.Lock()
+
+    def _path(self, ticker, interval):
+        return os.path.join(self.cache_dir, interval, ticker.replace("/", "_"))
+
+    def read(self, ticker, interval="1d"):
+        """디스크 캐시 조회 → (DataFrame 또는 None, 메타 dict)"""
+        path = self._path(ticker, interval)
+        if not os.path.exists(path + CACHE_EXT):
+            return None, {}
+        try:
+            if CACHE_EXT == ".parquet":
+                df = pd.read_parquet(path + CACHE_EXT)
+            else:
+                df = pd.read_pickle(path + CACHE_EXT)
+            with open(path + ".json", "r") as f:
+                meta = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Cache read error ({ticker}): {e}")
+            return None, {}
+        return df, meta
+
+    def _lock(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _write(self, ticker, interval, df, meta):
+        path = self._path(ticker, interval)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # 파일마다 고유한 임시 파일에 쓴 뒤 교체 (다른 프로세스·스레드가 반쯤 쓴 파일을 읽거나 덮지 않도록)
+        # 같은 프로세스 안에서는 종목별 락으로 데이터·메타 쌍이 섞이지 않게 한다
+        with self._lock(path):
+            for target, write in ((path + CACHE_EXT, self._write_frame(df)), (path + ".json", self._write_meta(meta))):
+                fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        write(f)
+                    os.replace(tmp, target)
+                except BaseException:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                    raise
+
+    @staticmethod
+    def _write_frame(df):
+        if CACHE_EXT == ".parquet":
+            return lambda f: df.to_parquet(f, index=False)
+        return lambda f: df.to_pickle(f)
+
+    @staticmethod
+    def _write_meta(meta):
+        return lambda f: f.write(json.dumps(meta).encode())
+
+    def _fetch_start(self, df, meta, start, now):
+        """다운로드가 필요하면 (True, 시작일), 디스크로 충분하면 (False, None)"""
+        if df is None or df.empty:
+            return True, start
+
+        cached_start = meta.get('start')
+        cached_start = pd.Timestamp(cached_start) if cached_start else None
+        # 요청 구간이 캐시보다 앞에서 시작하면 앞부분까지 다시 받음
+        if cached_start is not None and (start is None or start < cached_start):
+            return True, start
+        # 오래된 캐시는 마지막 봉(미완성일 수 있음)부터 꼬리만 받음
+        if now - meta.get('fetched_at', 0) > self.max_age:
+            return True, pd.Timestamp(df['date'].iloc[-1]).tz_localize(None).normalize()
+        return False, None
+
+    def _fetch(self, group, start, interval):
+        """공급자 다운로드 (실패하면 재시도, 끝내 실패하면 None)"""
+        label = f"{', '.join(group[:3])}{'...' if len(group) > 3 else ''}"
+        for attempt in range(self.retries + 1):
+            try:
+                return self.provider.fetch(group, start, interval)
+            except Exception as e:
+                if attempt == self.retries:
+                    print(f"⚠️ Download error ({label}): {e}")
+                    return None
+                delay = self.backoff * 2 ** attempt
+                print(f"⚠️ Download error ({label}): {e}. Retry in {delay:.0f}s")
+                time.sleep(delay)
+
+    def load(self, ticker, period="1y", interval="1d"):
+        """단일 종목 OHLCV (date, open, high, low, close, volume ...)"""
+        frames = self.load_many([ticker], period, interval)
+        return frames.get(ticker, pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume']))
+
+    @metrics.timed("data.load")
+    def load_many(self, tickers, period="1y", interval="1d"):
+        """여러 종목 OHLCV → {ticker: DataFrame}. 다운로드는 시작일이 같은 종목끼리 묶어서 한 번에"""
+        now = time.time()
+        start = period_start(period)
+
+        cached, metas, groups = {}, {}, {}
+        for ticker in tickers:
+            df, meta = self.read(ticker, interval)
+            cached[ticker], metas[ticker] = df, meta
+            needed, fetch_start = self._fetch_start(df, meta, start, now)
+            if needed:
+                groups.setdefault(fetch_start, []).append(ticker)
+
+        for fetch_start, group in groups.items():
+            fetched = self._fetch(group, fetch_start, interval)
+            if fetched is None:
+                # 다운로드가 실패해도 캐시가 있으면 그대로 사용
+                continue
+
+            for ticker in group:
+                new = fetched.get(ticker)
+                old = cached[ticker]
+                if new is None or new.empty:
+                    if old is None:
+                        continue
+                    merged = old
+                elif old is None or old.empty:
+                    merged = new
+                else:
+                    merged = (pd.concat([old, new], ignore_index=True)
+                              .drop_duplicates('date', keep='last')
+                              .sort_values('date')
+                              .reset_index(drop=True))
+
+                # 캐시가 덮는 구간의 시작 (None = 상장일부터 전체)
+                if old is None:
+                    covered = fetch_start
+                else:
+                    old_start = metas[ticker].get('start')
+                    covered = None if old_start is None or fetch_start is None else min(pd.Timestamp(old_start), fetch_start)
+                meta = {'start': covered.strftime("%Y-%m-%d") if covered is not None else None, 'fetched_at': now}
+                self._write(ticker, interval, merged, meta)
+                cached[ticker] = merged
+
+        return {t: _since(df, start) for t, df in cached.items() if df is not None}
+
+    def iter_chunks(self, tickers, period="1y", interval="1d", chunk_size=200):
+        """종목을 chunk_size개씩 나눠 load_many → (chunk 종목 리스트, {ticker: DataFrame}) 순서대로 생성
+
+        전 종목을 한 번에 메모리에 올리지 않고, 한 묶음을 처리한 뒤 다음 묶음을 받는다.
+        """
+        for i in range(0, len(tickers), chunk_size):
+            chunk = tickers[i:i + chunk_size]
+            yield chunk, self.load_many(chunk, period, interval)
+
+    def export_bars(self, tickers, period="1y", interval="1d", path=None, chunk_size=200):
+        """종목 OHLCV → .npy 묶음 → 메모리 매핑 BarSet
+
+        멀티프로세스 작업(배치 백테스트·최적화·walk-forward)에서 워커마다 DataFrame을 피클로 받는 대신
+        같은 파일을 매핑해 페이지 캐시 한 벌을 공유한다. 묶음 단위로 받아 압축하므로 메모리는 압축본만큼만.
+
+        path를 생략하면 cache_dir/bars/<interval>-<period>-<종목 목록 해시>-<내용 해시>에 쓴다.
+        내용이 같은 묶음이 이미 있으면 다시 쓰지 않고 열기만 하므로, 동시에 도는 다른 --mmap 실행의
+        묶음을 덮어쓰거나 교체하지 않는다. 같은 종목 목록의 예전 묶음은 BUNDLE_KEEP초가 지나면 지운다.
+        """
+        compact = []
+        for _, frames in self.iter_chunks(tickers, period, interval, chunk_size):
+            compact += [(t, Bars.from_frame(df)) for t, df in frames.items() if not df.empty]
+        if path:
+            return write_bars(path, compact)
+
+        bundles = os.path.join(self.cache_dir, "bars")
+        prefix = f"{interval}-{period}-{hashlib.sha1(chr(10).join(sorted(set(tickers))).encode()).hexdigest()[:12]}-"
+        content = hashlib.sha1()
+        for ticker, bars in sorted(compact, key=lambda item: item[0]):
+            content.update(ticker.encode())
+            for name in ('dates',) + BAR_FIELDS:
+                values = getattr(bars, name)
+                content.update(values.dtype.str.encode())
+                content.update(values.tobytes())
+        path = os.path.join(bundles, prefix + content.hexdigest()[:12])
+        self._prune_bundles(bundles, prefix, keep=path)
+        if os.path.exists(path):
+            return open_bars(path)
+        return write_bars(path, compact)
+
+    @staticmethod
+    def _prune_bundles(bundles, prefix, keep):
+        """같은 종목 목록의 예전 묶음 중 BUNDLE_KEEP초보다 오래된 것 삭제 (다른 실행이 아직 쓸 수 있어 바로 지우지 않음)"""
+        if not os.path.isdir(bundles):
+            return
+        now = time.time()
+        for name in os.listdir(bundles):
+            old = os.path.join(bundles, name)
+            if name.startswith(prefix) and old != keep and os.path.isdir(old) and now - os.path.getmtime(old) > BUNDLE_KEEP:
+                shutil.rmtree(old, ignore_errors=True)
+
+# 기본 저장소 (yfinance + data/ohlcv)
+default_store = MarketDataStore()
+
+def load_ohlcv(ticker, period="1y", interval="1d"):
+    """기본 저장소에서 단일 종목 OHLCV 조회"""
+    return default_store.load(ticker, period, interval)
+
+def load_ohlcv_many(tickers, period="1y", interval="1d"):
+    """기본 저장소에서 여러 종목 OHLCV 조회"""
+    return default_store.load_many(tickers, period, interval)
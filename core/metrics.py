@@ -0,0 +1,224 @@
+"""
+단계별 소요 시간·호출 수 계측 (프로세스 내 메모리)
+
+    from core.metrics import metrics
+
+    with metrics.timer("backtest.signals"):      # 구간 시간 → 히스토그램
+        ...
+    @metrics.timed("kis.order")                  # 함수 전체 시간
+    def buy_order(...): ...
+    metrics.count("live.signals")                # 카운터
+
+- 히스토그램은 고정 버킷(0.1ms ~ 60s) + 횟수/합계/최소/최대만 보관 → 메모리 일정
+- DIPSNIPER_METRICS=0이면 꺼짐: timer()는 공용 nullcontext를, count()는 즉시 반환 (호출당 수십 ns)
+- 워커 프로세스 결과는 snapshot()으로 보내 부모에서 merge()
+- 별도 프로세스(대시보드가 띄운 봇)는 export_periodically()로 snapshot을 파일에 주기적으로 쓰고,
+  대시보드 /metrics가 load_snapshot()으로 읽어 자기 계측과 합쳐 내보낸다
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+# 버킷 상한 (초). 마지막은 그 이상 전부
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+BOT_METRICS_PATH = "logs/bot_metrics.json"  # 대시보드가 띄운 봇의 snapshot 파일
+EXPORT_INTERVAL = 15  # 초
+
+_NULL = contextlib.nullcontext()
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class Metrics:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.time()
+        self._counters = {}
+        self._hist = {}  # 이름 → [버킷별 횟수, 횟수, 합계, 최소, 최대]
+        self._lock = threading.Lock()
+
+    def enable(self, on=True):
+        self.enabled = on
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            h = self._hist.get(name)
+            if h is None:
+                h = self._hist[name] = [[0] * len(BUCKETS), 0, 0.0, math.inf, 0.0]
+            h[0][bisect.bisect_left(BUCKETS, seconds)] += 1
+            h[1] += 1
+            h[2] += seconds
+            h[3] = min(h[3], seconds)
+            h[4] = max(h[4], seconds)
+
+    def timer(self, name):
+        """with 블록 소요 시간을 name 히스토그램에 기록"""
+        return _Timer(self, name) if self.enabled else _NULL
+
+    def timed(self, name):
+        """함수 데코레이터 버전의 timer (꺼져 있으면 원래 함수만 호출)"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._hist.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """원시 상태 (다른 프로세스로 보내 merge 가능)"""
+        with self._lock:
+            return {'counters': dict(self._counters),
+                    'histograms': {k: [list(h[0]), h[1], h[2], h[3], h[4]] for k, h in self._hist.items()}}
+
+    def merge(self, snapshot):
+        """워커 프로세스의 snapshot()을 합침"""
+        if not self.enabled or not snapshot:
+            return
+        with self._lock:
+            for name, n in snapshot['counters'].items():
+                self._counters[name] = self._counters.get(name, 0) + n
+            for name, (buckets, n, total, lo, hi) in snapshot['histograms'].items():
+                h = self._hist.get(name)
+                if h is None:
+                    self._hist[name] = [list(buckets), n, total, lo, hi]
+                    continue
+                h[0] = [a + b for a, b in zip(h[0], buckets)]
+                h[1] += n
+                h[2] += total
+                h[3] = min(h[3], lo)
+                h[4] = max(h[4], hi)
+
+    def export(self, path):
+        """snapshot()을 JSON 파일로 (임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓴 파일을 보지 않음)"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        snap = self.snapshot()
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(snap, f)  # 관측 없는 히스토그램의 inf도 그대로 (json이 Infinity로 왕복)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def export_periodically(self, path, interval=EXPORT_INTERVAL):
+        """interval초마다 export(path)하는 데몬 스레드 시작 (실패해도 계측 대상 작업은 계속)"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.export(path)
+                except Exception as e:
+                    print(f"⚠️ Metrics export failed: {e}")
+
+        t = threading.Thread(target=run, daemon=True)
+        t.start()
+        return t
+
+    @staticmethod
+    def _quantile(buckets, n, q, hi):
+        """버킷 상한 기준 분위수 (최댓값을 넘지 않게)"""
+        rank = q * n
+        seen = 0
+        for bound, c in zip(BUCKETS, buckets):
+            seen += c
+            if seen >= rank:
+                return min(bound, hi)
+        return hi
+
+    def stats(self):
+        """요약 dict: counters + 히스토그램별 count/sum/mean/min/max/p50/p95/p99 (초)"""
+        snap = self.snapshot()
+        hist = {}
+        for name, (buckets, n, total, lo, hi) in sorted(snap['histograms'].items()):
+            hist[name] = {'count': n, 'sum': total, 'mean': total / n if n else 0.0,
+                          'min': lo if n else 0.0, 'max': hi,
+                          'p50': self._quantile(buckets, n, 0.50, hi),
+                          'p95': self._quantile(buckets, n, 0.95, hi),
+                          'p99': self._quantile(buckets, n, 0.99, hi)}
+        return {'enabled': self.enabled, 'uptime': time.time() - self.started,
+                'counters': dict(sorted(snap['counters'].items())), 'histograms': hist}
+
+    def summary(self, title="Metrics"):
+        """터미널 출력용 요약 표"""
+        stats = self.stats()
+        if not stats['counters'] and not stats['histograms']:
+            return f"📈 {title}: (no data)" if self.enabled else f"📈 {title}: disabled"
+        lines = [f"📈 {title}"]
+        for name, h in stats['histograms'].items():
+            lines.append(f"  {name:<24} n={h['count']:<6} total {h['sum']:8.3f}s | mean {h['mean'] * 1000:9.2f}ms "
+                         f"p50 {h['p50'] * 1000:9.2f}ms p95 {h['p95'] * 1000:9.2f}ms max {h['max'] * 1000:9.2f}ms")
+        for name, n in stats['counters'].items():
+            lines.append(f"  {name:<24} {n}")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix="dipsniper"):
+        """Prometheus 텍스트 형식 (/metrics)"""
+        snap = self.snapshot()
+        out = []
+        for name, n in sorted(snap['counters'].items()):
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            out += [f"# TYPE {metric} counter", f"{metric} {n}"]
+        for name, (buckets, n, total, _, _) in sorted(snap['histograms'].items()):
+            metric = f"{prefix}_{name.replace('.', '_')}_seconds"
+            out.append(f"# TYPE {metric} histogram")
+            seen = 0
+            for bound, c in zip(BUCKETS, buckets):
+                seen += c
+                out.append(f'{metric}_bucket{{le="{"+Inf" if math.isinf(bound) else bound}"}} {seen}')
+            out += [f"{metric}_sum {total}", f"{metric}_count {n}"]
+        return "\n".join(out) + "\n"
+
+def load_snapshot(path):
+    """export()한 snapshot 파일 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# 프로세스 공용 계측기
+metrics = Metrics(enabled=os.getenv("DIPSNIPER_METRICS", "1") != "0")
@@ -0,0 +1,269 @@
+"""
+로컬 KIS 모의 서버 (오프라인 개발·테스트용)
+
+    python -m core.mock_kis --port 8765 --tps 5
+    URL_BASE=http://127.0.0.1:8765 python main.py
+
+    python -m core.mock_kis --ticks data/ticks/mock.txt   # 가짜 당일 체결 파일 생성
+    URL_BASE=http://127.0.0.1:8765 python main.py --replay data/ticks/mock.txt
+
+토큰 발급·검증, 웹소켓 접속키, 현재가, 일봉 조회 TR을 흉내 낸다. 종목별 시세는 종목코드로 시드를
+고정한 랜덤워크라 항상 같은 값이 나온다. 초당 요청이 tps를 넘으면 실제 KIS처럼
+EGW00201 오류를 돌려주므로 KISApi의 속도 제한을 검증할 수 있다.
+
+모의 계좌도 있다: 현금 주문(시장가, 즉시 전량 체결), 잔고 조회, 당일 주문 체결 조회.
+체결가는 set_price()로 정한 값(없으면 최근 일봉 종가). lose_responses=n이면 다음 n건의 주문을
+처리한 뒤 응답만 502로 돌려준다 (응답 유실 → 주문 중복 방지 검증용).
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+def _daily_bars(code, n=30):
+    """종목코드 기반 고정 시드 일봉 (최신 봉이 먼저, KIS 응답 순서와 동일)"""
+    rng = np.random.default_rng(zlib.crc32(code.encode()))
+    close = 50000 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.01, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.005, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.005, n)))
+    volume = rng.integers(100000, 3000000, n)
+
+    bars, day = [], date.today()
+    for i in range(n - 1, -1, -1):
+        while day.weekday() >= 5:
+            day -= timedelta(days=1)
+        bars.append({
+            "stck_bsop_date": day.strftime("%Y%m%d"),
+            "stck_oprc": str(int(open_[i])),
+            "stck_hgpr": str(int(high[i])),
+            "stck_lwpr": str(int(low[i])),
+            "stck_clpr": str(int(close[i])),
+            "acml_vol": str(int(volume[i])),
+        })
+        day -= timedelta(days=1)
+    return bars
+
+def write_ticks(path, codes, n=300, start="09:00:00"):
+    """당일 H0STCNT0 체결 프레임 파일 생성 (ReplayStream 형식, 종목마다 n건)
+
+    시가·가격은 _daily_bars의 전일 종가에서 이어지는 랜덤워크라 일봉 조회 결과와 맞물린다.
+    """
+    open_at = datetime.combine(date.today(), datetime.strptime(start, "%H:%M:%S").time()).timestamp()
+    lines = []
+    for code in codes:
+        rng = np.random.default_rng(zlib.crc32(code.encode()) + 1)
+        prev_close = float(_daily_bars(code)[1]["stck_clpr"])
+        prices = np.round(prev_close * np.exp(np.cumsum(rng.normal(-0.0003, 0.002, n))))
+        volumes = rng.integers(1, 500, n)
+        high = low = prices[0]
+        acml = 0
+        for i, (price, vol) in enumerate(zip(prices, volumes)):
+            high, low, acml = max(high, price), min(low, price), acml + int(vol)
+            stamp = open_at + i * 60 * 390 / n  # 장 시간(6.5시간)에 고르게 분포
+            fields = ["0"] * 46
+            fields[0], fields[1], fields[2] = code, time.strftime("%H%M%S", time.localtime(stamp)), str(int(price))
+            fields[7], fields[8], fields[9] = str(int(prices[0])), str(int(high)), str(int(low))
+            fields[12], fields[13] = str(int(vol)), str(acml)
+            lines.append((stamp, f"0|H0STCNT0|001|{'^'.join(fields)}"))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for stamp, raw in sorted(lines, key=lambda x: x[0]):
+            f.write(f"{stamp:.3f}\t{raw}\n")
+    return len(lines)
+
+class MockKIS:
+    """모의 서버 상태 (요청 수, 발급 토큰 수, 초당 한도)"""
+    def __init__(self, tps=None, latency=0.0):
+        self.tps = tps
+        self.latency = latency
+        self.requests = 0
+        self.tokens_issued = 0
+        self.valid_tokens = set()
+        self.rejected = 0
+        self._window = []
+        self._lock = threading.Lock()
+        # 모의 계좌
+        self.cash = 100000000
+        self.holdings = {}  # code → [수량, 평균 매입가]
+        self.orders = []    # 당일 주문 (접수 순)
+        self.prices = {}    # code → 현재가 (체결가)
+        self.lose_responses = 0
+
+    def set_price(self, code, price):
+        with self._lock:
+            self.prices[code] = price
+
+    def set_holding(self, code, qty, avg_price):
+        with self._lock:
+            self.holdings[code] = [qty, avg_price]
+
+    def _price(self, code):
+        return self.prices.get(code) or float(_daily_bars(code)[0]["stck_clpr"])
+
+    def _order(self, tr_id, body):
+        """현금 주문 (시장가 즉시 체결) → (status, payload)"""
+        code, qty = body.get("PDNO", ""), int(body.get("ORD_QTY", 0))
+        side = "buy" if tr_id.endswith("0802U") else "sell"
+        with self._lock:
+            price = self._price(code)
+            held = self.holdings.get(code, [0, 0.0])
+            if qty <= 0:
+                return 200, {"rt_cd": "1", "msg_cd": "APBK0915", "msg1": "주문수량을 확인하세요."}
+            if side == "buy" and qty * price > self.cash:
+                return 200, {"rt_cd": "1", "msg_cd": "APBK0952", "msg1": "주문가능금액을 초과 했습니다."}
+            if side == "sell" and qty > held[0]:
+                return 200, {"rt_cd": "1", "msg_cd": "APBK0400", "msg1": "주문 가능한 수량을 초과했습니다."}
+
+            if side == "buy":
+                self.cash -= qty * price
+                held = [held[0] + qty, (held[0] * held[1] + qty * price) / (held[0] + qty)]
+            else:
+                self.cash += qty * price
+                held = [held[0] - qty, held[1]]
+            if held[0]:
+                self.holdings[code] = held
+            else:
+                self.holdings.pop(code, None)
+
+            odno = f"{len(self.orders) + 1:010d}"
+            ord_tmd = datetime.now().strftime("%H%M%S")
+            self.orders.append({"odno": odno, "pdno": code, "sll_buy_dvsn_cd": "02" if side == "buy" else "01",
+                                "ord_qty": str(qty), "tot_ccld_qty": str(qty), "avg_prvs": str(price), "ord_tmd": ord_tmd})
+            if self.lose_responses > 0:
+                self.lose_responses -= 1
+                return 502, None
+        return 200, {"rt_cd": "0", "msg_cd": "APBK0013", "msg1": "주문 전송 완료 되었습니다.",
+                     "output": {"KRX_FWDG_ORD_ORGNO": "00950", "ODNO": odno, "ORD_TMD": ord_tmd}}
+
+    def _balance(self):
+        with self._lock:
+            output1 = [{"pdno": code, "hldg_qty": str(qty), "pchs_avg_pric": f"{avg:.4f}",
+                        "prpr": str(int(self._price(code)))} for code, (qty, avg) in self.holdings.items()]
+            total = self.cash + sum(qty * self._price(code) for code, (qty, _) in self.holdings.items())
+            return 200, {"rt_cd": "0", "output1": output1,
+                         "output2": [{"dnca_tot_amt": str(int(self.cash)), "tot_evlu_amt": str(int(total))}]}
+
+    def admit(self):
+        """초당 한도 확인 (True면 처리, False면 EGW00201)"""
+        with self._lock:
+            self.requests += 1
+            if not self.tps:
+                return True
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.tps:
+                self.rejected += 1
+                return False
+            self._window.append(now)
+            return True
+
+    def expire_tokens(self):
+        """발급한 토큰을 모두 만료 처리 (토큰 재발급 경로 확인용)"""
+        with self._lock:
+            self.valid_tokens.clear()
+
+    def handle(self, method, path, query, body, headers=None):
+        """(status, payload) 반환"""
+        if path.endswith("/oauth2/tokenP"):
+            with self._lock:
+                self.tokens_issued += 1
+                token = f"mock-token-{self.tokens_issued}"
+                self.valid_tokens.add(token)
+            return 200, {"access_token": token, "token_type": "Bearer", "expires_in": 86400}
+        if path.endswith("/oauth2/Approval"):
+            return 200, {"approval_key": "mock-approval-key"}
+
+        auth = (headers or {}).get("authorization", "")
+        if auth.removeprefix("Bearer ") not in self.valid_tokens:
+            return 500, {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "기간이 만료된 token 입니다."}
+
+        if not self.admit():
+            return 500, {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+        if self.latency:
+            time.sleep(self.latency)
+
+        if path.endswith("/trading/order-cash"):
+            return self._order((headers or {}).get("tr_id", ""), body)
+        if path.endswith("/trading/inquire-balance"):
+            return self._balance()
+        if path.endswith("/trading/inquire-daily-ccld"):
+            with self._lock:
+                return 200, {"rt_cd": "0", "output1": [dict(o) for o in self.orders]}
+
+        code = query.get("fid_input_iscd", [""])[0]
+        if path.endswith("/quotations/inquire-price"):
+            last = _daily_bars(code)[0]
+            return 200, {"rt_cd": "0", "output": {"stck_prpr": last["stck_clpr"], "acml_vol": last["acml_vol"],
+                                                  "rprs_mrkt_kor_name": "KOSPI200"}}
+        if path.endswith("/quotations/inquire-daily-price"):
+            return 200, {"rt_cd": "0", "output": _daily_bars(code)}
+        return 404, {"rt_cd": "1", "msg1": f"unknown path {path}"}
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _dispatch(self, method):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            status, payload = state.handle(method, url.path, parse_qs(url.query), body,
+                                           {k.lower(): v for k, v in self.headers.items()})
+            if payload is None:
+                data, content_type = b"Bad Gateway", "text/plain"  # 처리는 됐지만 응답 유실
+            else:
+                data, content_type = json.dumps(payload, ensure_ascii=False).encode(), "application/json; charset=utf-8"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def serve(port=0, tps=None, latency=0.0):
+    """백그라운드 스레드로 서버 시작 → (server, state, url_base)"""
+    state = MockKIS(tps, latency)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock KIS OpenAPI server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tps", type=int, default=5, help="초당 허용 요청 수 (0 = 무제한)")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연 (초)")
+    parser.add_argument("--ticks", metavar="PATH", help="서버 대신 가짜 당일 체결 파일만 생성")
+    parser.add_argument("--codes", nargs="+", default=["005930", "000660", "035420"])
+    args = parser.parse_args()
+
+    if args.ticks:
+        count = write_ticks(args.ticks, args.codes)
+        print(f"🧪 {count} ticks written to {args.ticks}")
+        raise SystemExit
+
+    server, state, url = serve(args.port, args.tps, args.latency)
+    print(f"🧪 Mock KIS running at {url} (tps={args.tps})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,211 @@
+"""
+주문·포지션 관리 (KIS 잔고와 동기화, 익절/손절 청산, 동시 주문)
+
+    orders = OrderManager(api, config)   # config: take_profit, stop_loss, order_amount
+    orders.sync()                        # KIS 잔고 → 메모리 포지션
+    orders.buy("005930", 71000)          # 매수 신호 → 주문 (Future 반환, 스레드 풀에서 전송)
+    orders.on_price("005930", 74600)     # 체결가마다 호출: 익절/손절 조건이면 매도 주문
+    orders.wait()                        # 전송 중인 주문 완료 대기
+
+- 주문은 KISApi와 같은 RateLimiter를 거치므로 시세 조회와 합쳐도 초당 TR 한도를 넘지 않음
+- 종목당 동시에 하나의 주문만 (보유 중/주문 중인 종목엔 매수 안 함, 매도 중복 없음)
+- 응답을 못 받은 주문(연결 끊김·502 등)은 바로 재전송하지 않고 당일 주문 내역에서 먼저 찾음
+  → 이미 접수됐으면 그 주문번호로 처리, 없을 때만 재전송 (중복 주문 방지)
+- 주문 후엔 메모리 포지션을 먼저 반영하고, 다음 maybe_sync()에서 실제 잔고로 보정
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from core.kis_api import RATE_LIMIT_ERROR, TOKEN_EXPIRED_ERROR
+from core.metrics import metrics
+
+ORDER_AMOUNT = float(os.getenv("ORDER_AMOUNT", 1000000))  # 종목당 매수 금액 (원)
+SYNC_INTERVAL = 30  # 잔고 재동기화 최소 간격 (초)
+
+class OrderManager:
+    def __init__(self, api, config=None, max_workers=None, retries=3, confirm_delay=1.0, sync_interval=SYNC_INTERVAL):
+        self.api = api
+        self.config = config or {}
+        self.retries = retries
+        self.confirm_delay = confirm_delay  # 응답 유실 후 주문 내역 조회 전 대기 (초)
+        self.sync_interval = sync_interval
+        self.cash = 0.0
+        self.positions = {}     # code → {'qty', 'avg_price'}
+        self.pending = {}       # code → Future (전송 중인 주문)
+        self.history = []       # 끝난 주문 결과 (접수 순 아님, 완료 순)
+        self.known_odnos = set()  # 이미 결과를 아는 주문번호 (재전송 판단용)
+        self.synced_at = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or api.max_workers)
+
+    # ---------------- 잔고 동기화 ----------------
+    def sync(self):
+        """KIS 잔고 → 메모리 포지션 (주문 중인 종목은 주문 결과가 반영될 때까지 그대로 둠)"""
+        balance = self.api.get_balance()
+        if self.synced_at is None:
+            # 시작 전에 이미 있던 당일 주문은 우리 주문으로 착각하지 않도록 기록
+            self.known_odnos.update(o['odno'] for o in self.api.get_today_orders())
+        with self._lock:
+            self.cash = balance['cash']
+            positions = {code: {'qty': p['qty'], 'avg_price': p['avg_price']}
+                         for code, p in balance['positions'].items()}
+            for code in self.pending:
+                if code in self.positions:
+                    positions[code] = self.positions[code]
+                else:
+                    positions.pop(code, None)
+            self.positions = positions
+            self.synced_at = time.time()
+            self._stale = False
+        metrics.count("orders.syncs")
+        return self.positions
+
+    def maybe_sync(self):
+        """주문이 끝났거나 sync_interval이 지났으면 재동기화 (실패해도 매매 루프는 계속)"""
+        if not self._stale and self.synced_at is not None and time.time() - self.synced_at < self.sync_interval:
+            return False
+        try:
+            self.sync()
+            return True
+        except Exception as e:
+            print(f"❌ Balance sync failed: {e}")
+            return False
+
+    # ---------------- 매매 판단 ----------------
+    def on_price(self, code, price):
+        """보유 종목 가격 갱신 → 익절/손절 조건이면 전량 매도 주문 (Future), 아니면 None
+
+        조건은 백테스트와 같음: 수익률 > take_profit 또는 < -stop_loss
+        """
+        with self._lock:
+            position = self.positions.get(code)
+            if position is None or code in self.pending or not position['avg_price']:
+                return None
+            pct = (price - position['avg_price']) / position['avg_price']
+            if pct > self.config.get('take_profit', 0.05):
+                reason = 'take_profit'
+            elif pct < -self.config.get('stop_loss', 0.03):
+                reason = 'stop_loss'
+            else:
+                return None
+            return self._submit(code, 'sell', position['qty'], price, f"{reason} {pct * 100:+.2f}%")
+
+    def buy(self, code, price, reason='signal'):
+        """매수 신호 → 주문 금액만큼 시장가 매수 (Future). 보유 중·주문 중·수량 0이면 None"""
+        amount = self.config.get('order_amount', ORDER_AMOUNT)
+        qty = int(amount // price) if price else 0
+        with self._lock:
+            if qty <= 0 or code in self.positions or code in self.pending:
+                return None
+            return self._submit(code, 'buy', qty, price, reason)
+
+    def _submit(self, code, side, qty, price, reason):
+        """주문을 스레드 풀에 넣음 (self._lock 안에서 호출)"""
+        future = self.pool.submit(self._execute, code, side, qty, price, reason)
+        self.pending[code] = future
+        metrics.count(f"orders.{side}")
+        print(f"📤 [{code}] {side.upper()} {qty}주 @ {price:,.0f} ({reason})")
+        return future
+
+    def wait(self, timeout=None):
+        """전송 중인 주문이 모두 끝날 때까지 대기 → 끝난 주문 결과 리스트"""
+        with self._lock:
+            futures = list(self.pending.values())
+        return [f.result(timeout) for f in futures]
+
+    def close(self):
+        self.wait()
+        self.pool.shutdown()
+
+    # ---------------- 주문 전송 (워커 스레드) ----------------
+    def _execute(self, code, side, qty, price, reason):
+        try:
+            with metrics.timer("orders.execute"):
+                result = self._send(code, side, qty)
+        except Exception as e:
+            result = {'status': 'failed', 'odno': None, 'msg': str(e)}
+        result.update(code=code, side=side, qty=qty, price=price, reason=reason)
+
+        with self._lock:
+            if result['status'] == 'filled':
+                self._apply(code, side, qty, price)
+            self.history.append(result)
+            self.pending.pop(code, None)
+            self._stale = True  # 실제 체결가·수량은 다음 동기화에서 보정
+        metrics.count(f"orders.{result['status']}")
+        icon = {'filled': '✅', 'rejected': '⛔'}.get(result['status'], '❌')
+        print(f"{icon} [{code}] {side.upper()} {qty}주 {result['status']} "
+              f"(주문번호 {result['odno'] or '-'}) {result['msg']}")
+        return result
+
+    def _send(self, code, side, qty):
+        """한 주문을 한 번만 접수시킴 → {'status': filled|rejected|unknown|failed, 'odno', 'msg'}"""
+        order = self.api.buy_order if side == 'buy' else self.api.sell_order
+        msg = ""
+        for attempt in range(self.retries):
+            try:
+                res = order(code, qty)
+            except (requests.RequestException, ValueError) as e:
+                # 접수됐는지 알 수 없음 → 당일 주문 내역에서 먼저 확인
+                metrics.count("orders.ambiguous")
+                msg = f"응답 없음 ({e.__class__.__name__})"
+                time.sleep(self.confirm_delay)
+                try:
+                    found = self._find_order(code, side, qty)
+                except Exception as lookup_error:
+                    # 확인할 수 없으면 재전송하지 않음 (중복 주문보다 누락이 안전, 다음 동기화에서 드러남)
+                    return {'status': 'unknown', 'odno': None, 'msg': f"{msg}, 주문 내역 조회 실패: {lookup_error}"}
+                if found:
+                    metrics.count("orders.recovered")
+                    return {'status': 'filled', 'odno': found, 'msg': "응답 유실 후 주문 내역에서 확인"}
+                continue
+
+            if res.get('rt_cd') == '0':
+                odno = res.get('output', {}).get('ODNO')
+                with self._lock:
+                    self.known_odnos.add(odno)
+                return {'status': 'filled', 'odno': odno, 'msg': res.get('msg1', '')}
+            msg = res.get('msg1', '')
+            if res.get('msg_cd') in (RATE_LIMIT_ERROR, TOKEN_EXPIRED_ERROR):
+                # 접수 전에 거절된 호출 → 그대로 다시 보내도 안전
+                time.sleep(0.2 * (attempt + 1))
+                continue
+            return {'status': 'rejected', 'odno': None, 'msg': f"[{res.get('msg_cd')}] {msg}"}
+        return {'status': 'failed', 'odno': None, 'msg': f"재시도 {self.retries}회 초과: {msg}"}
+
+    def _find_order(self, code, side, qty):
+        """당일 주문 중 아직 모르는 같은 종목·방향·수량 주문번호 (없으면 None)"""
+        for o in self.api.get_today_orders():
+            if o['code'] == code and o['side'] == side and o['qty'] == qty and o['odno'] not in self.known_odnos:
+                with self._lock:
+                    self.known_odnos.add(o['odno'])
+                return o['odno']
+        return None
+
+    def _apply(self, code, side, qty, price):
+        """체결 반영 (시장가라 체결가는 주문 시점 가격으로 추정, self._lock 안에서 호출)"""
+        position = self.positions.get(code)
+        if side == 'buy':
+            held = position['qty'] if position else 0
+            cost = position['avg_price'] * held if position else 0.0
+            self.positions[code] = {'qty': held + qty, 'avg_price': (cost + price * qty) / (held + qty)}
+            self.cash -= price * qty
+        else:
+            if position and position['qty'] > qty:
+                position['qty'] -= qty
+            else:
+                self.positions.pop(code, None)
+            self.cash += price * qty
+
+    def summary(self):
+        counts = {}
+        for r in self.history:
+            counts[r['status']] = counts.get(r['status'], 0) + 1
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(counts.items())) or "no orders"
+        return f"🧾 Orders: {len(self.history)} ({detail}) | {len(self.positions)} positions, cash {self.cash:,.0f}"
@@ -0,0 +1,83 @@
+"""
+다종목 OHLCV 패널
+
+종목별 DataFrame 대신 날짜 축으로 정렬한 2D 배열(shape = (날짜, 종목))에
+필드별로 담는다. 거래가 없는 날(상장 전, 거래정지)은 NaN.
+dtype은 필드별로 손실 없는 쪽을 고른다 (core.bars.price_dtype): 모든 종목의 가격이 float32로 정확히
+왕복하면(원화 정수 가격) float32, 하나라도 소수 가격(달러 등)이면 float64. 거래량도 같은 기준.
+지표는 전략의 array_columns()가 종목별 자기 거래일 기준으로 계산하므로(backtest.on_own_dates)
+NaN 구멍이 있어도 이평·RSI가 단일 종목 백테스트와 같다.
+2,000종목 x 10년도 필드당 약 20MB 수준이라 한 번에 메모리에 올릴 수 있다.
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.bars import PRICES, price_dtype
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+class Panel:
+    def __init__(self, dates, tickers, fields):
+        self.dates = dates          # datetime64[D] 1D 배열 (오름차순)
+        self.tickers = list(tickers)
+        self.fields = fields        # {'close': (T, N) 배열, ...}
+
+    def __getattr__(self, name):
+        fields = self.__dict__.get('fields', {})
+        if name in fields:
+            return fields[name]
+        raise AttributeError(name)
+
+    @property
+    def shape(self):
+        return (len(self.dates), len(self.tickers))
+
+    @property
+    def nbytes(self):
+        return self.dates.nbytes + sum(a.nbytes for a in self.fields.values())
+
+    def column(self, ticker):
+        """한 종목의 필드별 1D 뷰 (복사 없음)"""
+        j = self.tickers.index(ticker)
+        return {name: values[:, j] for name, values in self.fields.items()}
+
+    def to_frame(self, ticker):
+        """한 종목 → 기존 Backtester용 DataFrame (거래 없는 날 제외)"""
+        df = pd.DataFrame({'date': self.dates, **{k: v.astype(float) for k, v in self.column(ticker).items()}})
+        return df.dropna(subset=['close']).reset_index(drop=True)
+
+    @classmethod
+    def from_frames(cls, frames, dtype=None):
+        """{ticker: DataFrame} 또는 (ticker, DataFrame) 이터러블 → Panel
+
+        프레임은 하나씩 압축 배열로 바꾼 뒤 버리므로 전체 DataFrame을 동시에 들고 있지 않는다.
+        dtype을 생략하면 필드별로 손실 없는 dtype (가격 4필드는 같은 dtype), 주면 모든 필드를 그 dtype으로.
+        """
+        items = frames.items() if isinstance(frames, dict) else frames
+        tickers, compact = [], []
+        for ticker, df in items:
+            if df is None or df.empty:
+                continue
+            dates = pd.to_datetime(df['date']).to_numpy().astype('datetime64[D]')
+            prices = [df[f].to_numpy(dtype=np.float64) for f in PRICES]
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            values = dict(zip(PRICES, (p.astype(dtype or price_dtype(*prices)) for p in prices)))
+            values['volume'] = volume.astype(dtype or price_dtype(volume))
+            tickers.append(ticker)
+            compact.append((dates, values))
+
+        # 한 종목이라도 float64가 필요하면 그 필드 전체를 float64로 (float32 종목은 그대로 정확히 올라감)
+        dtypes = {f: np.result_type(np.float32, *(v[f].dtype for _, v in compact)) for f in FIELDS}
+        all_dates = np.unique(np.concatenate([d for d, _ in compact])) if compact else np.array([], dtype='datetime64[D]')
+        fields = {f: np.full((len(all_dates), len(tickers)), np.nan, dtype=dtype or dtypes[f]) for f in FIELDS}
+        for j, (dates, values) in enumerate(compact):
+            rows = np.searchsorted(all_dates, dates)
+            for f in FIELDS:
+                fields[f][rows, j] = values[f]
+        return cls(all_dates, tickers, fields)
+
+    @classmethod
+    def from_store(cls, store, tickers, period="10y", interval="1d", dtype=None):
+        """OHLCV 저장소에서 종목을 하나씩 읽어 패널 구성"""
+        return cls.from_frames(((t, store.load(t, period, interval)) for t in tickers), dtype)
@@ -0,0 +1,204 @@
+"""
+KIS 실시간 체결 스트리밍 (WebSocket)
+
+    python main.py --stream                          # 실시간 체결가 구독
+    python main.py --replay data/ticks/20261018.txt  # 녹화한 체결 재생 (오프라인)
+
+- KISStream: 웹소켓 접속키 발급 → H0STCNT0(주식 체결) 구독 → Tick 이벤트.
+  record_path를 주면 받은 원문 프레임을 그대로 파일에 남긴다.
+- ReplayStream: 녹화 파일(또는 mock_kis가 만든 가짜 체결 파일)을 같은 파서로 재생.
+- DailyBarBuilder: 과거 일봉 + 오늘 체결을 합쳐 당일 봉을 갱신하고,
+  봉이 바뀔 때마다 해당 종목만 전략을 다시 평가한다.
+
+웹소켓 클라이언트로 websocket-client 패키지가 필요하다 (재생 모드는 불필요).
+"""
+
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+from backtest import AdvancedDipStrategy
+from core.indicators import IndicatorState
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+TR_TRADE = "H0STCNT0"  # 국내주식 실시간 체결가
+MAX_SUBSCRIPTIONS = 41  # 세션당 실시간 등록 한도
+
+# H0STCNT0 응답 필드 위치 (^ 구분)
+_CODE, _TIME, _PRICE, _OPEN, _HIGH, _LOW, _VOLUME, _ACML_VOLUME = 0, 1, 2, 7, 8, 9, 12, 13
+
+_BAR_KEYS = ('stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr', 'acml_vol')
+
+Tick = namedtuple('Tick', 'code date time price open high low volume acml_volume')
+
+def default_ws_url(url_base):
+    """REST URL 기준 웹소켓 주소 (KIS_WS_URL 환경변수가 우선)"""
+    if os.getenv("KIS_WS_URL"):
+        return os.getenv("KIS_WS_URL")
+    port = 31000 if url_base and "openapivts" in url_base else 21000
+    return f"ws://ops.koreainvestment.com:{port}"
+
+def parse_frame(raw, day=None):
+    """실시간 프레임 원문 → Tick 리스트 (제어 메시지/암호화 프레임이면 빈 리스트)
+
+    형식: '0|H0STCNT0|003|005930^093354^71900^...' (한 프레임에 여러 건 포함 가능)
+    """
+    if not raw or raw[0] != "0":
+        return []
+    try:
+        _, tr_id, count, payload = raw.split("|", 3)
+    except ValueError:
+        return []
+    if tr_id != TR_TRADE:
+        return []
+
+    fields = payload.split("^")
+    n = int(count)
+    width = len(fields) // n
+    day = day or date.today()
+    ticks = []
+    for i in range(n):
+        f = fields[i * width:(i + 1) * width]
+        ticks.append(Tick(f[_CODE], day, f[_TIME], float(f[_PRICE]), float(f[_OPEN]), float(f[_HIGH]),
+                          float(f[_LOW]), float(f[_VOLUME]), float(f[_ACML_VOLUME])))
+    return ticks
+
+def subscribe_message(approval_key, code, subscribe=True):
+    return json.dumps({
+        "header": {"approval_key": approval_key, "custtype": "P",
+                   "tr_type": "1" if subscribe else "2", "content-type": "utf-8"},
+        "body": {"input": {"tr_id": TR_TRADE, "tr_key": code}},
+    })
+
+class KISStream:
+    """KIS 실시간 체결 구독 (끊기면 재접속 후 재구독)"""
+    def __init__(self, api, codes, ws_url=None, record_path=None, reconnect_delay=3.0):
+        if websocket is None:
+            raise ImportError("websocket-client is required for streaming (pip install websocket-client)")
+        if len(codes) > MAX_SUBSCRIPTIONS:
+            print(f"⚠️ 실시간 등록은 세션당 {MAX_SUBSCRIPTIONS}종목까지만 가능. 앞의 {MAX_SUBSCRIPTIONS}종목만 구독합니다.")
+        self.api = api
+        self.codes = list(codes)[:MAX_SUBSCRIPTIONS]
+        self.ws_url = ws_url or default_ws_url(api.url_base)
+        self.record_path = record_path
+        self.reconnect_delay = reconnect_delay
+        self.closed = False
+
+    def _connect(self):
+        approval_key = self.api.get_approval_key()
+        ws = websocket.create_connection(self.ws_url, timeout=60)
+        for code in self.codes:
+            ws.send(subscribe_message(approval_key, code))
+        print(f"📡 실시간 구독: {len(self.codes)}종목 ({self.ws_url})")
+        return ws
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self):
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        try:
+            while not self.closed:
+                try:
+                    ws = self._connect()
+                    while not self.closed:
+                        raw = ws.recv()
+                        if raw.startswith("{"):
+                            # 제어 메시지: PINGPONG은 그대로 돌려줘야 연결이 유지됨
+                            if json.loads(raw).get("header", {}).get("tr_id") == "PINGPONG":
+                                ws.pong(raw)
+                            continue
+                        if record:
+                            record.write(f"{time.time():.3f}\t{raw}\n")
+                        yield from parse_frame(raw)
+                    ws.close()
+                except (websocket.WebSocketException, OSError) as e:
+                    print(f"⚠️ 실시간 연결 끊김: {e}. {self.reconnect_delay}초 후 재접속")
+                    time.sleep(self.reconnect_delay)
+        finally:
+            if record:
+                record.close()
+
+class ReplayStream:
+    """녹화 파일 재생 ('epoch<TAB>프레임' 한 줄씩)
+
+    speed=0이면 대기 없이 바로, 1이면 실제 간격대로, 10이면 10배속으로 재생.
+    """
+    def __init__(self, path, speed=0.0):
+        self.path = path
+        self.speed = speed
+
+    def __iter__(self):
+        first = started = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                stamp, _, raw = line.rstrip("\n").partition("\t")
+                stamp = float(stamp)
+                if self.speed:
+                    if first is None:
+                        first, started = stamp, time.monotonic()
+                    wait = (stamp - first) / self.speed - (time.monotonic() - started)
+                    if wait > 0:
+                        time.sleep(wait)
+                yield from parse_frame(raw, datetime.fromtimestamp(stamp).date())
+
+class DailyBarBuilder:
+    """한 종목의 지표 상태 + 체결로 갱신되는 당일 봉
+
+    마감된 봉은 IndicatorState에 한 번씩만 넣고, 진행 중인 봉(today)은 체결·재조회마다
+    덮어쓴 뒤 미리보기로 평가한다. 갱신·평가 모두 봉 수와 무관하게 O(1).
+    """
+    def __init__(self, code, daily_data, strategy, config):
+        self.code = code
+        self.strategy = strategy
+        self.config = config
+        self.state = IndicatorState(config)
+        self.patterns = isinstance(strategy, AdvancedDipStrategy)  # 캔들 패턴은 Advanced만 사용
+        self.last_date = None   # 마지막으로 마감 처리한 봉 날짜
+        self.today_date = None
+        self.today = None       # 진행 중인 봉 (open, high, low, close, volume)
+        self.sync(daily_data)
+
+    def _close_today(self):
+        if self.today is not None:
+            self.state.push(*self.today)
+            self.last_date = self.today_date
+            self.today = None
+
+    def sync(self, daily_data):
+        """KIS 일봉 응답 (최신 봉이 먼저) 반영. 최신 봉은 진행 중인 봉으로, 그 이전은 마감 봉으로 처리"""
+        bars = list(reversed(daily_data or []))
+        for b in bars[:-1]:
+            day = datetime.strptime(b['stck_bsop_date'], "%Y%m%d").date()
+            if self.last_date is None or day > self.last_date:
+                # 마감 값은 체결로 만든 봉 대신 일봉 응답 값을 사용
+                self.state.push(*(float(b[k]) for k in _BAR_KEYS))
+                self.last_date = day
+        if bars:
+            self.today_date = datetime.strptime(bars[-1]['stck_bsop_date'], "%Y%m%d").date()
+            self.today = tuple(float(bars[-1][k]) for k in _BAR_KEYS)
+
+    def update(self, tick):
+        """체결 반영. 당일 봉이 바뀌었으면 True"""
+        if self.today_date is not None and tick.date < self.today_date:
+            return False
+        if tick.date != self.today_date:
+            self._close_today()
+            self.today_date = tick.date
+        bar = (tick.open, tick.high, tick.low, tick.price, tick.acml_volume)
+        if bar == self.today:
+            return False
+        self.today = bar
+        return True
+
+    def evaluate(self):
+        """당일 봉 기준 BUY 여부"""
+        if self.today is None:
+            return False
+        return bool(self.strategy.signals(self.state.columns(*self.today, patterns=self.patterns), self.config))
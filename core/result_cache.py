@@ -0,0 +1,90 @@
+"""
+백테스트 결과 캐시 (대시보드·텔레그램 공용, 프로세스 내 메모리)
+
+키: (종목, 기간, 전략, 초기 자금, 전략 설정, 데이터 마지막 봉 날짜)
+새 봉이 들어오면 마지막 봉 날짜가 바뀌므로 예전 결과는 자연히 쓰이지 않는다.
+장중에 같은 날 봉이 갱신되는 경우는 ttl(기본 1시간, OHLCV 캐시 갱신 주기와 동일)로 만료시킨다.
+크기(maxsize)를 넘으면 가장 오래 안 쓴 항목부터(LRU), ttl초가 지나면 만료.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from backtest import Backtester
+from core.market_data import load_ohlcv
+
+CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))
+
+class ResultCache:
+    """스레드 안전 LRU + TTL 캐시 (hit/miss 카운터 포함)"""
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()  # key → (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'hit_rate': self.hits / lookups if lookups else 0.0}
+
+# 대시보드와 텔레그램 봇이 함께 쓰는 기본 캐시
+backtest_cache = ResultCache()
+
+def backtest_key(ticker, period, strategy, config, initial_cash, last_bar):
+    params = json.dumps({k: v for k, v in config.items() if k not in ('ticker', 'strategy', 'initial_cash')},
+                        sort_keys=True, default=str)
+    return (ticker.upper(), period, strategy, float(initial_cash), params, str(last_bar))
+
+def cached_backtest(ticker, period, strategy, config, initial_cash=10000000, cache=None):
+    """캐시를 거치는 백테스트 → ({'trades', 'final_value', 'initial_cash', 'bars'}, 캐시 적중 여부)
+
+    반환 값은 캐시와 공유되므로 수정하지 말 것.
+    """
+    cache = cache or backtest_cache
+    df = load_ohlcv(ticker, period)
+    last_bar = df['date'].iloc[-1] if len(df) else None
+    key = backtest_key(ticker, period, strategy, config, initial_cash, last_bar)
+
+    result = cache.get(key)
+    if result is not None:
+        return result, True
+
+    if len(df) < 60:
+        result = {'trades': [], 'final_value': initial_cash, 'initial_cash': initial_cash, 'bars': len(df)}  # Not enough data
+    else:
+        trades, final_value = Backtester(df, initial_cash, strategy_name=strategy).run(config)
+        result = {'trades': trades, 'final_value': final_value, 'initial_cash': initial_cash, 'bars': len(df)}
+    cache.put(key, result)
+    return result, False
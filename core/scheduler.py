@@ -0,0 +1,204 @@
+"""
+장중 반복 실행 스케줄러 (KRX 정규장 시간에만 동작)
+
+    clock = SystemClock()                      # 테스트는 SimulatedClock(시작 시각)
+    Scheduler(trader.run_batch, codes, interval=60, batch_size=20,
+              on_cycle=trader.load_config, clock=clock).run()
+
+- 주기(interval초, 봉 단위) 하나를 여러 슬롯으로 나누고, 슬롯마다 종목 묶음 하나만 처리
+  → 한 주기에 전 종목을 한 번씩 돌되 한 번에 몰리지 않음
+- 슬롯 경계는 개장 시각 기준으로 정렬 (09:00:00, 09:00:15, ...)
+- 작업이 슬롯 길이를 넘기면 overrun으로 기록하고, 지나간 슬롯은 건너뛰고 다음 경계에서 이어서
+- 장외 시간(주말, 휴장일, 09:00 이전, 15:30 이후)에는 다음 개장까지 잠듦
+- 휴장일은 기본 KRX 휴장일 목록(KRX_HOLIDAYS) + config/krx_holidays.txt(있으면, 임시공휴일 등 추가분)
+  목록에 없는 연도는 주말만 쉬는 것으로 보고 한 번 경고
+- 시계는 now()/sleep()만 쓰므로 SimulatedClock으로 하루치를 즉시 돌려볼 수 있음
+"""
+
+import math
+import os
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+
+from core.metrics import metrics
+
+KST = timezone(timedelta(hours=9))  # 서머타임 없음
+SESSION_OPEN = dtime(9, 0)
+SESSION_CLOSE = dtime(15, 30)
+
+# KRX 휴장일 (평일만: 공휴일·대체공휴일·선거일·근로자의 날·연말 휴장일). 매년 KRX 휴장일 공지로 갱신
+KRX_HOLIDAYS = {
+    2025: ("01-01", "01-27", "01-28", "01-29", "01-30", "03-03", "05-01", "05-05", "05-06", "06-03", "06-06",
+           "08-15", "10-03", "10-06", "10-07", "10-08", "10-09", "12-25", "12-31"),
+    2026: ("01-01", "02-16", "02-17", "02-18", "03-02", "05-01", "05-05", "05-25", "06-03", "08-17",
+           "09-24", "09-25", "10-05", "10-09", "12-25", "12-31"),
+    2027: ("01-01", "02-08", "02-09", "03-01", "05-05", "05-13", "08-16", "09-14", "09-15", "09-16",
+           "10-04", "10-11", "12-27", "12-31"),
+}
+HOLIDAYS_PATH = os.getenv("KRX_HOLIDAYS_PATH", "config/krx_holidays.txt")  # 한 줄에 YYYY-MM-DD (# 뒤는 주석)
+
+def load_holidays(path=HOLIDAYS_PATH):
+    """기본 KRX 휴장일 + 파일의 추가 휴장일 → datetime.date 집합"""
+    days = {date.fromisoformat(f"{year}-{md}") for year, mds in KRX_HOLIDAYS.items() for md in mds}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    days.add(date.fromisoformat(line))
+    return days
+
+class SystemClock:
+    def now(self):
+        return datetime.now(KST)
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+class SimulatedClock:
+    """sleep()하면 시간만 앞으로 가는 시계 (테스트·재현용)"""
+    def __init__(self, start):
+        self._now = start if start.tzinfo else start.replace(tzinfo=KST)
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self._now += timedelta(seconds=seconds)
+
+class MarketHours:
+    def __init__(self, open_time=SESSION_OPEN, close_time=SESSION_CLOSE, holidays=None):
+        """holidays: datetime.date 이터러블 (생략하면 load_holidays()의 KRX 휴장일)"""
+        self.open_time = open_time
+        self.close_time = close_time
+        if holidays is None:
+            self.holidays = load_holidays()
+            self.known_years = set(KRX_HOLIDAYS)  # 휴장일 목록이 있는 연도
+        else:
+            self.holidays = set(holidays)
+            self.known_years = None  # 직접 준 목록은 그대로 믿음
+        self._warned = set()
+
+    def is_trading_day(self, day):
+        if self.known_years is not None and day.year not in self.known_years and day.year not in self._warned:
+            self._warned.add(day.year)
+            print(f"⚠️ No KRX holiday calendar for {day.year}: only weekends are skipped "
+                  f"(add KRX_HOLIDAYS or {HOLIDAYS_PATH})")
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day):
+        """(개장, 마감) 시각 (KST)"""
+        return (datetime.combine(day, self.open_time, KST), datetime.combine(day, self.close_time, KST))
+
+    def is_open(self, now):
+        now = now.astimezone(KST)
+        start, end = self.session(now.date())
+        return self.is_trading_day(now.date()) and start <= now < end
+
+    def next_open(self, now):
+        """now 이후(포함) 가장 가까운 개장 시각"""
+        now = now.astimezone(KST)
+        day = now.date()
+        while True:
+            start, _ = self.session(day)
+            if self.is_trading_day(day) and now <= start:
+                return start
+            if self.is_trading_day(day) and self.is_open(now):
+                return now
+            day += timedelta(days=1)
+            now = datetime.combine(day, dtime(0, 0), KST)
+
+class Scheduler:
+    def __init__(self, work, codes, interval=60, batch_size=20, on_cycle=None, clock=None, hours=None):
+        """work(codes): 종목 묶음 처리, on_cycle(): 주기 시작마다 호출 (설정 갱신 등)"""
+        self.work = work
+        self.on_cycle = on_cycle
+        self.clock = clock or SystemClock()
+        self.hours = hours or MarketHours()
+        self.interval = interval
+        n_batches = max(1, math.ceil(len(codes) / batch_size))
+        # 종목을 고르게 나눔 (앞 묶음부터 하나씩 더)
+        size, extra = divmod(len(codes), n_batches)
+        self.batches, start = [], 0
+        for i in range(n_batches):
+            end = start + size + (1 if i < extra else 0)
+            self.batches.append(list(codes[start:end]))
+            start = end
+        self.slot = interval / n_batches  # 슬롯 길이 (초)
+        self.stats = {'cycles': 0, 'slots': 0, 'overruns': 0, 'missed_slots': 0, 'max_work': 0.0}
+        self._next_batch = 0
+        self._last = None  # 마지막으로 처리한 (개장 시각, 슬롯 번호)
+
+    def _next_boundary(self, now):
+        """now 이후(포함) 다음 슬롯 경계 → (개장 시각, 슬롯 번호, 경계 시각)"""
+        start, _ = self.hours.session(now.date())
+        index = math.ceil((now - start).total_seconds() / self.slot - 1e-9)
+        if self._last is not None and self._last[0] == start:
+            index = max(index, self._last[1] + 1)
+        return start, index, start + timedelta(seconds=index * self.slot)
+
+    def step(self):
+        """다음 슬롯까지 기다렸다가 한 묶음 처리. 장외 시간이면 다음 개장까지 잠들고 False"""
+        now = self.clock.now().astimezone(KST)
+        if not self.hours.is_open(now):
+            self._sleep_until(self.hours.next_open(now))
+            return False
+
+        start, index, boundary = self._next_boundary(now)
+        if not self.hours.is_open(boundary):
+            self._sleep_until(self.hours.next_open(boundary))  # 마감 시각에 걸린 경계
+            return False
+        self._sleep_until(boundary)
+
+        if self._last is not None and self._last[0] == start:
+            missed = index - self._last[1] - 1
+            self.stats['missed_slots'] += missed
+        self._last = (start, index)
+
+        if self._next_batch == 0:
+            self.stats['cycles'] += 1
+            if self.on_cycle:
+                self.on_cycle()
+        batch = self.batches[self._next_batch]
+        self._next_batch = (self._next_batch + 1) % len(self.batches)
+
+        began = self.clock.now()
+        self.work(batch)
+        elapsed = (self.clock.now() - began).total_seconds()
+        metrics.observe("scheduler.slot", elapsed)
+        self.stats['slots'] += 1
+        self.stats['max_work'] = max(self.stats['max_work'], elapsed)
+        if elapsed > self.slot:
+            self.stats['overruns'] += 1
+            metrics.count("scheduler.overruns")
+            print(f"⚠️ Slot overrun: {boundary:%H:%M:%S} batch of {len(batch)} took {elapsed:.1f}s "
+                  f"(slot {self.slot:.1f}s, skipping {int(elapsed // self.slot)} slot(s))")
+        return True
+
+    def _sleep_until(self, when):
+        wait = (when - self.clock.now()).total_seconds()
+        if wait > 60:
+            print(f"💤 Waiting until {when:%Y-%m-%d %H:%M:%S} KST")
+        self.clock.sleep(wait)
+
+    def run(self, until=None, max_slots=None):
+        """until(시각) 또는 max_slots(처리 슬롯 수)까지 반복. Ctrl+C로 중단해도 요약 출력"""
+        try:
+            while True:
+                if until is not None and self.clock.now() >= until:
+                    break
+                if max_slots is not None and self.stats['slots'] >= max_slots:
+                    break
+                self.step()
+        except KeyboardInterrupt:
+            print("🛑 Scheduler stopped")
+        print(self.summary())
+        return self.stats
+
+    def summary(self):
+        s = self.stats
+        return (f"🗓️ Scheduler: {s['cycles']} cycles, {s['slots']} slots, {s['overruns']} overruns, "
+                f"{s['missed_slots']} missed slots, max work {s['max_work']:.1f}s "
+                f"(slot {self.slot:.1f}s x {len(self.batches)} batches / {self.interval}s)")
@@ -0,0 +1,146 @@
+"""
+뉴스 감성 점수 로컬 저장소 (SQLite, data/sentiment.db)
+
+real_sentiment_factors.csv(date, symbol, sentiment_score ...)는 날마다 뒤에 줄이 추가되는 파일이다.
+- sync(): 지난번에 읽은 위치(바이트 오프셋) 이후에 추가된 줄만 읽어 (date, symbol) 기준으로 upsert.
+  파일 크기·수정 시각이 그대로면 파일을 열지도 않는다. 파일이 줄었거나 헤더가 바뀌면 처음부터 다시 적재.
+- latest_top 테이블: 최신 날짜 상위 TOP_N개를 미리 계산해 둠 → latest()는 이력 크기와 무관하게 바로 응답.
+  점수가 빈 칸·NaN인 행(SQLite에는 NULL)은 이력에는 남기되 상위 목록에서는 뺀다.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import os
+import sqlite3
+import threading
+
+SENTIMENT_CSV = os.getenv("SENTIMENT_CSV", "/Volumes/SSD/DEV_SSD/MY/neon_alpha/data/real_sentiment_factors.csv")
+SENTIMENT_DB = os.getenv("SENTIMENT_DB", "data/sentiment.db")
+TOP_N = 20  # 미리 계산해 두는 최신일 상위 종목 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentiment (
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    sentiment_score REAL,
+    PRIMARY KEY (date, symbol)
+);
+CREATE INDEX IF NOT EXISTS sentiment_symbol ON sentiment (symbol, date);
+CREATE TABLE IF NOT EXISTS latest_top (
+    rank INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    sentiment_score REAL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    header TEXT,
+    offset INTEGER,
+    size INTEGER,
+    mtime REAL
+);
+"""
+
+class SentimentStore:
+    def __init__(self, db_path=SENTIMENT_DB, top_n=TOP_N):
+        self.db_path = db_path
+        self.top_n = top_n
+        self._lock = threading.Lock()  # 동시에 두 번 sync하지 않도록
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """트랜잭션(성공 시 commit, 예외 시 rollback) 후 연결까지 닫음 (sqlite3 연결의 with는 닫지 않음)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(self, csv_path=SENTIMENT_CSV, rebuild=False):
+        """CSV에 새로 추가된 줄을 반영 → 추가·갱신된 행 수"""
+        source = os.path.abspath(csv_path)
+        st = os.stat(csv_path)
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT header, offset, size, mtime FROM sync_state WHERE source = ?", (source,)).fetchone()
+            if row and not rebuild and row[2] == st.st_size and row[3] == st.st_mtime:
+                return 0  # 변경 없음
+
+            with open(csv_path, "rb") as f:
+                header = f.readline()
+                header_text = header.decode("utf-8-sig").strip()
+                offset = row[1] if row and not rebuild and row[0] == header_text and row[1] <= st.st_size else None
+                full = offset is None
+                if full:
+                    # 처음이거나 파일이 교체됨: 전체 재적재
+                    conn.execute("DELETE FROM sentiment")
+                    offset = f.tell()
+                f.seek(offset)
+                data = f.read()
+
+            # 마지막 줄이 아직 쓰는 중일 수 있으니 완전한 줄까지만 읽고 나머지는 다음 번에
+            end = data.rfind(b"\n") + 1
+            columns = next(csv.reader([header_text]))
+            records = []
+            for values in csv.reader(io.StringIO(data[:end].decode("utf-8"))):
+                if not values:
+                    continue
+                rec = dict(zip(columns, values))
+                score = rec.get('sentiment_score')
+                records.append((rec['date'], rec['symbol'], float(score) if score not in (None, "") else None))
+
+            if records:
+                conn.executemany("INSERT OR REPLACE INTO sentiment (date, symbol, sentiment_score) VALUES (?, ?, ?)", records)
+            # 최신일(또는 그 이후) 행이 들어왔을 때만 상위 목록 갱신
+            latest = conn.execute("SELECT date FROM latest_top LIMIT 1").fetchone()
+            if full or (records and (latest is None or max(r[0] for r in records) >= latest[0])):
+                self._refresh_top(conn)
+            conn.execute("INSERT OR REPLACE INTO sync_state (source, header, offset, size, mtime) VALUES (?, ?, ?, ?, ?)",
+                         (source, header_text, offset + end, st.st_size, st.st_mtime))
+            return len(records)
+
+    def _refresh_top(self, conn):
+        """점수가 있는 최신 날짜 상위 top_n개 다시 계산 (date 인덱스로 최신일 행만 읽음, NULL 점수 제외)"""
+        conn.execute("DELETE FROM latest_top")
+        conn.execute(
+            "INSERT INTO latest_top (rank, date, symbol, sentiment_score) "
+            "SELECT ROW_NUMBER() OVER (ORDER BY sentiment_score DESC), date, symbol, sentiment_score "
+            "FROM sentiment WHERE date = (SELECT MAX(date) FROM sentiment WHERE sentiment_score IS NOT NULL) "
+            "AND sentiment_score IS NOT NULL "
+            "ORDER BY sentiment_score DESC LIMIT ?", (self.top_n,))
+
+    def latest(self, top=5):
+        """최신 날짜 상위 종목 → (날짜, [{'symbol', 'sentiment_score'}, ...]) (데이터가 없으면 (None, []))"""
+        with self._connect() as conn:
+            # 이전 버전이 만든 latest_top에는 NULL 점수가 있을 수 있으므로 읽을 때도 거름
+            rows = conn.execute("SELECT date, symbol, sentiment_score FROM latest_top "
+                                "WHERE sentiment_score IS NOT NULL ORDER BY rank LIMIT ?", (top,)).fetchall()
+        if not rows:
+            return None, []
+        return rows[0][0], [{'symbol': s, 'sentiment_score': score} for _, s, score in rows]
+
+    def history(self, symbol, limit=30):
+        """종목별 최근 점수 [(date, score), ...] (최신순)"""
+        with self._connect() as conn:
+            return conn.execute("SELECT date, sentiment_score FROM sentiment WHERE symbol = ? ORDER BY date DESC LIMIT ?",
+                                (symbol, limit)).fetchall()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감성 점수 CSV → SQLite 동기화")
+    parser.add_argument("--csv", default=SENTIMENT_CSV)
+    parser.add_argument("--db", default=SENTIMENT_DB)
+    parser.add_argument("--rebuild", action="store_true", help="처음부터 다시 적재")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    store = SentimentStore(args.db)
+    print(f"📥 {store.sync(args.csv, rebuild=args.rebuild)} rows synced from {args.csv}")
+    date, top = store.latest(args.top)
+    print(f"📰 Latest ({date}):")
+    for r in top:
+        print(f"  {r['symbol']}: {r['sentiment_score']:.2f}")
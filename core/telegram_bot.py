@@ -2,12 +2,16 @@ import os
 import requests
 import asyncio
 import threading
-import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import yfinance as yf
 from telegram import Update, Bot
 from telegram.ext import Application, CommandHandler, ContextTypes
 from dotenv import load_dotenv
-from backtest import Backtester
+from core.metrics import metrics
+from core.result_cache import backtest_cache, cached_backtest
+from core.sentiment_store import SENTIMENT_CSV, SentimentStore
 
 # Load Env
 env_path = "/Volumes/SSD/DEV_SSD/MY/DipSniper/config/settings.env"
@@ -39,6 +43,89 @@ def send_report(result, final_value, initial_cash):
 """
     send_message(msg)
 
+# --- Blocking Work Offload ---
+# 핸들러는 모두 하나의 asyncio 루프에서 돌기 때문에 블로킹 작업은 스레드 풀로 넘긴다.
+# 무거운 작업(백테스트)과 가벼운 작업(시세·추천 조회)은 풀을 나눠서
+# 백테스트가 밀려 있어도 /price는 바로 응답한다.
+HEAVY_WORKERS = int(os.getenv("TELEGRAM_HEAVY_WORKERS", "2"))
+LIGHT_WORKERS = int(os.getenv("TELEGRAM_LIGHT_WORKERS", "4"))
+PER_CHAT_LIMIT = int(os.getenv("TELEGRAM_PER_CHAT_LIMIT", "2"))  # 채팅당 동시 작업 수
+MAX_QUEUE = int(os.getenv("TELEGRAM_MAX_QUEUE", "20"))           # 풀당 대기 작업 상한
+
+class PoolBusy(Exception):
+    pass
+
+class WorkPool:
+    """크기 제한 스레드 풀 + 채팅별 동시 실행 제한 + 대기열 깊이
+
+    카운터는 이벤트 루프 스레드에서만 바꾸므로 별도 락이 필요 없다.
+    """
+    def __init__(self, name, workers, per_chat=PER_CHAT_LIMIT, max_queue=MAX_QUEUE):
+        self.name = name
+        self.workers = workers
+        self.per_chat = per_chat
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"telegram-{name}")
+        self.pending = 0                   # 실행 중 + 대기 중
+        self.by_chat = defaultdict(int)
+
+    @property
+    def queued(self):
+        """실행을 기다리는 작업 수"""
+        return max(0, self.pending - self.workers)
+
+    def check(self, chat_id):
+        """제출 가능 여부 확인 (불가하면 PoolBusy)"""
+        if self.by_chat[chat_id] >= self.per_chat:
+            raise PoolBusy(f"이 채팅에서 이미 {self.by_chat[chat_id]}개 작업이 진행 중입니다. 끝난 뒤 다시 시도해주세요.")
+        if self.queued >= self.max_queue:
+            raise PoolBusy(f"대기 중인 작업이 너무 많습니다 ({self.queued}건). 잠시 후 다시 시도해주세요.")
+
+    async def run(self, chat_id, fn, *args, **kwargs):
+        """fn(*args)을 풀에서 실행하고 결과를 기다림"""
+        self.check(chat_id)
+        self.pending += 1
+        self.by_chat[chat_id] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.by_chat[chat_id] -= 1
+            if not self.by_chat[chat_id]:
+                del self.by_chat[chat_id]
+
+    def status(self):
+        return f"{self.name}: 실행 {min(self.pending, self.workers)}/{self.workers}, 대기 {self.queued}"
+
+heavy_pool = WorkPool("backtest", HEAVY_WORKERS)
+light_pool = WorkPool("query", LIGHT_WORKERS)
+
+def fetch_price(ticker):
+    """최근 종가 (없으면 None)"""
+    metrics.count("yfinance.calls")
+    with metrics.timer("yfinance.price"):
+        data = yf.Ticker(ticker).history(period="1d")
+    if data.empty:
+        return None
+    return data['Close'].iloc[-1]
+
+sentiment_store = None
+_sentiment_lock = threading.Lock()  # 핸들러가 동시에 돌아도 저장소는 한 번만 생성
+
+def load_recommendations(path, top=5):
+    """뉴스 감성 → (최신 날짜, 점수 상위 top개)
+
+    CSV에 새로 추가된 줄만 SQLite에 반영하고, 미리 계산된 최신일 상위 목록을 읽는다.
+    """
+    global sentiment_store
+    if sentiment_store is None:
+        with _sentiment_lock:
+            if sentiment_store is None:
+                sentiment_store = SentimentStore()
+    sentiment_store.sync(path)
+    return sentiment_store.latest(top)
+
 # --- Interactive Bot Logic (Async) ---
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
@@ -53,7 +140,12 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    await update.message.reply_text("✅ **System Status:**\n- Dashboard: Running\n- Tunnel: Active")
+    cache = backtest_cache.stats()
+    await update.message.reply_text(
+        "✅ **System Status:**\n- Dashboard: Running\n- Tunnel: Active\n"
+        f"- Backtest Cache: {cache['size']}/{cache['maxsize']} (hit {cache['hits']} / miss {cache['misses']})\n"
+        f"- Workers: {heavy_pool.status()} | {light_pool.status()}"
+    )
 
 async def stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("🛑 **Stopping Bot...**\n(Not implemented in this demo)")
@@ -66,39 +158,39 @@ async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     ticker = context.args[0]
     try:
-        data = yf.Ticker(ticker).history(period="1d")
-        if data.empty:
+        price = await light_pool.run(update.effective_chat.id, fetch_price, ticker)
+        if price is None:
             await update.message.reply_text("❌ 종목을 찾을 수 없습니다.")
             return
             
-        price = data['Close'].iloc[-1]
         await update.message.reply_text(f"💰 *{ticker}* 현재가: *{price:,.2f}*")
+    except PoolBusy as e:
+        await update.message.reply_text(f"⏳ {e}")
     except Exception as e:
         await update.message.reply_text(f"❌ 에러: {e}")
 
 async def recommend_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """뉴스 감성 기반 추천 종목"""
-    sentiment_path = "/Volumes/SSD/DEV_SSD/MY/neon_alpha/data/real_sentiment_factors.csv"
+    sentiment_path = os.getenv("SENTIMENT_CSV", SENTIMENT_CSV)  # settings.env 값 우선
     
     if not os.path.exists(sentiment_path):
         await update.message.reply_text("⚠️ 분석된 뉴스 데이터가 없습니다.")
         return
         
     try:
-        df = pd.read_csv(sentiment_path)
-        # Get latest date
-        latest_date = df['date'].max()
-        latest = df[df['date'] == latest_date]
-        
-        # Sort by score
-        top = latest.sort_values('sentiment_score', ascending=False).head(5)
+        latest_date, top = await light_pool.run(update.effective_chat.id, load_recommendations, sentiment_path)
+        if not top:
+            await update.message.reply_text("⚠️ 분석된 뉴스 데이터가 없습니다.")
+            return
         
         msg = f"📰 *오늘의 AI 추천 ({latest_date})*\n------------------\n"
-        for _, row in top.iterrows():
+        for row in top:
             icon = "🔥" if row['sentiment_score'] > 0.2 else "😐"
             msg += f"{icon} *{row['symbol']}*: {row['sentiment_score']:.2f}\n"
             
         await update.message.reply_text(msg, parse_mode="Markdown")
+    except PoolBusy as e:
+        await update.message.reply_text(f"⏳ {e}")
     except Exception as e:
         await update.message.reply_text(f"❌ 데이터 읽기 실패: {e}")
 
@@ -113,26 +205,27 @@ async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if len(args) >= 2: strategy = args[1]
         if len(args) >= 3: period = args[2]
     
-    await update.message.reply_text(f"⏳ **백테스트 시작...**\n- 종목: {ticker}\n- 전략: {strategy}\n- 기간: {period}\n잠시만 기다려주세요!")
+    chat_id = update.effective_chat.id
+    try:
+        heavy_pool.check(chat_id)
+    except PoolBusy as e:
+        await update.message.reply_text(f"⏳ {e}")
+        return
+
+    # 대기열 깊이: 앞에 밀린 백테스트 수
+    waiting = heavy_pool.queued + (1 if heavy_pool.pending >= heavy_pool.workers else 0)
+    queue_note = f"\n- 대기: 앞에 {waiting}건" if waiting else ""
+    await update.message.reply_text(f"⏳ **백테스트 시작...**\n- 종목: {ticker}\n- 전략: {strategy}\n- 기간: {period}{queue_note}\n잠시만 기다려주세요!")
     
     try:
-        # Fetch Data
-        df = yf.download(ticker, period=period, progress=False)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        df.columns = [c.lower() for c in df.columns]
-        df.reset_index(inplace=True)
-        df.rename(columns={'Date': 'date', 'index': 'date'}, inplace=True)
-        
-        if len(df) < 60:
+        # Run Backtest (같은 요청·같은 데이터면 캐시 결과를 바로 사용)
+        config = {'stop_loss': 0.03, 'take_profit': 0.05}
+        result, hit = await heavy_pool.run(chat_id, cached_backtest, ticker, period, strategy, config, initial_cash=10000000)
+
+        if result['bars'] < 60:
             await update.message.reply_text(f"❌ 데이터가 부족합니다. (60일 미만)")
             return
-
-        # Run Backtest
-        config = {'stop_loss': 0.03, 'take_profit': 0.05}
-        
-        bt = Backtester(df, initial_cash=10000000, strategy_name=strategy)
-        log, val = bt.run(config)
+        log, val = result['trades'], result['final_value']
         
         # Format Report
         profit = val - 10000000
@@ -146,9 +239,12 @@ async def backtest_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 {emoji} 수익률: *{profit_pct:.2f}%*
 💰 최종금액: ₩{val:,.0f}
 📜 거래횟수: {len(log)}회
+{'⚡ 캐시된 결과' if hit else ''}
 """
         await update.message.reply_text(msg, parse_mode="Markdown")
         
+    except PoolBusy as e:
+        await update.message.reply_text(f"⏳ {e}")
     except Exception as e:
         await update.message.reply_text(f"❌ 오류 발생: {str(e)}")
 
@@ -158,7 +254,8 @@ def run_telegram_bot():
         print("⚠️ No Telegram Token. Bot listener skipped.")
         return
 
-    application = Application.builder().token(TOKEN).build()
+    # concurrent_updates: 한 채팅의 백테스트를 기다리는 동안에도 다른 명령을 처리
+    application = Application.builder().token(TOKEN).concurrent_updates(True).build()
 
     application.add_handler(CommandHandler("start", start_command))
     application.add_handler(CommandHandler("status", status_command))
@@ -0,0 +1,89 @@
+"""
+KIS 접근 토큰 파일 캐시 (여러 프로세스 공유)
+
+발급받은 토큰과 만료 시각을 config/.kis_token.json 에 저장해 두고
+봇, 대시보드, 워커 프로세스가 함께 쓴다. 만료 margin초 전부터는 미리 갱신하며,
+갱신은 스레드 락 + 파일 락(flock)으로 한 번에 한 곳에서만 일어난다.
+기다리던 쪽은 락을 얻은 뒤 파일을 다시 읽어 먼저 갱신된 토큰을 그대로 쓴다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 락 없이 스레드 락만 사용
+    fcntl = None
+
+TOKEN_CACHE_PATH = os.getenv("KIS_TOKEN_CACHE", "config/.kis_token.json")
+REFRESH_MARGIN = 3600  # 만료 1시간 전부터 갱신
+
+def cache_key(app_key, url_base):
+    """앱키 원문 대신 해시를 키로 사용 (실전/모의 URL별로 분리)"""
+    return hashlib.sha256(f"{app_key}|{url_base}".encode()).hexdigest()[:16]
+
+class TokenCache:
+    def __init__(self, path=TOKEN_CACHE_PATH, margin=REFRESH_MARGIN):
+        self.path = path
+        self.margin = margin
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        # 처음부터 0600으로 생성 (umask 권한으로 토큰이 잠시라도 노출되지 않도록)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.path)
+
+    def _fresh(self, entry):
+        if entry and entry.get("token") and entry.get("expiry", 0) - self.margin > time.time():
+            return entry["token"], entry["expiry"]
+        return None
+
+    def peek(self, key):
+        """갱신 없이 유효한 토큰만 조회 → (token, expiry) 또는 None"""
+        return self._fresh(self._read().get(key))
+
+    def get(self, key, issue, stale=None):
+        """유효한 토큰 반환. 없거나 만료 임박이면 issue()로 한 번만 발급
+
+        issue()는 (token, expiry_epoch)를 반환하고, 실패하면 (None, 0).
+        stale: 서버가 거절한 토큰. 캐시에 아직 그 토큰이 있으면 새로 발급한다.
+        """
+        if stale is None:
+            cached = self.peek(key)
+            if cached:
+                return cached
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".lock", "a") as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    entries = self._read()
+                    cached = self._fresh(entries.get(key))
+                    # 기다리는 동안 다른 곳에서 이미 갱신했으면 그대로 사용
+                    if cached and cached[0] != stale:
+                        return cached
+
+                    token, expiry = issue()
+                    if token:
+                        entries[key] = {"token": token, "expiry": expiry, "issued_at": time.time()}
+                        self._write(entries)
+                    return token, expiry
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
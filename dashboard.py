@@ -1,11 +1,16 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse, StreamingResponse
+import math
 import pandas as pd
 import subprocess
 import signal
 import os
 import json
-from backtest import Backtester
+from core.jobs import JobManager
+from core.logtail import LOG_PATH, follow_async, tail
+from core.metrics import BOT_METRICS_PATH, Metrics, load_snapshot, metrics
+from core.result_cache import backtest_cache, cached_backtest
 # Fix: Import start_bot_thread to enable polling
 from core.telegram_bot import send_report, set_bot_commands, start_bot_thread
 
@@ -18,6 +23,10 @@ async def startup_event():
     # Start the bot listener thread
     start_bot_thread()
 
+@app.on_event("shutdown")
+def shutdown_event():
+    jobs.shutdown()
+
 # Global Config
 config = {
     "initial_cash": 10000000,
@@ -31,6 +40,11 @@ config = {
 last_result = []
 main_process = None
 
+# 백테스트는 백그라운드 작업으로 실행 (요청 스레드/이벤트 루프를 막지 않음)
+# 결과 캐시를 텔레그램 봇과 공유해야 하므로 JobManager 기본값인 같은 프로세스의 스레드 풀 사용
+# (계산 자체는 배열 연산이라 수 ms, 대부분은 데이터 I/O)
+jobs = JobManager()
+
 # Mock Data for Backtest
 data = {
     'date': pd.date_range(start='2024-01-01', periods=100),
@@ -73,6 +87,34 @@ def calculate_stats(trades):
         "profit_factor": profit_factor
     }
 
+def backtest_job(ticker, initial_cash, strategy, config, period="1y"):
+    """작업 풀에서 실행되는 백테스트 (같은 조건·같은 데이터면 캐시 결과 재사용)"""
+    print(f"🔄 Fetching Data ({ticker})...")
+    with metrics.timer("dashboard.backtest_job"):
+        result, hit = cached_backtest(ticker, period, strategy, config, initial_cash)
+    metrics.count("dashboard.cache_hits" if hit else "dashboard.cache_misses")
+    if hit:
+        print(f"⚡ Cached result ({ticker} {strategy})")
+    return {**result, "stats": calculate_stats(result["trades"]), "cached": hit}
+
+def on_backtest_done(job):
+    """작업 완료 → 최근 결과 갱신 + 텔레그램 알림"""
+    global last_result
+    result = job['result']
+    last_result = result['trades']
+    if result['trades']:
+        send_report(result['trades'], result['final_value'], result['initial_cash'])
+
+def _json_safe(value):
+    """JSON 응답용 변환 (inf/NaN 은 null)"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(v) for v in value]
+    return value
+
 html_template = """
 <!DOCTYPE html>
 <html>
@@ -156,6 +198,13 @@ html_template = """
                 <button type="submit">🚀 Run Backtest & Apply</button>
             </div>
         </form>
+        {% if job %}
+        <div id="job-status" data-job="{{ job.id }}" data-status="{{ job.status }}" style="margin-top: 10px; color: #aaa;">
+            {% if job.status == 'error' %}❌ Backtest failed: {{ job.error }}
+            {% elif job.status == 'done' %}✅ {{ job.label }} done in {{ job.elapsed|round(1) }}s
+            {% else %}⏳ {{ job.label }} {{ job.status }}...{% endif %}
+        </div>
+        {% endif %}
     </div>
 
     <!-- Stats -->
@@ -212,15 +261,37 @@ html_template = """
     </div>
 
     <script>
-        setInterval(async () => {
-            const res = await fetch('/logs');
-            const text = await res.text();
-            const viewer = document.getElementById('log-viewer');
-            if (text && text !== viewer.innerText) {
-                viewer.innerText = text;
-                viewer.scrollTop = viewer.scrollHeight;
-            }
-        }, 2000);
+        // 백테스트 작업이 끝나면 결과 페이지로 새로고침
+        const jobBox = document.getElementById('job-status');
+        if (jobBox && ['queued', 'running'].includes(jobBox.dataset.status)) {
+            const poll = setInterval(async () => {
+                const res = await fetch('/jobs/' + jobBox.dataset.job);
+                const job = await res.json();
+                if (job.status === 'done' || job.status === 'error') {
+                    clearInterval(poll);
+                    location.reload();
+                } else {
+                    jobBox.innerText = '⏳ ' + job.label + ' ' + job.status + '... (' + job.elapsed.toFixed(1) + 's)';
+                }
+            }, 1000);
+        }
+
+        // 로그: 처음에 마지막 20줄을 받고, 이후에는 SSE로 새 줄만 받음
+        const viewer = document.getElementById('log-viewer');
+        let logLines = [];
+        const showLogs = () => {
+            viewer.innerText = logLines.length ? logLines.join('\n') : 'Waiting for logs...';
+            viewer.scrollTop = viewer.scrollHeight;
+        };
+        fetch('/logs').then(res => res.text()).then(text => {
+            if (text) { logLines = text.split('\n'); showLogs(); }
+            const source = new EventSource('/logs/stream');
+            source.onmessage = (e) => {
+                logLines.push(e.data);
+                if (logLines.length > 200) logLines = logLines.slice(-200);
+                showLogs();
+            };
+        });
     </script>
 </body>
 </html>
@@ -232,11 +303,15 @@ except ImportError:
     print("Please install jinja2: pip install jinja2")
 
 @app.get("/", response_class=HTMLResponse)
-def home():
+def home(job: str = None):
     t = Template(html_template)
     is_running = main_process is not None and main_process.poll() is None
-    stats = calculate_stats(last_result)
-    return t.render(config=config, result=last_result, stats=stats, is_running=is_running)
+    job_info = jobs.get(job) if job else None
+    result = last_result
+    if job_info and job_info['status'] == 'done':
+        result = job_info['result']['trades']
+    stats = calculate_stats(result)
+    return t.render(config=config, result=result, stats=stats, is_running=is_running, job=job_info)
 
 @app.post("/run_backtest", response_class=HTMLResponse)
 async def run_backtest(
@@ -246,7 +321,7 @@ async def run_backtest(
     strategy: str = Form(...),
     ticker: str = Form("005930.KS")
 ):
-    global config, last_result
+    global config
     
     config.update({
         "initial_cash": initial_cash,
@@ -261,46 +336,68 @@ async def run_backtest(
     with open("config/live_strategy.json", "w") as f:
         json.dump(config, f)
     
-    # Run Backtest with Real Data
-    try:
-        import yfinance as yf
-        print(f"🔄 Fetching Data ({ticker})...")
-        df = yf.download(ticker, period="1y", progress=False)
-        
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
-        df.columns = [c.lower() for c in df.columns]
-        df.reset_index(inplace=True)
-        df.rename(columns={'Date': 'date', 'index': 'date'}, inplace=True)
-        
-        if len(df) < 60:
-            last_result = [] # Not enough data
-        else:
-            bt = Backtester(df, initial_cash, strategy_name=strategy) 
-            last_result, final_value = bt.run(config)
-            
-            # Send Telegram Notification
-            send_report(last_result, final_value, initial_cash)
-            
-    except Exception as e:
-        print(f"❌ Backtest Error: {e}")
-        last_result = []
-    
-    stats = calculate_stats(last_result)
-    
-    t = Template(html_template)
-    is_running = main_process is not None and main_process.poll() is None
-    return t.render(config=config, result=last_result, stats=stats, is_running=is_running)
+    # Run Backtest with Real Data (백그라운드 작업, 완료 시 텔레그램 알림)
+    job_id = submit_backtest(ticker, initial_cash, strategy, dict(config))
+    return RedirectResponse(f"/?job={job_id}", status_code=303)
+
+def submit_backtest(ticker, initial_cash, strategy, params):
+    return jobs.submit(backtest_job, ticker, initial_cash, strategy, params,
+                       label=f"{ticker} {strategy}", on_done=on_backtest_done)
+
+@app.post("/jobs/backtest")
+def create_backtest_job(
+    ticker: str = Form(...),
+    strategy: str = Form("basic"),
+    initial_cash: int = Form(10000000),
+    stop_loss: float = Form(0.03),
+    take_profit: float = Form(0.05)
+):
+    """API: 백테스트 작업 등록 → {"job_id": ...} (대시보드 설정은 바꾸지 않음)"""
+    params = {**config, "stop_loss": stop_loss, "take_profit": take_profit, "strategy": strategy, "ticker": ticker}
+    return {"job_id": submit_backtest(ticker, initial_cash, strategy, params)}
+
+@app.get("/cache")
+def cache_stats():
+    """백테스트 결과 캐시 상태 (hit/miss 카운터)"""
+    return backtest_cache.stats()
+
+@app.get("/metrics")
+def get_metrics(format: str = "prometheus"):
+    """단계별 소요 시간 히스토그램·카운터 (Prometheus 텍스트, ?format=json이면 요약 JSON)
+
+    대시보드 자신의 계측 + 봇 프로세스가 주기적으로 저장한 snapshot(BOT_METRICS_PATH, live.*·kis.*·orders.*)
+    """
+    combined = Metrics(enabled=metrics.enabled)
+    combined.started = metrics.started
+    combined.merge(metrics.snapshot())
+    combined.merge(load_snapshot(BOT_METRICS_PATH))
+    if format == "json":
+        return _json_safe(combined.stats())
+    return PlainTextResponse(combined.prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/jobs")
+def list_jobs():
+    return _json_safe(jsonable_encoder(jobs.list()))
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """작업 상태 조회 (완료되면 result에 trades/final_value/stats 포함)"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return _json_safe(jsonable_encoder(job))
 
 @app.post("/start_bot", response_class=HTMLResponse)
 async def start_bot():
     global main_process
     if main_process is None or main_process.poll() is not None:
-        os.makedirs("logs", exist_ok=True)
+        # 봇이 직접 크기 기준 회전 로그(logs/bot.log, .1, .2 ...)에 기록 → 대시보드는 파일만 읽음
+        # (파이프를 쓰지 않으므로 대시보드가 멈추거나 재시작해도 봇 출력이 막히지 않음)
         main_process = subprocess.Popen(
-            ["python3", "-u", "main.py"], 
-            stdout=open("logs/bot.log", "w"), 
-            stderr=subprocess.STDOUT
+            ["python3", "-u", "main.py", "--log", LOG_PATH, "--metrics-file", BOT_METRICS_PATH],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
         )
     return home()
 
@@ -316,14 +413,21 @@ async def stop_bot():
         main_process = None
     return home()
 
-@app.get("/logs")
-def get_logs():
-    log_path = "logs/bot.log"
-    if os.path.exists(log_path):
-        with open(log_path, "r") as f:
-            lines = f.readlines()
-            return "".join(lines[-20:]) # Last 20 lines
-    return "Waiting for logs..."
+@app.get("/logs", response_class=PlainTextResponse)
+def get_logs(lines: int = 20):
+    """마지막 N줄 (파일 끝에서부터 읽으므로 로그 크기와 무관)"""
+    return "\n".join(tail(LOG_PATH, min(lines, 1000)))
+
+@app.get("/logs/stream")
+async def stream_logs(request: Request):
+    """Server-Sent Events: 새로 추가된 로그 줄만 전송"""
+    async def events():
+        async for line in follow_async(LOG_PATH):
+            if await request.is_disconnected():
+                break
+            yield ": keep-alive\n\n" if line is None else f"data: {line}\n\n"
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,67 +1,187 @@
-import pandas as pd
+import argparse
 import json
 import os
 from core.kis_api import KISApi
+from core.logtail import redirect_output
+from core.metrics import EXPORT_INTERVAL, metrics
+from core.orders import OrderManager
+from core.realtime import DailyBarBuilder, KISStream, ReplayStream
+from core.scheduler import Scheduler
 from backtest import AdvancedDipStrategy, BasicDipStrategy
 
+CONFIG_PATH = "config/live_strategy.json"
+
 class LiveTrader:
-    def __init__(self):
-        self.api = KISApi()
+    def __init__(self, api=None, trade=False):
+        self.api = api or KISApi()
+        # trade=True면 실제 주문 (매수 신호 → 매수, 보유 종목 익절/손절 → 매도), 아니면 신호만 출력
+        self.orders = OrderManager(self.api) if trade else None
+        self.bars = {}  # 종목별 지표 상태 (DailyBarBuilder), 실행 간 유지
+        self.bars_config = None
+        self.config_mtime = -1.0  # 마지막으로 읽은 설정 파일 수정 시각 (파일이 없으면 None)
         self.load_config()
         
     def load_config(self):
-        """대시보드에서 설정한 전략 로드"""
-        config_path = "config/live_strategy.json"
-        if os.path.exists(config_path):
+        """대시보드에서 설정한 전략 로드 (파일 수정 시각이 바뀌었을 때만 다시 읽음)"""
+        config_path = CONFIG_PATH
+        mtime = os.path.getmtime(config_path) if os.path.exists(config_path) else None
+        if mtime == self.config_mtime:
+            return
+        self.config_mtime = mtime
+        if mtime is not None:
             with open(config_path, "r") as f:
                 self.config = json.load(f)
             print(f"✅ 전략 로드: {self.config['strategy']} (익절 {self.config['take_profit']*100}%, 손절 {self.config['stop_loss']*100}%)")
         else:
             print("⚠️ 설정 파일 없음. 기본값 사용.")
             self.config = {"strategy": "basic", "take_profit": 0.05, "stop_loss": 0.03}
+        if self.orders:
+            self.orders.config = self.config
 
+        if self.bars and self.config == self.bars_config:
+            return  # 설정이 그대로면 전략·지표 상태 유지
         if self.config['strategy'] == 'advanced':
             self.strategy = AdvancedDipStrategy()
         else:
             self.strategy = BasicDipStrategy()
+        self.bars.clear()  # 전략·지표 기간이 바뀌었으므로 다시 구성
+        self.bars_config = self.config
 
-    def analyze(self, code):
+    def analyze(self, code, daily_data=None):
         """실전 매매 분석 (백테스트 로직 재사용)"""
-        # 1. 데이터 가져오기 (60일치)
-        daily_data = self.api.get_daily_chart(code) # Need update to fetch 60+
+        # 1. 데이터 가져오기 (60일치, 미리 받아둔 데이터가 있으면 재사용)
+        if daily_data is None:
+            daily_data = self.api.get_daily_chart(code) # Need update to fetch 60+
         if not daily_data: return False, "데이터 부족"
 
-        # 2. DataFrame 변환 & 지표 계산
-        df = pd.DataFrame(daily_data).iloc[::-1] # Reverse to chronological
-        df['close'] = df['stck_clpr'].astype(int)
-        df['volume'] = df['acml_vol'].astype(int)
-        
-        # Calculate Indicators exactly like Backtest
-        df['ma20'] = df['close'].rolling(window=20).mean()
-        df['ma60'] = df['close'].rolling(window=60).mean()
-        df['vol_ma5'] = df['volume'].rolling(window=5).mean()
-        
-        # 3. 전략 실행 (오늘 날짜 기준)
-        # We pass the last index to strategy
-        signal = self.strategy.execute(df, self.config, len(df)-1)
-        
-        if signal == 'BUY':
+        with metrics.timer("live.evaluate"):
+            # 2. 증분 지표 갱신 (처음이면 전체 일봉으로 구성, 이후엔 새로 마감된 봉만 반영)
+            bar = self.bars.get(code)
+            if bar is None:
+                bar = self.bars[code] = DailyBarBuilder(code, daily_data, self.strategy, self.config)
+            else:
+                bar.sync(daily_data)
+
+            # 3. 전략 실행 (오늘 날짜 기준)
+            is_buy = bar.evaluate()
+        metrics.count("live.bars")
+        if is_buy:
+            metrics.count("live.signals")
             return True, f"✅ [{self.config['strategy']}] 매수 신호 발생!"
         return False, "조건 미충족"
 
     def run(self, target_codes):
-        self.load_config() # 매번 최신 설정 로드
+        self.load_config() # 설정 파일이 바뀌었으면 다시 로드
         print("🚀 DipSniper 실전 매매 시작...")
-        
+        self.run_batch(target_codes)
+        if self.orders:
+            print(self.orders.summary())
+        print(metrics.summary("DipSniper run metrics"))
+
+    def run_batch(self, target_codes):
+        """종목 묶음 한 번 분석 (스케줄러 슬롯 단위 작업)"""
+        # 전 종목 일봉을 동시 조회 (KIS 초당 TR 한도 내에서)
+        if self.orders:
+            self.orders.maybe_sync()
+        with metrics.timer("live.fetch"):
+            charts = self.api.get_daily_charts(target_codes)
         for code in target_codes:
-            is_buy, msg = self.analyze(code)
+            chart = charts.get(code)
+            if self.orders and chart:
+                self.orders.on_price(code, float(chart[0]['stck_clpr']))  # 당일 봉 종가 = 현재가
+            is_buy, msg = self.analyze(code, chart)
             print(f"[{code}] {msg}")
             
-            if is_buy:
-                # self.api.buy_order(code, 10) 
-                print(f"💰 {code} 매수 주문 전송 완료!")
+            if is_buy and self.orders:
+                self.orders.buy(code, float(chart[0]['stck_clpr']))
+        if self.orders:
+            self.orders.wait()  # 주문은 종목 간 동시 전송, 묶음이 끝나기 전에 결과 확인
+
+    def loop(self, target_codes, interval=60, batch_size=20, clock=None, until=None):
+        """장중 반복 실행: interval초마다 전 종목을 한 바퀴, 슬롯마다 batch_size개씩"""
+        print(f"🔁 DipSniper 장중 반복 실행 ({len(target_codes)}종목, {interval}초 주기)...")
+        scheduler = Scheduler(self.run_batch, target_codes, interval, batch_size,
+                              on_cycle=self.load_config, clock=clock)
+        stats = scheduler.run(until=until)
+        if self.orders:
+            print(self.orders.summary())
+        print(metrics.summary("DipSniper loop metrics"))
+        return stats
+
+    def stream(self, target_codes, source=None):
+        """실시간 감시: 체결이 올 때마다 당일 봉을 갱신하고 그 종목만 재평가
+
+        source: Tick 이터러블 (기본은 KIS 웹소켓, 오프라인은 ReplayStream)
+        """
+        self.load_config()
+        print("📡 DipSniper 실시간 감시 시작...")
+        if self.orders:
+            self.orders.sync()
+
+        with metrics.timer("live.fetch"):
+            charts = self.api.get_daily_charts(target_codes)
+        bars = {}
+        for code in target_codes:
+            bars[code] = self.bars.get(code) or DailyBarBuilder(code, charts.get(code), self.strategy, self.config)
+            bars[code].sync(charts.get(code))
+        self.bars.update(bars)
+        signaled = set()  # (종목, 날짜): 같은 날 같은 종목은 한 번만 알림
+        source = source if source is not None else KISStream(self.api, target_codes)
+
+        for tick in source:
+            metrics.count("live.ticks")
+            if self.orders:
+                self.orders.on_price(tick.code, tick.price)
+            bar = bars.get(tick.code)
+            if bar is None or not bar.update(tick):
+                continue
+            if (tick.code, tick.date) in signaled:
+                continue
+            with metrics.timer("live.evaluate"):
+                is_buy = bar.evaluate()
+            metrics.count("live.bars")
+            if not is_buy:
+                continue
+            signaled.add((tick.code, tick.date))
+            metrics.count("live.signals")
+            print(f"[{tick.code}] {tick.time} {tick.price:,.0f} ✅ [{self.config['strategy']}] 매수 신호 발생!")
+            if self.orders:
+                self.orders.buy(tick.code, tick.price)
+        if self.orders:
+            self.orders.wait()
+            print(self.orders.summary())
+        print(metrics.summary("DipSniper stream metrics"))
+        return signaled
 
 if __name__ == "__main__":
-    bot = LiveTrader()
-    # 삼성전자, SK하이닉스, NAVER
-    bot.run(["005930", "000660", "035420"])
+    parser = argparse.ArgumentParser(description="DipSniper Live Trader")
+    # 기본: 삼성전자, SK하이닉스, NAVER
+    parser.add_argument("codes", nargs="*", default=["005930", "000660", "035420"])
+    parser.add_argument("--stream", action="store_true", help="웹소켓 실시간 체결 감시")
+    parser.add_argument("--record", metavar="PATH", help="실시간 프레임 원문을 파일로 저장 (--stream)")
+    parser.add_argument("--replay", metavar="PATH", help="녹화한 체결 파일 재생 (오프라인)")
+    parser.add_argument("--speed", type=float, default=0.0, help="재생 배속 (0 = 대기 없음)")
+    parser.add_argument("--loop", action="store_true", help="장중(09:00~15:30) 반복 실행")
+    parser.add_argument("--interval", type=int, default=60, help="반복 주기 (초, --loop)")
+    parser.add_argument("--batch-size", type=int, default=20, help="슬롯당 처리 종목 수 (--loop)")
+    parser.add_argument("--trade", action="store_true", help="실제 주문 (매수 신호 매수 + 보유 종목 익절/손절)")
+    parser.add_argument("--log", metavar="PATH", help="출력을 크기 기준 회전 로그 파일로 기록 (예: logs/bot.log)")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help=f"계측 snapshot을 {EXPORT_INTERVAL}초마다 파일로 저장 (대시보드 /metrics가 합쳐 보여줌)")
+    args = parser.parse_args()
+
+    if args.log:
+        redirect_output(args.log)
+    if args.metrics_file:
+        metrics.export_periodically(args.metrics_file)
+    bot = LiveTrader(trade=args.trade)
+    if args.loop:
+        bot.loop(args.codes, args.interval, args.batch_size)
+    elif args.replay:
+        bot.stream(args.codes, ReplayStream(args.replay, args.speed))
+    elif args.stream:
+        bot.stream(args.codes, KISStream(bot.api, args.codes, record_path=args.record))
+    else:
+        bot.run(args.codes)
+    if args.metrics_file:
+        metrics.export(args.metrics_file)
@@ -0,0 +1,238 @@
+"""
+DipSniper Parameter Optimizer
+
+손절/익절, 이평 기간, 거래량 비율, RSI 구간 조합을 그리드 또는 랜덤으로 탐색한다.
+
+    python optimizer.py 005930.KS 000660.KS --strategy advanced --period 5y
+    python optimizer.py AAPL --random 2000 --workers 8 --output aapl.csv
+
+- 종목별 지표(RSI, 캔들 패턴 등)는 작업마다 한 번, 이평선은 기간마다 한 번만 계산해서 모든 조합이 공유
+- 같은 신호 파라미터(이평 기간, 거래량 비율, RSI 구간)의 신호 마스크도 공유하고
+  손절/익절 조합만 시뮬레이션을 반복
+- 종목 단위 작업을 프로세스 풀에서 병렬 실행 (종목 하나 = 작업 하나 = 지표 계산 한 번).
+  종목이 워커보다 적을 때만 종목의 이평 기간 묶음을 워커 수에 맞춰 몇 작업으로 나눔
+- 전략이 쓰지 않는 파라미터는 탐색하지 않음 (basic은 RSI 구간 없음)
+- 순위는 수익률·손익비·낙폭 각각의 순위를 평균한 점수(score) 순
+- --mmap이면 일봉을 .npy 묶음으로 내보내 워커가 메모리 매핑으로 공유 (작업마다 DataFrame 피클 없음)
+"""
+
+import argparse
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import (AdvancedDipStrategy, BasicDipStrategy, INDICATOR_WINDOWS, SELL, WARMUP,
+                      compute_indicators, equity_curve, rolling_mean, simulate)
+from core.bars import Bars
+
+# 탐색 공간 (rsi_band는 (하한, 상한) 쌍)
+PARAM_GRID = {
+    'stop_loss': [0.02, 0.03, 0.05, 0.07],
+    'take_profit': [0.03, 0.05, 0.08, 0.10, 0.15],
+    'ma_period': [10, 20, 30, 40],
+    'vol_ratio': [0.5, 0.6, 0.7, 0.8, 0.9],
+    'rsi_band': [(20, 60), (30, 60), (30, 70), (40, 70)],
+}
+
+SIGNAL_PARAMS = ('ma_period', 'vol_ratio', 'rsi_band')
+# 전략별로 실제 쓰는 탐색 파라미터 (basic은 RSI를 보지 않음)
+STRATEGY_PARAMS = {
+    'basic': ('stop_loss', 'take_profit', 'ma_period', 'vol_ratio'),
+    'advanced': ('stop_loss', 'take_profit', 'ma_period', 'vol_ratio', 'rsi_band'),
+}
+RANK_KEYS = {
+    'return': ('return_pct', False),
+    'profit_factor': ('profit_factor', False),
+    'drawdown': ('max_drawdown', True),
+}
+
+def make_strategy(strategy_name):
+    return AdvancedDipStrategy() if strategy_name == 'advanced' else BasicDipStrategy()
+
+def strategy_grid(strategy_name, grid=PARAM_GRID):
+    """전략이 쓰지 않는 파라미터를 뺀 탐색 공간 (결과가 같은 중복 조합을 만들지 않도록)"""
+    params = STRATEGY_PARAMS.get(strategy_name, tuple(grid))
+    return {k: v for k, v in grid.items() if k in params}
+
+def grid_combos(grid=PARAM_GRID):
+    """전체 그리드 조합 (dict 리스트)"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def random_combos(n, grid=PARAM_GRID, seed=0):
+    """그리드 안에서 중복 없이 n개 무작위 추출"""
+    combos = grid_combos(grid)
+    if n >= len(combos):
+        return combos
+    rng = np.random.default_rng(seed)
+    return [combos[i] for i in sorted(rng.choice(len(combos), size=n, replace=False))]
+
+def to_config(combo):
+    """탐색 조합 → 전략/시뮬레이션 config"""
+    config = {k: v for k, v in combo.items() if k != 'rsi_band'}
+    if 'rsi_band' in combo:
+        config['rsi_low'], config['rsi_high'] = combo['rsi_band']
+    return config
+
+class IndicatorBank:
+    """종목 하나의 지표 배열 캐시
+
+    기본 컬럼(OHLCV, 전일 종가, 캔들 패턴)과 고정 기간 지표는 처음에 한 번,
+    이평선은 기간별로 처음 요청될 때 한 번만 계산한다.
+    df는 DataFrame 또는 Bars (메모리 매핑이면 종가만 float64로 복사하고 나머지 필드는 매핑된 배열을 그대로 읽음).
+    """
+    def __init__(self, df, strategy):
+        if isinstance(df, Bars):
+            fields = df.fields()
+            fields['close'] = np.asarray(fields['close'], dtype=np.float64)
+            self.base = strategy.array_columns(fields)
+        else:
+            self.base = strategy.columns(df)
+            self.base.update(compute_indicators(self.base['close'], self.base['volume']))
+        self._ma = {INDICATOR_WINDOWS['ma_period']: self.base['ma20']}
+
+    def __len__(self):
+        return len(self.base['close'])
+
+    @property
+    def close(self):
+        return self.base['close']
+
+    def columns(self, config):
+        period = config.get('ma_period', INDICATOR_WINDOWS['ma_period'])
+        if period not in self._ma:
+            self._ma[period] = rolling_mean(self.base['close'], period)
+        return {**self.base, 'ma20': self._ma[period]}
+
+def performance(trades, equity, initial_cash):
+    """수익률, 거래 수, 승률, 손익비(PF), 최대 낙폭(%)"""
+    profits = trades['profit'][trades['side'] == SELL]
+    gross_profit = profits[profits > 0].sum()
+    gross_loss = -profits[profits <= 0].sum()
+    if len(profits) == 0:
+        profit_factor = 0.0
+    else:
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+
+    peak = np.maximum.accumulate(equity)
+    return {
+        'return_pct': (equity[-1] - initial_cash) / initial_cash * 100,
+        'trades': len(profits),
+        'win_rate': (profits > 0).mean() * 100 if len(profits) else 0.0,
+        'profit_factor': profit_factor,
+        'max_drawdown': float(((peak - equity) / peak).max() * 100),
+    }
+
+def evaluate(bank, strategy, combos, initial_cash, start=WARMUP, end=None):
+    """조합 리스트 평가 (신호 파라미터가 같은 조합끼리 신호 마스크 공유)"""
+    rows = []
+    signal_cache = {}
+    for combo in combos:
+        config = to_config(combo)
+        key = tuple(combo.get(k) for k in SIGNAL_PARAMS)
+        if key not in signal_cache:
+            signal_cache[key] = strategy.signals(bank.columns(config), config)
+        trades, _, _ = simulate(bank.close, signal_cache[key], config, initial_cash, start, end)
+        equity = equity_curve(bank.close, trades, initial_cash, start, end)
+        rows.append({**config, **performance(trades, equity, initial_cash)})
+    return rows
+
+def _evaluate_task(ticker, df, strategy_name, combos, initial_cash):
+    """워커 프로세스 작업: 한 종목의 조합 묶음 평가"""
+    strategy = make_strategy(strategy_name)
+    rows = evaluate(IndicatorBank(df, strategy), strategy, combos, initial_cash)
+    return [{'ticker': ticker, **row} for row in rows]
+
+def rank_results(results, rank_by=('return', 'profit_factor', 'drawdown')):
+    """결과 정렬: rank_by 지표별 백분위 순위(1이 최고, 낙폭은 작을수록 좋음)의 평균 score가 높은 순
+
+    사전식 정렬은 수익률이 완전히 같을 때만 손익비·낙폭을 보므로 사실상 수익률 정렬이 된다.
+    순위 평균이라 단위가 다른 지표(%, 배수, inf 손익비)도 같은 무게로 반영된다. 동점이면 첫 지표 순.
+    """
+    df = pd.DataFrame(results)
+    if df.empty:
+        return df
+    ranks = [df[RANK_KEYS[k][0]].rank(ascending=not RANK_KEYS[k][1], pct=True) for k in rank_by]
+    df['score'] = sum(ranks) / len(ranks)
+    first, ascending = RANK_KEYS[rank_by[0]]
+    return df.sort_values(['score', first], ascending=[False, ascending], kind='mergesort').reset_index(drop=True)
+
+def optimize(frames, strategy_name='advanced', combos=None, initial_cash=10000000, workers=None):
+    """종목별 DataFrame dict (또는 BarSet) → 조합별 성과 리스트
+
+    작업은 종목 단위 (IndicatorBank 하나로 그 종목의 모든 조합 평가). 종목이 워커보다 적으면
+    이평 기간 묶음을 나눠 종목당 ceil(워커 수 / 종목 수)개 작업까지 만든다 (워커를 놀리지 않도록).
+    BarSet의 Bars는 (경로, 종목)으로만 전달되므로 작업 수만큼 데이터를 복사하지 않는다.
+    """
+    combos = combos if combos is not None else grid_combos(strategy_grid(strategy_name))
+    by_period = {}
+    for combo in combos:
+        by_period.setdefault(combo.get('ma_period'), []).append(combo)
+    groups = list(by_period.values())
+
+    workers = workers or os.cpu_count() or 1
+    eligible = [(ticker, df) for ticker, df in frames.items() if len(df) > WARMUP]
+    parts = min(len(groups), math.ceil(workers / max(len(eligible), 1))) if workers > 1 else 1
+    chunks = [groups[len(groups) * k // parts:len(groups) * (k + 1) // parts] for k in range(max(parts, 1))]
+    tasks = [(ticker, df, strategy_name, [combo for group in chunk for combo in group], initial_cash)
+             for ticker, df in eligible for chunk in chunks if chunk]
+
+    results = []
+    if workers <= 1:
+        for task in tasks:
+            results.extend(_evaluate_task(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(_evaluate_task, *zip(*tasks)):
+                results.extend(rows)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="DipSniper Parameter Optimizer")
+    parser.add_argument("tickers", nargs="+", help="종목 코드 (예: 005930.KS AAPL)")
+    parser.add_argument("--strategy", default="advanced", choices=["basic", "advanced"])
+    parser.add_argument("--period", default="5y", help="데이터 기간 (yfinance 형식)")
+    parser.add_argument("--random", type=int, default=0, help="랜덤 탐색 조합 수 (0이면 전체 그리드)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--rank-by", default="return,profit_factor,drawdown",
+                        help="순위 점수에 넣을 지표 (return, profit_factor, drawdown; 동점이면 첫 지표 순)")
+    parser.add_argument("--output", default="optimize_results.csv", help="결과 CSV 경로")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--mmap", action="store_true", help="일봉을 .npy 묶음으로 내보내 워커가 메모리 매핑으로 공유")
+    args = parser.parse_args()
+
+    from core.market_data import default_store, load_ohlcv_many
+
+    grid = strategy_grid(args.strategy)
+    combos = random_combos(args.random, grid, seed=args.seed) if args.random else grid_combos(grid)
+    print(f"🔄 Loading {len(args.tickers)} tickers ({args.period})...")
+    if args.mmap:
+        frames = default_store.export_bars(args.tickers, args.period)
+        print(f"🗺️ Memory-mapped bars: {frames.path} ({frames.nbytes / 2**20:.1f}MB)")
+    else:
+        frames = load_ohlcv_many(args.tickers, args.period)
+    for ticker in args.tickers:
+        if ticker not in frames or len(frames[ticker]) <= WARMUP:
+            print(f"⚠️ {ticker}: Not enough data")
+
+    print(f"🚀 Evaluating {len(combos)} combos x {len(frames)} tickers ({args.strategy})...")
+    start = time.time()
+    results = optimize(frames, args.strategy, combos, workers=args.workers)
+    elapsed = time.time() - start
+
+    ranked = rank_results(results, tuple(k.strip() for k in args.rank_by.split(",")))
+    ranked.to_csv(args.output, index=False)
+
+    print(f"✅ {len(results)} runs in {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.0f} runs/s)")
+    print(f"💾 Saved: {args.output}")
+    if not ranked.empty:
+        print(ranked.head(args.top).to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+if __name__ == "__main__":
+    main()
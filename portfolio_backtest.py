@@ -0,0 +1,162 @@
+"""
+DipSniper Portfolio Backtest (다종목 공유 현금)
+
+종목별 독립 백테스트의 평균이 아니라, 하나의 현금 풀로 여러 종목을 동시에 운용한다.
+
+    python portfolio_backtest.py --scenario 1 --period 10y --max-positions 5
+    python portfolio_backtest.py 005930.KS 000660.KS 035420.KS --strategy basic
+
+- 날짜 정렬된 Panel(손실 없는 float32/float64 2D 배열)을 날짜 순으로 한 번 훑는다
+- 신호는 기존 전략 클래스(signals)를 패널 전체에 한 번에 적용해서 계산
+  (지표는 종목별 자기 거래일 기준 → 다른 종목만 거래한 날의 NaN 구멍이 지표를 끊지 않음)
+- 보유 종목 수 상한(max_positions), 종목당 비중(position_size, 평가금액 대비) 적용
+- 같은 날 신호가 여러 개면 거래량이 많이 마른(거래량/5일 평균이 낮은) 종목부터 매수
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backtest import AdvancedDipStrategy, BasicDipStrategy, WARMUP, BUY, SELL
+from core.panel import Panel
+
+PORTFOLIO_TRADE_DTYPE = np.dtype([('bar', np.int32), ('ticker', np.int32), ('side', np.int8),
+                                  ('price', np.float64), ('shares', np.float64), ('profit', np.float64)])
+
+class PortfolioBacktester:
+    def __init__(self, panel, initial_cash=10000000, strategy_name='basic', max_positions=5, position_size=None):
+        self.panel = panel
+        self.initial_cash = initial_cash
+        self.max_positions = max_positions
+        # 기본 비중: 평가금액을 최대 보유 종목 수로 균등 분할
+        self.position_size = position_size if position_size is not None else 1.0 / max_positions
+
+        if strategy_name == 'advanced':
+            self.strategy = AdvancedDipStrategy()
+        else:
+            self.strategy = BasicDipStrategy()
+
+    def signals(self, config):
+        """패널 전체 BUY 마스크 (T, N)와 매수 우선순위 점수
+
+        종가는 float64 작업 배열로 바꿔 지표도 float64로 계산 (단일 종목 Backtester와 같은 값 → 같은 신호)
+        """
+        fields = dict(self.panel.fields)
+        fields['close'] = np.asarray(fields['close'], dtype=np.float64)
+        cols = self.strategy.array_columns(fields, config)
+        signals = self.strategy.signals(cols, config)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vol_ratio = cols['volume'] / cols['vol_ma5']
+        return signals, vol_ratio
+
+    def run(self, config):
+        """Returns: (trades 구조화 배열, 날짜별 평가금액 배열, 최종 평가금액)"""
+        close = self.panel.close
+        n_dates, n_tickers = close.shape
+        if n_dates <= WARMUP:
+            return np.empty(0, dtype=PORTFOLIO_TRADE_DTYPE), np.full(0, float(self.initial_cash)), float(self.initial_cash)
+
+        signals, vol_ratio = self.signals(config)
+        take_profit, stop_loss = config['take_profit'], config['stop_loss']
+
+        cash = float(self.initial_cash)
+        shares = np.zeros(n_tickers)
+        entry_price = np.zeros(n_tickers)
+        last_price = np.full(n_tickers, np.nan)
+        equity = np.empty(n_dates - WARMUP)
+        trades = []
+
+        for t in range(WARMUP, n_dates):
+            price = close[t].astype(np.float64)
+            traded = ~np.isnan(price)
+            last_price[traded] = price[traded]
+
+            # Sell Logic: 보유 종목 중 오늘 거래가 있는 종목만 익절/손절 확인
+            held = np.flatnonzero((shares > 0) & traded)
+            sold = np.zeros(n_tickers, dtype=bool)
+            if len(held):
+                pct = (price[held] - entry_price[held]) / entry_price[held]
+                exits = (pct > take_profit) | (pct < -stop_loss)
+                for j, p in zip(held[exits], pct[exits]):
+                    cash += shares[j] * price[j]
+                    trades.append((t, j, SELL, price[j], shares[j], p * 100))
+                    shares[j] = 0.0
+                    sold[j] = True
+
+            # Buy Logic: 빈 자리만큼 신호 종목 매수 (당일 매도 종목 제외)
+            slots = self.max_positions - int(np.count_nonzero(shares > 0))
+            if slots > 0:
+                candidates = np.flatnonzero(signals[t] & (shares == 0) & ~sold & traded)
+                if len(candidates):
+                    candidates = candidates[np.argsort(vol_ratio[t, candidates], kind='stable')][:slots]
+                    value = cash + np.nansum(shares * last_price)
+                    for j in candidates:
+                        budget = min(cash, value * self.position_size)
+                        qty = budget // price[j]
+                        if qty <= 0:
+                            continue
+                        cash -= qty * price[j]
+                        shares[j] = qty
+                        entry_price[j] = price[j]
+                        trades.append((t, j, BUY, price[j], qty, np.nan))
+
+            equity[t - WARMUP] = cash + np.nansum(shares * last_price)
+
+        trades = np.array(trades, dtype=PORTFOLIO_TRADE_DTYPE)
+        return trades, equity, equity[-1]
+
+def summarize(trades, equity, initial_cash):
+    """수익률, 최대 낙폭, 거래 수, 승률"""
+    profits = trades['profit'][trades['side'] == SELL]
+    peak = np.maximum.accumulate(equity)
+    return {
+        'return_pct': (equity[-1] - initial_cash) / initial_cash * 100,
+        'max_drawdown': float(((peak - equity) / peak).max() * 100),
+        'trades': len(profits),
+        'win_rate': (profits > 0).mean() * 100 if len(profits) else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="DipSniper Portfolio Backtest")
+    parser.add_argument("tickers", nargs="*", help="종목 코드 (생략 시 --scenario 사용)")
+    parser.add_argument("--scenario", default="1", help="batch_backtest 시나리오 번호")
+    parser.add_argument("--strategy", default="basic", choices=["basic", "advanced"])
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--cash", type=float, default=10000000)
+    parser.add_argument("--max-positions", type=int, default=5)
+    parser.add_argument("--position-size", type=float, default=None, help="종목당 비중 (기본: 1/max-positions)")
+    parser.add_argument("--stop-loss", type=float, default=0.03)
+    parser.add_argument("--take-profit", type=float, default=0.05)
+    args = parser.parse_args()
+
+    from core.market_data import default_store
+
+    tickers = args.tickers
+    if not tickers:
+        from batch_backtest import SCENARIOS
+        name, tickers = SCENARIOS[args.scenario]
+        print(f"📦 Scenario: {name}")
+
+    print(f"🔄 Loading {len(tickers)} tickers ({args.period})...")
+    panel = Panel.from_store(default_store, tickers, args.period)
+    print(f"✅ Panel: {panel.shape[0]} days x {panel.shape[1]} tickers ({panel.nbytes / 1e6:.1f} MB)")
+
+    config = {'stop_loss': args.stop_loss, 'take_profit': args.take_profit}
+    bt = PortfolioBacktester(panel, args.cash, args.strategy, args.max_positions, args.position_size)
+    start = time.time()
+    trades, equity, final_value = bt.run(config)
+    elapsed = time.time() - start
+
+    if len(equity) == 0:
+        print("⚠️ Not enough data")
+        return
+    stats = summarize(trades, equity, args.cash)
+    print("-" * 60)
+    print(f"💰 Final Value : {final_value:,.0f} ({stats['return_pct']:+.2f}%)")
+    print(f"📉 Max Drawdown: {stats['max_drawdown']:.2f}%")
+    print(f"📜 Trades      : {stats['trades']} (Win Rate {stats['win_rate']:.1f}%)")
+    print(f"⏱️ Elapsed     : {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
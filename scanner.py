@@ -4,11 +4,14 @@ NeonAlpha: Real-time Stock Screener (All Stocks Scan)
 Scans all KOSPI/KOSDAQ stocks for DipSniper candidates.
 """
 
+import argparse
+import heapq
+import json
+import time
+import numpy as np
 import pandas as pd
-import yfinance as yf
-from datetime import datetime, timedelta
-import os
-import requests
+from backtest import AdvancedDipStrategy, BasicDipStrategy
+from core.market_data import default_store
 
 # 1. Get All Ticker List (Simplified)
 # In production, use a library like 'finance-datareader' to get full KRX list
@@ -23,77 +26,136 @@ TICKERS = [
     # Add more...
 ]
 
-def scan_market():
-    print("="*60)
-    print(f"🔍 NeonAlpha: Scanning {len(TICKERS)} Stocks for Opportunities...")
-    print("="*60)
-    
-    candidates = []
-    
-    # Batch download for speed (yfinance supports multi-ticker)
-    data = yf.download(TICKERS, period="60d", progress=True, group_by='ticker')
-    
-    scored_candidates = []
+# 전 종목 스캔용 종목 파일 (code,name,market). KRX 정보데이터시스템 '전종목 기본정보'
+# CSV(단축코드/한글 종목약명/시장구분 헤더, cp949)도 그대로 읽는다.
+SYMBOLS_PATH = "config/krx_symbols.csv"
+CANDIDATES_PATH = "config/candidates.json"
+MARKET_SUFFIX = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+LOOKBACK = 60  # 스크리닝에 쓰는 종목별 최근 봉 수 (60일 이평)
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+STRATEGIES = {'basic': BasicDipStrategy, 'advanced': AdvancedDipStrategy}
+_KRX_HEADERS = {"단축코드": "code", "한글 종목약명": "name", "시장구분": "market"}
 
-    for ticker in TICKERS:
+def load_symbols(path=SYMBOLS_PATH):
+    """종목 파일 → yfinance 티커 리스트 (KOSPI .KS, KOSDAQ .KQ, 그 외 시장은 제외)"""
+    for encoding in ("utf-8-sig", "cp949"):
         try:
-            df = data[ticker].copy()
-            if df.empty or len(df) < 60: continue
-            
-            # Lowercase columns
-            df.columns = [c.lower() for c in df.columns]
-            
-            # Indicators
-            ma20 = df['close'].rolling(20).mean().iloc[-1]
-            ma60 = df['close'].rolling(60).mean().iloc[-1]
-            vol_ma5 = df['volume'].rolling(5).mean().iloc[-1]
-            
-            current_close = df['close'].iloc[-1]
-            current_vol = df['volume'].iloc[-1]
-            
-            # Strategy: Advanced Dip
-            # 1. Uptrend (20 > 60)
-            if ma20 <= ma60: continue
-            
-            # 2. Dip (Price near MA20 ±3%)
-            dist = abs(current_close - ma20) / ma20
-            if dist > 0.03: continue
-            
-            # 3. Volume Dry-up (Vol < 70% of MA5)
-            if current_vol >= (vol_ma5 * 0.7): continue
-            
-            # Calculate Dip Score (Higher is better)
-            # - Volume Drop: More drop is better
-            # - Trend Strength: Higher slope is better (approx by recent gain)
-            # - Recent Gain: momentum
-            
-            recent_gain = (current_close - df['close'].iloc[-20]) / df['close'].iloc[-20]
-            vol_ratio = current_vol / (vol_ma5 + 1)
-            
-            # Score formula: (Trend Gain * 50) + ((1 - Vol Ratio) * 30)
-            score = (recent_gain * 50) + ((1 - vol_ratio) * 30)
-            
-            print(f"🎯 Candidate: {ticker} (Score: {score:.1f})")
-            scored_candidates.append({'ticker': ticker, 'score': score})
-            
-        except Exception as e:
+            symbols = pd.read_csv(path, dtype=str, encoding=encoding)
+            break
+        except UnicodeDecodeError:
             continue
-    
-    # Sort by Score and pick Top 5
-    scored_candidates.sort(key=lambda x: x['score'], reverse=True)
-    top_5 = [c['ticker'] for c in scored_candidates[:5]]
+    symbols = symbols.rename(columns=_KRX_HEADERS)
+    symbols['market'] = symbols['market'].str.upper().str.strip()
+    symbols = symbols[symbols['market'].isin(MARKET_SUFFIX)]
+    return (symbols['code'].str.strip().str.zfill(6) + symbols['market'].map(MARKET_SUFFIX)).drop_duplicates().tolist()
+
+def recent_bars(frames, n=LOOKBACK):
+    """{ticker: DataFrame} → (티커 리스트, {필드: (n, N) 배열})
+
+    종목마다 자기 최근 n봉을 오른쪽 끝에 맞춰 쌓는다 (봉이 n개 미만인 종목은 제외).
+    """
+    tickers = [t for t, df in frames.items() if df is not None and len(df) >= n]
+    fields = {f: np.column_stack([frames[t][f].to_numpy(dtype=float)[-n:] for t in tickers]) if tickers else np.empty((n, 0))
+              for f in FIELDS}
+    return tickers, fields
+
+# Ranking: 전략 컬럼 (봉, 종목) → 마지막 봉 기준 종목별 점수 (높을수록 우선)
+def dip_score(cols):
+    """(20봉 전 대비 상승률 * 50) + ((1 - 거래량/5일 평균) * 30)"""
+    close, volume, vol_ma5 = cols['close'], cols['volume'][-1], cols['vol_ma5'][-1]
+    recent_gain = (close[-1] - close[-20]) / close[-20]
+    vol_ratio = volume / (vol_ma5 + 1)
+    return recent_gain * 50 + (1 - vol_ratio) * 30
+
+def volume_dry(cols):
+    """거래량이 많이 마른 종목 우선 (포트폴리오 백테스트 매수 우선순위와 동일)"""
+    return -(cols['volume'][-1] / cols['vol_ma5'][-1])
+
+RANKERS = {'dip_score': dip_score, 'volume_dry': volume_dry}
+
+def screen(tickers, fields, strategy, config, ranker=dip_score, top=None):
+    """전략 signals()로 전 종목의 마지막 봉을 한 번에 평가 → 점수순 후보 [{'ticker', 'score'}, ...]"""
+    if fields['close'].shape[0] < LOOKBACK or not tickers:
+        return []
+    hit, cols = strategy.screen(fields, config)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        score = np.asarray(ranker(cols), dtype=float)
+
+    idx = np.flatnonzero(hit & ~np.isnan(score))
+    idx = idx[np.argsort(-score[idx], kind='stable')][:top]
+    return [{'ticker': tickers[j], 'score': float(score[j])} for j in idx]
+
+def iter_candidates(tickers, strategy, config, ranker=dip_score, period="6mo", chunk_size=200, store=None):
+    """종목을 묶음 단위로 받아 스크리닝 → (처리한 종목 수, 묶음 후보 리스트)를 묶음마다 생성"""
+    store = store or default_store
+    done = 0
+    for chunk, frames in store.iter_chunks(tickers, period, chunk_size=chunk_size):
+        done += len(chunk)
+        yield done, screen(*recent_bars(frames), strategy, config, ranker)
+
+def scan_market(tickers=None, strategy_name='advanced', config=None, ranker='dip_score',
+                period="6mo", chunk_size=200, budget=None, top=5, store=None):
+    """후보 종목 스캔 → 상위 top개 티커 리스트
+
+    매수 조건은 백테스트 전략의 signals() 그대로 (config로 임계값 조정),
+    순위는 ranker(RANKERS 이름 또는 cols → 점수 함수)로 매긴다.
+    budget(초)을 넘기면 남은 묶음은 건너뛰고 그때까지의 결과로 마무리한다.
+    """
+    tickers = tickers or TICKERS
+    strategy = STRATEGIES[strategy_name]()
+    config = config or {}
+    ranker = RANKERS[ranker] if isinstance(ranker, str) else ranker
+    print("="*60)
+    print(f"🔍 NeonAlpha: Scanning {len(tickers)} Stocks for Opportunities...")
+    print("="*60)
+
+    start = time.time()
+    best = []  # (score, ticker) 최소 힙: 전체 상위 top개만 유지
+    found = scanned = 0
+    for scanned, chunk_candidates in iter_candidates(tickers, strategy, config, ranker, period, chunk_size, store):
+        for c in chunk_candidates:
+            print(f"🎯 Candidate: {c['ticker']} (Score: {c['score']:.1f})")
+            heapq.heappush(best, (c['score'], c['ticker']))
+            if len(best) > top:
+                heapq.heappop(best)
+        found += len(chunk_candidates)
+
+        elapsed = time.time() - start
+        eta = elapsed / scanned * (len(tickers) - scanned)
+        print(f"⏳ {scanned}/{len(tickers)} scanned | {found} candidates | {elapsed:.1f}s elapsed, ETA {eta:.0f}s")
+        if budget and elapsed > budget and scanned < len(tickers):
+            print(f"⚠️ Time budget {budget:.0f}s exceeded. Stopping after {scanned}/{len(tickers)} stocks.")
+            break
+
+    top_n = [t for _, t in sorted(best, reverse=True)]
 
     print("-" * 60)
-    print(f"✅ Scan Complete. Top 5 Candidates: {top_5}")
+    print(f"✅ Scan Complete in {time.time() - start:.1f}s. Top {top} Candidates: {top_n}")
     
     # Save to file for main.py to use
-    if top_5:
-        with open("/Volumes/SSD/DEV_SSD/MY/DipSniper/config/candidates.json", "w") as f:
-            import json
-            json.dump(top_5, f)
-        print("💾 Saved top 5 candidates to config/candidates.json")
+    if top_n:
+        with open(CANDIDATES_PATH, "w") as f:
+            json.dump(top_n, f)
+        print(f"💾 Saved top {len(top_n)} candidates to {CANDIDATES_PATH}")
     else:
         print("❌ No suitable candidates found today.")
+    return top_n
 
 if __name__ == "__main__":
-    scan_market()
+    parser = argparse.ArgumentParser(description="NeonAlpha Stock Screener")
+    parser.add_argument("--all", action="store_true", help="종목 파일의 KOSPI+KOSDAQ 전 종목 스캔")
+    parser.add_argument("--symbols", default=SYMBOLS_PATH, help="종목 파일 경로 (--all)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="한 번에 내려받을 종목 수")
+    parser.add_argument("--budget", type=float, default=None, help="스캔 제한 시간 (초)")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--strategy", default="advanced", choices=list(STRATEGIES))
+    parser.add_argument("--ranker", default="dip_score", choices=list(RANKERS))
+    parser.add_argument("--config", help="전략 설정 JSON (예: config/live_strategy.json, vol_ratio/ma_band/rsi_low/rsi_high)")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        with open(args.config, "r") as f:
+            config = json.load(f)
+    tickers = load_symbols(args.symbols) if args.all else TICKERS
+    scan_market(tickers, args.strategy, config, args.ranker, chunk_size=args.chunk_size, budget=args.budget, top=args.top)
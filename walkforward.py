@@ -0,0 +1,185 @@
+"""
+DipSniper Walk-Forward Validation
+
+전체 기간을 학습(train)/검증(test) 구간으로 굴려 가며 나눈 뒤,
+학습 구간에서 최적 조합을 고르고 바로 다음 검증 구간에서 성과를 측정한다.
+
+    python walkforward.py 005930.KS --period 10y --folds 40
+    python walkforward.py AAPL --train 504 --test 63 --random 300 --anchored
+
+- 지표는 종목 전체 기간에 대해 한 번만 계산하고 (IndicatorBank) 모든 구간이 잘라서 공유
+  (이평·RSI는 과거 봉만 보므로 구간별로 다시 계산한 값과 같고, 구간 시작부터 바로 매매 가능)
+- 구간(fold)들은 프로세스 풀에서 병렬 실행. 워커마다 지표 배열을 한 번만 만들어 재사용
+- 각 구간은 현금만 들고 시작하고, 구간 끝에 남은 보유분은 종가로 평가
+- --mmap이면 워커 초기화 인자로 DataFrame 대신 메모리 매핑 Bars (경로, 종목)만 전달
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import WARMUP
+from core.bars import Bars
+from optimizer import (IndicatorBank, evaluate, grid_combos, make_strategy, random_combos,
+                       rank_results, strategy_grid, to_config)
+
+def walk_forward_windows(n_bars, train, test, step=None, start=WARMUP, anchored=False):
+    """(학습 시작, 학습 끝, 검증 시작, 검증 끝) 봉 인덱스 리스트 (끝은 미포함)
+
+    anchored=True면 학습 구간 시작을 start에 고정하고 길이만 늘린다.
+    """
+    step = step or test
+    windows = []
+    train_start = start
+    while train_start + train + test <= n_bars:
+        train_end = train_start + train
+        windows.append((start if anchored else train_start, train_end, train_end, train_end + test))
+        train_start += step
+    return windows
+
+def fold_sizes(n_bars, folds, train=None, start=WARMUP):
+    """구간 수 → (학습 길이, 검증 길이). 학습 길이를 안 주면 검증 길이의 4배"""
+    usable = n_bars - start
+    if train is None:
+        test = usable // (folds + 4)
+        train = usable - test * folds
+    else:
+        test = (usable - train) // folds
+    if test <= 0 or train <= 0:
+        raise ValueError(f"{n_bars} bars are not enough for {folds} folds")
+    return train, test
+
+# 워커 프로세스별 상태 (종목 하나의 지표 배열)
+_worker = {}
+
+def _init_worker(df, strategy_name):
+    strategy = make_strategy(strategy_name)
+    _worker['strategy'] = strategy
+    _worker['bank'] = IndicatorBank(df, strategy)
+
+def _run_fold(window, combos, rank_by, initial_cash):
+    """한 구간: 학습 구간 전체 조합 평가 → 1위 조합으로 검증 구간 평가"""
+    bank, strategy = _worker['bank'], _worker['strategy']
+    train_start, train_end, test_start, test_end = window
+    rows = evaluate(bank, strategy, combos, initial_cash, train_start, train_end)
+    best = rank_results([{**row, 'combo_index': i} for i, row in enumerate(rows)], rank_by).iloc[0].to_dict()
+    combo = combos[int(best['combo_index'])]
+    test_row = evaluate(bank, strategy, [combo], initial_cash, test_start, test_end)[0]
+    return {'combo': combo, 'train': best, 'test': test_row}
+
+def walk_forward(df, strategy_name='advanced', combos=None, train=None, test=None, folds=None, step=None,
+                 anchored=False, rank_by=('return', 'profit_factor', 'drawdown'), initial_cash=10000000, workers=None):
+    """종목 하나의 walk-forward 검증 → 구간별 결과 dict 리스트
+
+    구간은 train/test(봉 수)로 직접 주거나 folds(구간 수)로 나눈다. df는 DataFrame 또는 Bars.
+    """
+    combos = combos if combos is not None else grid_combos(strategy_grid(strategy_name))
+    if folds:
+        train, test = fold_sizes(len(df), folds, train)
+    windows = walk_forward_windows(len(df), train, test, step, anchored=anchored)
+    if not windows:
+        return []
+
+    tasks = [(w, combos, rank_by, initial_cash) for w in windows]
+    workers = min(workers or os.cpu_count() or 1, len(windows))
+    if workers <= 1:
+        _init_worker(df, strategy_name)
+        outputs = [_run_fold(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df, strategy_name)) as pool:
+            outputs = list(pool.map(_run_fold, *zip(*tasks)))
+
+    if isinstance(df, Bars):
+        dates = np.datetime_as_string(df.dates).tolist()
+    else:
+        dates = df['date'].astype(str).tolist() if 'date' in df.columns else [str(d) for d in df.index]
+    folds_out = []
+    for i, (window, out) in enumerate(zip(windows, outputs)):
+        train_start, train_end, test_start, test_end = window
+        row = {'fold': i + 1,
+               'train_from': dates[train_start], 'train_to': dates[train_end - 1],
+               'test_from': dates[test_start], 'test_to': dates[test_end - 1]}
+        row.update(to_config(out['combo']))
+        for prefix in ('train', 'test'):
+            for key in ('return_pct', 'trades', 'win_rate', 'profit_factor', 'max_drawdown'):
+                value = out[prefix][key]
+                row[f"{prefix}_{key}"] = int(value) if key == 'trades' else float(value)
+        folds_out.append(row)
+    return folds_out
+
+def summarize(folds):
+    """검증 구간 성과 요약 (연결 수익률, 평균, 양(+) 구간 비율, 학습 대비 효율)"""
+    df = pd.DataFrame(folds)
+    if df.empty:
+        return {}
+    test = df['test_return_pct'] / 100
+    train_mean = df['train_return_pct'].mean()
+    return {
+        'folds': len(df),
+        'oos_return_pct': float((np.prod(1 + test) - 1) * 100),
+        'mean_test_return_pct': float(df['test_return_pct'].mean()),
+        'mean_train_return_pct': float(train_mean),
+        'positive_folds_pct': float((test > 0).mean() * 100),
+        'efficiency': float(df['test_return_pct'].mean() / train_mean) if train_mean else float('nan'),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="DipSniper Walk-Forward Validation")
+    parser.add_argument("tickers", nargs="+", help="종목 코드 (예: 005930.KS AAPL)")
+    parser.add_argument("--strategy", default="advanced", choices=["basic", "advanced"])
+    parser.add_argument("--period", default="10y", help="데이터 기간 (yfinance 형식)")
+    parser.add_argument("--folds", type=int, default=None, help="검증 구간 수 (train/test 대신)")
+    parser.add_argument("--train", type=int, default=None, help="학습 구간 길이 (봉 수)")
+    parser.add_argument("--test", type=int, default=63, help="검증 구간 길이 (봉 수, --folds가 없을 때)")
+    parser.add_argument("--step", type=int, default=None, help="구간 이동 폭 (기본: 검증 구간 길이)")
+    parser.add_argument("--anchored", action="store_true", help="학습 구간 시작을 고정 (확장 윈도우)")
+    parser.add_argument("--random", type=int, default=0, help="랜덤 탐색 조합 수 (0이면 전체 그리드)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--rank-by", default="return,profit_factor,drawdown", help="학습 구간 순위 점수에 넣을 지표")
+    parser.add_argument("--output", default="walkforward_results.csv", help="구간별 결과 CSV 경로")
+    parser.add_argument("--mmap", action="store_true", help="일봉을 .npy 묶음으로 내보내 워커가 메모리 매핑으로 공유")
+    args = parser.parse_args()
+    if not args.folds and not args.train:
+        parser.error("--folds 또는 --train 중 하나는 필요합니다")
+
+    from core.market_data import default_store, load_ohlcv_many
+
+    grid = strategy_grid(args.strategy)
+    combos = random_combos(args.random, grid, seed=args.seed) if args.random else grid_combos(grid)
+    rank_by = tuple(k.strip() for k in args.rank_by.split(","))
+    print(f"🔄 Loading {len(args.tickers)} tickers ({args.period})...")
+    frames = default_store.export_bars(args.tickers, args.period) if args.mmap else load_ohlcv_many(args.tickers, args.period)
+
+    rows = []
+    for ticker in args.tickers:
+        df = frames.get(ticker)
+        if df is None or len(df) <= WARMUP:
+            print(f"⚠️ {ticker}: Not enough data")
+            continue
+        start = time.time()
+        try:
+            folds = walk_forward(df, args.strategy, combos, args.train, args.test, args.folds, args.step,
+                                 args.anchored, rank_by, workers=args.workers)
+        except ValueError as e:
+            print(f"⚠️ {ticker}: {e}")
+            continue
+        if not folds:
+            print(f"⚠️ {ticker}: Not enough data for one train/test window")
+            continue
+        summary = summarize(folds)
+        rows.extend({'ticker': ticker, **f} for f in folds)
+        print(f"✅ {ticker}: {summary['folds']} folds x {len(combos)} combos in {time.time() - start:.1f}s | "
+              f"OOS {summary['oos_return_pct']:+.2f}% (train avg {summary['mean_train_return_pct']:+.2f}%, "
+              f"test avg {summary['mean_test_return_pct']:+.2f}%, {summary['positive_folds_pct']:.0f}% folds positive)")
+
+    if rows:
+        pd.DataFrame(rows).to_csv(args.output, index=False)
+        print(f"💾 Saved: {args.output}")
+
+if __name__ == "__main__":
+    main()